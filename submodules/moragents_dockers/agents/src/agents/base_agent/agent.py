@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Any, Dict, Optional, Tuple
 
@@ -28,6 +29,10 @@ class BaseAgent:
         self.tool_bound_llm = self.llm.bind_tools(self.config.tools)
 
     def chat(self, request: ChatRequest) -> Dict[str, Any]:
+        # Synchronous entry point for callers outside the event loop
+        return asyncio.run(self.achat(request))
+
+    async def achat(self, request: ChatRequest) -> Dict[str, Any]:
         try:
             data = request.dict()
             logger.info(f"Received chat request: {data}")
@@ -54,7 +59,7 @@ class BaseAgent:
                 prompt = data["prompt"]
                 wallet_address = data.get("wallet_address")
                 chain_id = data.get("chain_id")
-                response_content = self.handle_request(prompt, chain_id, wallet_address)
+                response_content = await self.ahandle_request(prompt, chain_id, wallet_address)
                 return {
                     "role": "assistant",
                     "content": response_content,
@@ -70,13 +75,7 @@ class BaseAgent:
             logger.error(f"Error in chat method: {str(e)}, agent: {self.agent_info['name']}")
             raise e
 
-    def handle_request(
-        self, message: dict[str, any], chain_id: Optional[str], wallet_address: Optional[str]
-    ) -> Dict[str, Any]:
-        logger.info(f"Message: {message}")
-        logger.info(f"Chain ID: {chain_id}")
-        logger.info(f"Wallet Address: {wallet_address}")
-
+    def _build_messages(self, message: dict[str, any]) -> list:
         # System prompt that includes descriptions of available tools
         tool_descriptions = "\n".join(
             f"{tool['name']}: {tool['description']}" for tool in self.config.tools
@@ -93,13 +92,27 @@ class BaseAgent:
         ]
 
         messages.append(HumanMessage(content=message.get("content")))
+        return messages
+
+    async def ahandle_request(
+        self, message: dict[str, any], chain_id: Optional[str], wallet_address: Optional[str]
+    ) -> Dict[str, Any]:
+        logger.info(f"Message: {message}")
+        logger.info(f"Chain ID: {chain_id}")
+        logger.info(f"Wallet Address: {wallet_address}")
+
+        messages = self._build_messages(message)
 
         logger.info(f"Messages: {messages}")
 
-        result = self.tool_bound_llm.invoke(messages)
+        result = await self.tool_bound_llm.ainvoke(messages)
 
         logger.info(f"Result: {result}")
 
+        # Balance lookups go through the blocking CDP client
+        return await asyncio.to_thread(self._process_result, result)
+
+    def _process_result(self, result: Any) -> Dict[str, Any]:
         # Process the LLM's response
         try:
             if result.tool_calls:
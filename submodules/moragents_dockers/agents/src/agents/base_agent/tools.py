@@ -5,17 +5,30 @@ from cdp import Wallet
 logger = logging.getLogger(__name__)
 
 
+class TradeSubmittedError(Exception):
+    """Raised when a swap fails after it was submitted, so retrying it could trade twice"""
+
+
 def swap_assets(
     agent_wallet: Wallet, amount: str, from_asset_id: str, to_asset_id: str
 ) -> Dict[str, Any]:
-    """Swap one asset for another (Base Mainnet only)"""
+    """
+    Swap one asset for another (Base Mainnet only).
+
+    Raises:
+        ValueError: If the swap can't be made as requested, e.g. the wrong network or an
+            insufficient balance. Retrying won't help.
+        TradeSubmittedError: If the swap failed once the trade was started. trade() broadcasts
+            it, so it may still settle and must not be retried.
+        Exception: If the swap failed before the trade was started
+    """
     try:
         if agent_wallet.network_id != "base-mainnet":
-            raise Exception("Asset swaps only available on Base Mainnet")
+            raise ValueError("Asset swaps only available on Base Mainnet")
 
         from_asset_id = from_asset_id.lower()
         to_asset_id = to_asset_id.lower()
-        logger.info(f"Attempting swap on Base Mainnet:")
+        logger.info("Attempting swap on Base Mainnet:")
         logger.info(f"From asset: {from_asset_id}")
         logger.info(f"To asset: {to_asset_id}")
         logger.info(f"Amount: {amount}")
@@ -25,30 +38,33 @@ def swap_assets(
         logger.info(f"Wallet balance of {from_asset_id}: {balance}")
 
         if float(balance) < float(amount):
-            raise Exception(f"Insufficient balance. Have {balance}, need {amount}")
-
-        try:
-            trade = agent_wallet.trade(amount, from_asset_id, to_asset_id)
-            logger.info(f"Trade constructed: {trade}")
-        except Exception as e:
-            if "internal" in str(e).lower():
-                raise Exception(
-                    "Not enough ETH. Please ensure you have sufficient ETH for gas fees."
-                )
-            raise e
+            raise ValueError(f"Insufficient balance. Have {balance}, need {amount}")
+    except Exception as e:
+        logger.error(f"Swap failed: {str(e)}", exc_info=True)
+        error_type = ValueError if isinstance(e, ValueError) else Exception
+        raise error_type(f"Failed to swap assets: {str(e)}")
 
+    # trade() broadcasts the trade itself, so from here on a failure doesn't mean it didn't happen
+    try:
+        trade = agent_wallet.trade(amount, from_asset_id, to_asset_id)
+        logger.info(f"Trade constructed: {trade}")
         trade.wait()
-        logger.info(f"Trade completed")
+        logger.info("Trade completed")
 
         return {
             "success": True,
             "from_asset": from_asset_id,
             "to_asset": to_asset_id,
             "amount": amount,
+            "transaction_hash": trade.transaction.transaction_hash,
         }
     except Exception as e:
-        logger.error(f"Swap failed: {str(e)}", exc_info=True)
-        raise Exception(f"Failed to swap assets: {str(e)}")
+        logger.error(f"Swap failed after starting the trade: {str(e)}", exc_info=True)
+        if "internal" in str(e).lower():
+            raise TradeSubmittedError(
+                "Not enough ETH. Please ensure you have sufficient ETH for gas fees."
+            )
+        raise TradeSubmittedError(f"Failed to swap assets after starting the trade: {str(e)}")
 
 
 def transfer_asset(
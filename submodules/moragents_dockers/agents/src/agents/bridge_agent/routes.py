@@ -1,7 +1,8 @@
 import logging
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
-from src.stores import chat_manager_instance, agent_manager_instance
+from src.config import Config
+from src.stores import agent_manager_instance, session_manager_instance
 
 logger = logging.getLogger(__name__)
 
@@ -9,11 +10,11 @@ router = APIRouter(prefix="/bridge", tags=["bridge"])
 
 
 @router.post("/tx_status")
-async def tx_status(request: Request):
+async def tx_status(request: Request, session_id: str = Config.DEFAULT_SESSION_ID):
     """Check transaction status"""
     logger.info("Received tx_status request")
     try:
-        bridge_agent = agent_manager_instance.get_agent("crypto bridge")
+        bridge_agent = await agent_manager_instance.aget_agent("crypto bridge")
         if not bridge_agent:
             return JSONResponse(
                 status_code=400,
@@ -21,7 +22,8 @@ async def tx_status(request: Request):
             )
 
         response = await bridge_agent.tx_status(request)
-        chat_manager_instance.add_message(response)
+        session = await session_manager_instance.aget_session(session_id)
+        session.chat_manager.add_message(response)
         return response
     except Exception as e:
         logger.error(f"Failed to check tx status: {str(e)}")
@@ -36,7 +38,7 @@ async def allowance(request: Request):
     """Get token allowance"""
     logger.info("Received allowance request")
     try:
-        bridge_agent = agent_manager_instance.get_agent("crypto bridge")
+        bridge_agent = await agent_manager_instance.aget_agent("crypto bridge")
         if not bridge_agent:
             return JSONResponse(
                 status_code=400,
@@ -58,7 +60,7 @@ async def approve(request: Request):
     """Approve token spending"""
     logger.info("Received approve request")
     try:
-        bridge_agent = agent_manager_instance.get_agent("crypto bridge")
+        bridge_agent = await agent_manager_instance.aget_agent("crypto bridge")
         if not bridge_agent:
             return JSONResponse(
                 status_code=400,
@@ -80,7 +82,7 @@ async def bridge(request: Request):
     """Execute token bridge"""
     logger.info("Received bridge request")
     try:
-        bridge_agent = agent_manager_instance.get_agent("crypto bridge")
+        bridge_agent = await agent_manager_instance.aget_agent("crypto bridge")
         if not bridge_agent:
             return JSONResponse(
                 status_code=400,
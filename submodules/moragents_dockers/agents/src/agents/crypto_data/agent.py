@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 
@@ -14,7 +15,7 @@ class CryptoDataAgent:
         self.embeddings = embeddings
         self.tools_provided = tools.get_tools()
 
-    def get_response(self, message):
+    def _build_messages(self, message):
         system_prompt = (
             "Don't make assumptions about the value of the arguments for the function "
             "they should always be supplied by the user and do not alter the value of the arguments. "
@@ -26,57 +27,75 @@ class CryptoDataAgent:
             {"role": "system", "content": system_prompt},
         ]
         messages.extend(message)
+        return messages
+
+    def _handle_tool_call(self, tool_call):
+        func_name = tool_call.get("name")
+        args = tool_call.get("args")
+        logger.info("LLM suggested using tool: %s", func_name)
+
+        response_data = {"data": None, "coinId": None}
+
+        if func_name == "get_price":
+            response_data["data"] = tools.get_coin_price_tool(args["coin_name"])
+            response_data["coinId"] = tools.get_tradingview_symbol(
+                tools.get_coingecko_id(args["coin_name"])
+            )
+            return response_data, "assistant"
+        elif func_name == "get_floor_price":
+            response_data["data"] = tools.get_nft_floor_price_tool(args["nft_name"])
+            return response_data, "assistant"
+        elif func_name == "get_fdv":
+            response_data["data"] = tools.get_fully_diluted_valuation_tool(args["coin_name"])
+            return response_data, "assistant"
+        elif func_name == "get_tvl":
+            response_data["data"] = tools.get_protocol_total_value_locked_tool(
+                args["protocol_name"]
+            )
+            return response_data, "assistant"
+        elif func_name == "get_market_cap":
+            response_data["data"] = tools.get_coin_market_cap_tool(args["coin_name"])
+            return response_data, "assistant"
+
+    def _handle_tool_calls(self, tool_calls):
+        responses = [self._handle_tool_call(tool_call) for tool_call in tool_calls]
+        responses = [response for response, _ in filter(None, responses)]
+        if not responses:
+            return {"data": None, "coinId": None}, "assistant"
+
+        data = "\n".join(str(response["data"]) for response in responses if response["data"])
+        coin_id = next((response["coinId"] for response in responses if response["coinId"]), None)
+        return {"data": data, "coinId": coin_id}, "assistant"
+
+    async def aget_response(self, message):
+        messages = self._build_messages(message)
 
         logger.info("Sending request to LLM with %d messages", len(messages))
 
         llm_with_tools = self.llm.bind_tools(self.tools_provided)
 
         try:
-            result = llm_with_tools.invoke(messages)
+            result = await llm_with_tools.ainvoke(messages)
             logger.info("Received response from LLM: %s", result)
 
             if result.tool_calls:
-                tool_call = result.tool_calls[0]
-                func_name = tool_call.get("name")
-                args = tool_call.get("args")
-                logger.info("LLM suggested using tool: %s", func_name)
-
-                response_data = {"data": None, "coinId": None}
-
-                if func_name == "get_price":
-                    response_data["data"] = tools.get_coin_price_tool(args["coin_name"])
-                    response_data["coinId"] = tools.get_tradingview_symbol(
-                        tools.get_coingecko_id(args["coin_name"])
-                    )
-                    return response_data, "assistant"
-                elif func_name == "get_floor_price":
-                    response_data["data"] = tools.get_nft_floor_price_tool(args["nft_name"])
-                    return response_data, "assistant"
-                elif func_name == "get_fdv":
-                    response_data["data"] = tools.get_fully_diluted_valuation_tool(
-                        args["coin_name"]
-                    )
-                    return response_data, "assistant"
-                elif func_name == "get_tvl":
-                    response_data["data"] = tools.get_protocol_total_value_locked_tool(
-                        args["protocol_name"]
-                    )
-                    return response_data, "assistant"
-                elif func_name == "get_market_cap":
-                    response_data["data"] = tools.get_coin_market_cap_tool(args["coin_name"])
-                    return response_data, "assistant"
+                # Fetch every coin named in this turn up front, one batched request per
+                # endpoint, so the individual tool calls are served from the cache
+                await tools.aprefetch_market_data(result.tool_calls)
+                # Tools talk to CoinGecko / DefiLlama over blocking HTTP
+                return await asyncio.to_thread(self._handle_tool_calls, result.tool_calls)
             else:
                 logger.info("LLM provided a direct response without using tools")
                 return {"data": result.content, "coinId": None}, "assistant"
         except Exception as e:
-            logger.error(f"Error in get_response: {str(e)}")
+            logger.error(f"Error in aget_response: {str(e)}")
             raise e
 
-    def generate_response(self, prompt):
-        response, role = self.get_response([prompt])
-        return response, role
-
     def chat(self, request: ChatRequest):
+        # Synchronous entry point for callers outside the event loop
+        return asyncio.run(self.achat(request))
+
+    async def achat(self, request: ChatRequest):
         try:
             data = request.dict()
             if "prompt" in data:
@@ -85,7 +104,7 @@ class CryptoDataAgent:
                     "Received chat request with prompt: %s",
                     prompt[:50] + "..." if len(prompt) > 50 else prompt,
                 )
-                response, role = self.generate_response(prompt)
+                response, role = await self.aget_response([prompt])
                 return {"role": role, "content": response}
             else:
                 logger.warning("Received chat request without 'prompt' in data")
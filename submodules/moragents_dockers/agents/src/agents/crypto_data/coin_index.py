@@ -0,0 +1,198 @@
+import difflib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.agents.crypto_data.config import Config
+from src.agents.crypto_data.http_client import get_json
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("coin", "nft")
+
+# Seconds to wait before retrying a failed refresh
+REFRESH_RETRY_SECONDS = 300
+
+# Fuzzy lookups are slow enough to cache, but the inputs are user-supplied so keep it bounded
+FUZZY_CACHE_SIZE = 10000
+
+# Fuzzy matching only considers this many of the most popular entries of each kind; scanning
+# every indexed key costs ~100ms per miss, and a typo is far likelier to be of a popular coin
+FUZZY_MAX_ENTRIES = 1000
+
+
+def _normalize(text: str) -> str:
+    return " ".join(str(text).lower().split())
+
+
+class CoinIndex:
+    """
+    Local index of CoinGecko coin and NFT ids, symbols and names.
+
+    The index is persisted as JSON and refreshed from the CoinGecko list endpoints on a
+    background thread, so resolving a user-supplied name to an id is a dictionary lookup.
+    Exact ids win over exact names, which win over symbols; among coins sharing a name or
+    symbol the one with the highest market cap rank wins. Anything else falls back to a
+    fuzzy match over the names and symbols of market cap ranked coins and the most popular
+    NFTs.
+
+    Attributes:
+        path (Path): Location of the persisted index
+        refresh_interval_seconds (float): Age after which the index is refreshed
+        updated_at (Optional[float]): Unix time of the last successful refresh
+    """
+
+    def __init__(self, path: str, refresh_interval_seconds: float) -> None:
+        self.path = Path(path)
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.updated_at: Optional[float] = None
+        self._lookup: Dict[str, Dict[str, str]] = {kind: {} for kind in KINDS}
+        self._fuzzy_lookup: Dict[str, Dict[str, str]] = {kind: {} for kind in KINDS}
+        self._symbols: Dict[str, str] = {}
+        self._fuzzy_cache: Dict[tuple, Optional[str]] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if self.path.exists():
+                try:
+                    self._build(json.loads(self.path.read_text()))
+                except (OSError, ValueError, KeyError) as e:
+                    logger.warning(f"Ignoring unreadable CoinGecko index {self.path}: {e}")
+
+        if self._refresh_thread is None:
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_loop, name="coingecko-index", daemon=True
+            )
+            self._refresh_thread.start()
+
+    def is_stale(self) -> bool:
+        return (
+            self.updated_at is None or time.time() - self.updated_at > self.refresh_interval_seconds
+        )
+
+    def _refresh_loop(self) -> None:
+        while True:
+            delay = self.refresh_interval_seconds
+            if self.is_stale():
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.warning(f"Failed to refresh CoinGecko index: {e}")
+                    delay = REFRESH_RETRY_SECONDS
+            time.sleep(delay)
+
+    def refresh(self) -> None:
+        """Download the coin and NFT lists, persist them and rebuild the index."""
+        coins = get_json(f"{Config.COINGECKO_BASE_URL}/coins/list")
+        markets = get_json(
+            f"{Config.COINGECKO_BASE_URL}/coins/markets",
+            {"vs_currency": "usd", "order": "market_cap_desc", "per_page": 250, "page": 1},
+        )
+        nfts: List[Dict] = []
+        for page in range(1, Config.COIN_INDEX_MAX_NFT_PAGES + 1):
+            batch = get_json(
+                f"{Config.COINGECKO_BASE_URL}/nfts/list", {"per_page": 250, "page": page}
+            )
+            nfts.extend(batch)
+            if len(batch) < 250:
+                break
+
+        data = {
+            "updated_at": time.time(),
+            "coins": [
+                {"id": coin["id"], "symbol": coin["symbol"], "name": coin["name"]} for coin in coins
+            ],
+            "nfts": [
+                {"id": nft["id"], "symbol": nft.get("symbol") or "", "name": nft["name"]}
+                for nft in nfts
+            ],
+            "ranks": {coin["id"]: rank for rank, coin in enumerate(markets, 1)},
+        }
+
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        temp_path.write_text(json.dumps(data))
+        os.replace(temp_path, self.path)
+        with self._lock:
+            self._build(data)
+        logger.info(f"Indexed {len(data['coins'])} coins and {len(data['nfts'])} NFTs")
+
+    def _build(self, data: Dict) -> None:
+        ranks = data.get("ranks", {})
+        lookup: Dict[str, Dict[str, str]] = {}
+        fuzzy_lookup: Dict[str, Dict[str, str]] = {}
+        for kind, entries in (("coin", data["coins"]), ("nft", data["nfts"])):
+            # NFTs come ordered by popularity, coins are ranked by market cap where known
+            if kind == "coin":
+                order = sorted(entries, key=lambda entry: ranks.get(entry["id"], float("inf")))
+                popular = [entry for entry in order if entry["id"] in ranks]
+            else:
+                order = list(entries)
+                popular = order
+            lookup[kind] = self._build_keys(order)
+            fuzzy_lookup[kind] = self._build_keys(popular[:FUZZY_MAX_ENTRIES])
+
+        self._lookup = lookup
+        self._fuzzy_lookup = fuzzy_lookup
+        self._symbols = {coin["id"]: coin["symbol"] for coin in data["coins"]}
+        self._fuzzy_cache = {}
+        self.updated_at = data.get("updated_at")
+
+    @staticmethod
+    def _build_keys(order: List[Dict]) -> Dict[str, str]:
+        # Insert the weakest matches first so stronger ones overwrite them
+        keys: Dict[str, str] = {}
+        for field in ("symbol", "name", "id"):
+            for entry in reversed(order):
+                if entry[field]:
+                    keys[_normalize(entry[field])] = entry["id"]
+        return keys
+
+    def lookup(self, text: str, kind: str = "coin") -> Optional[str]:
+        """
+        Resolve a coin or NFT name, symbol or id to its CoinGecko id.
+
+        Args:
+            text (str): User-supplied name, symbol or id
+            kind (str): "coin" or "nft"
+
+        Returns:
+            Optional[str]: CoinGecko id, or None if nothing in the index matches
+        """
+        if kind not in KINDS:
+            raise ValueError("Invalid type specified")
+        self._ensure_loaded()
+
+        key = _normalize(text)
+        keys = self._lookup[kind]
+        if key in keys:
+            return keys[key]
+
+        cache_key = (kind, key)
+        if cache_key not in self._fuzzy_cache:
+            if len(self._fuzzy_cache) >= FUZZY_CACHE_SIZE:
+                self._fuzzy_cache.clear()
+            fuzzy_keys = self._fuzzy_lookup[kind]
+            matches = difflib.get_close_matches(key, fuzzy_keys.keys(), n=1, cutoff=0.85)
+            self._fuzzy_cache[cache_key] = fuzzy_keys[matches[0]] if matches else None
+        return self._fuzzy_cache[cache_key]
+
+    def get_symbol(self, coin_id: str) -> Optional[str]:
+        """Get the ticker symbol of an indexed coin."""
+        self._ensure_loaded()
+        return self._symbols.get(coin_id)
+
+
+# Create an instance to act as a singleton index
+coin_index = CoinIndex(Config.COIN_INDEX_PATH, Config.COIN_INDEX_REFRESH_SECONDS)
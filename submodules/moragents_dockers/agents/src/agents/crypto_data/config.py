@@ -10,6 +10,36 @@ class Config:
     # API endpoints
     COINGECKO_BASE_URL = "https://api.coingecko.com/api/v3"
     DEFILLAMA_BASE_URL = "https://api.llama.fi"
+
+    # HTTP client: pooled keep-alive connections, retried on 429 and 5xx
+    HTTP_TIMEOUT_SECONDS = 10
+    HTTP_POOL_SIZE = 10
+    HTTP_MAX_RETRIES = 3
+    HTTP_BACKOFF_FACTOR = 0.5
+    HTTP_MAX_RETRY_AFTER_SECONDS = 30
+
+    # Local index of CoinGecko ids, refreshed in the background
+    COIN_INDEX_PATH = "coingecko_index.json"
+    COIN_INDEX_REFRESH_SECONDS = 86400
+    COIN_INDEX_MAX_NFT_PAGES = 20
+
+    # Market data cache: seconds each field stays fresh, then may be served stale while refreshing
+    MARKET_CACHE_TTL_SECONDS = {
+        "price": 30,
+        "markets": 60,
+        "floor_price": 60,
+        "tvl": 300,
+        # Names and ids the local coin index doesn't know, resolved through CoinGecko
+        "search": 300,
+        "symbol": 3600,
+    }
+    MARKET_CACHE_STALE_SECONDS = 120
+
+    # Local catalog of DefiLlama protocols, refreshed in the background
+    PROTOCOL_INDEX_PATH = "defillama_protocols.pkl"
+    PROTOCOL_INDEX_REFRESH_SECONDS = 21600
+    TVL_FETCH_WORKERS = 8
+
     PRICE_SUCCESS_MESSAGE = "The price of {coin_name} is ${price:,}"
     PRICE_FAILURE_MESSAGE = "Failed to retrieve price. Please enter a valid coin name."
     FLOOR_PRICE_SUCCESS_MESSAGE = "The floor price of {nft_name} is ${floor_price:,}"
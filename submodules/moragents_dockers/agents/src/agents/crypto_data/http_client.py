@@ -0,0 +1,145 @@
+import asyncio
+import importlib.util
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from src.agents.crypto_data.config import Config
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_async_client: Optional[httpx.AsyncClient] = None
+_async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+class _CappedRetry(Retry):
+    """Retry that honours Retry-After but never sleeps longer than the configured cap"""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, Config.HTTP_MAX_RETRY_AFTER_SECONDS)
+
+
+def get_session() -> requests.Session:
+    """Get the shared keep-alive session used by the crypto data tools."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = _CappedRetry(
+                    total=Config.HTTP_MAX_RETRIES,
+                    backoff_factor=Config.HTTP_BACKOFF_FACTOR,
+                    status_forcelist=RETRY_STATUSES,
+                    allowed_methods=frozenset({"GET"}),
+                    respect_retry_after_header=True,
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=Config.HTTP_POOL_SIZE,
+                    pool_maxsize=Config.HTTP_POOL_SIZE,
+                    max_retries=retry,
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({"Accept": "application/json"})
+                _session = session
+    return _session
+
+
+def get_json(url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    GET a JSON document over the shared session.
+
+    Args:
+        url (str): Endpoint URL
+        params (Optional[Dict[str, Any]]): Query parameters
+
+    Returns:
+        Any: Decoded JSON body
+
+    Raises:
+        requests.exceptions.RequestException: On connection errors, timeouts, or error
+            statuses that persist after retries
+    """
+    response = get_session().get(url, params=params, timeout=Config.HTTP_TIMEOUT_SECONDS)
+    response.raise_for_status()
+    return response.json()
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    global _async_client, _async_client_loop
+    # Connections belong to the loop that opened them, so each event loop gets its own client
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client.is_closed or _async_client_loop is not loop:
+        _async_client_loop = loop
+        _async_client = httpx.AsyncClient(
+            # HTTP/2 multiplexes requests to the same host over one connection, if h2 is installed
+            http2=importlib.util.find_spec("h2") is not None,
+            timeout=Config.HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=Config.HTTP_POOL_SIZE),
+            headers={"Accept": "application/json"},
+        )
+    return _async_client
+
+
+def _retry_delay(response: Optional[httpx.Response], attempt: int) -> float:
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), Config.HTTP_MAX_RETRY_AFTER_SECONDS)
+    return Config.HTTP_BACKOFF_FACTOR * 2**attempt
+
+
+async def aget_json(url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Async counterpart of get_json for callers running on the event loop.
+
+    Args:
+        url (str): Endpoint URL
+        params (Optional[Dict[str, Any]]): Query parameters
+
+    Returns:
+        Any: Decoded JSON body
+
+    Raises:
+        httpx.HTTPError: On connection errors, timeouts, or error statuses that persist
+            after retries
+    """
+    client = _get_async_client()
+    for attempt in range(Config.HTTP_MAX_RETRIES + 1):
+        is_last_attempt = attempt == Config.HTTP_MAX_RETRIES
+        try:
+            response = await client.get(url, params=params)
+        except httpx.TransportError as e:
+            # Connection errors and timeouts, which the sync session's Retry also retries
+            if is_last_attempt:
+                raise
+            delay = _retry_delay(None, attempt)
+            logger.warning(f"Request to {url} failed: {str(e)}, retrying in {delay:.1f}s")
+        else:
+            if response.status_code not in RETRY_STATUSES or is_last_attempt:
+                break
+            delay = _retry_delay(response, attempt)
+            logger.warning(f"{url} returned {response.status_code}, retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+    response.raise_for_status()
+    return response.json()
+
+
+async def aclose() -> None:
+    """Close the shared async client's connections."""
+    global _async_client
+    if _async_client is not None and _async_client_loop is asyncio.get_running_loop():
+        await _async_client.aclose()
+        _async_client = None
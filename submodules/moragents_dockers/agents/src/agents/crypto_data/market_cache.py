@@ -0,0 +1,258 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from src.agents.crypto_data.config import Config
+
+logger = logging.getLogger(__name__)
+
+# (value, fresh_until, stale_until) in monotonic time
+_Entry = Tuple[Any, float, float]
+
+
+class MarketDataCache:
+    """
+    Thread-safe TTL cache for market data with request coalescing.
+
+    Each field (price, market data, ...) has its own TTL. Concurrent misses for the same key
+    share a single upstream call, and misses for several keys can be loaded in one batch.
+    Once an entry expires it is still served for up to ``stale_seconds`` while one background
+    refresh replaces it, so hot keys never make a caller wait on the upstream API.
+
+    Attributes:
+        ttls (Dict[str, float]): Seconds each field stays fresh
+        stale_seconds (float): Seconds an expired entry may be served while revalidating
+        max_entries (int): Maximum number of cached entries, least recently used evicted first
+    """
+
+    def __init__(
+        self, ttls: Dict[str, float], stale_seconds: float, max_entries: int = 2048
+    ) -> None:
+        self.ttls = ttls
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.coalesced = 0
+        self._entries: "OrderedDict[Tuple[str, Hashable], _Entry]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, Hashable], Future] = {}
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=4, thread_name_prefix="market-cache")
+        self._refresh_tasks: Set[asyncio.Task] = set()
+
+    def get(self, field: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Get a cached value, loading it at most once across concurrent callers.
+
+        Args:
+            field (str): Kind of data, selects the TTL
+            key (Hashable): Identifier within the field, e.g. a CoinGecko id
+            loader (Callable[[], Any]): Fetches the value from upstream
+
+        Returns:
+            Any: The cached or freshly loaded value
+
+        Raises:
+            Exception: Whatever the loader raised; failures are not cached
+        """
+        return self.get_many(field, [key], lambda keys: {key: loader()})[key]
+
+    def get_many(
+        self,
+        field: str,
+        keys: List[Hashable],
+        loader: Callable[[List[Hashable]], Dict[Hashable, Any]],
+    ) -> Dict[Hashable, Any]:
+        """
+        Get several cached values, loading all missing ones with a single loader call.
+
+        Args:
+            field (str): Kind of data, selects the TTL
+            keys (List[Hashable]): Identifiers within the field
+            loader (Callable[[List[Hashable]], Dict[Hashable, Any]]): Fetches values for a
+                list of keys from upstream in one request
+
+        Returns:
+            Dict[Hashable, Any]: Value for every requested key
+
+        Raises:
+            Exception: Whatever the loader raised; failures are not cached
+        """
+        results, flights, stale_flights, waiting = self._claim(field, keys)
+        if stale_flights:
+            self._refresher.submit(self._load, field, stale_flights, loader)
+        if flights:
+            self._load(field, flights, loader)
+            waiting.update(flights)
+
+        for key, flight in waiting.items():
+            results[key] = flight.result()
+        return results
+
+    async def aget_many(
+        self,
+        field: str,
+        keys: List[Hashable],
+        loader: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+    ) -> Dict[Hashable, Any]:
+        """
+        Async counterpart of get_many, sharing in-flight loads with sync callers.
+
+        A load started here is awaited on the event loop, so sync callers coalescing onto it
+        must run in worker threads, as the crypto data tools do.
+
+        Args:
+            field (str): Kind of data, selects the TTL
+            keys (List[Hashable]): Identifiers within the field
+            loader (Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]): Fetches
+                values for a list of keys from upstream in one request
+
+        Returns:
+            Dict[Hashable, Any]: Value for every requested key
+
+        Raises:
+            Exception: Whatever the loader raised; failures are not cached
+        """
+        results, flights, stale_flights, waiting = self._claim(field, keys)
+        if stale_flights:
+            task = asyncio.create_task(self._aload(field, stale_flights, loader))
+            # Keep a reference so the refresh isn't garbage collected while it runs
+            self._refresh_tasks.add(task)
+            task.add_done_callback(self._refresh_tasks.discard)
+        if flights:
+            await self._aload(field, flights, loader)
+            waiting.update(flights)
+
+        for key, flight in waiting.items():
+            # Shielded, so a cancelled caller doesn't cancel the load other callers share
+            results[key] = await asyncio.shield(asyncio.wrap_future(flight))
+        return results
+
+    def _claim(self, field: str, keys: List[Hashable]) -> Tuple[
+        Dict[Hashable, Any],
+        Dict[Hashable, Future],
+        Dict[Hashable, Future],
+        Dict[Hashable, Future],
+    ]:
+        """
+        Look keys up and register loads for the ones this caller has to fetch.
+
+        Returns:
+            Tuple: Cached values, flights to load now, stale flights to refresh in the
+                background, and flights already loaded by other callers
+        """
+        now = time.monotonic()
+        results: Dict[Hashable, Any] = {}
+        missing: List[Hashable] = []
+        stale: List[Hashable] = []
+        waiting: Dict[Hashable, Future] = {}
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                cache_key = (field, key)
+                entry = self._entries.get(cache_key)
+                if entry is not None and now < entry[1]:
+                    self._entries.move_to_end(cache_key)
+                    self.hits += 1
+                    results[key] = entry[0]
+                elif entry is not None and now < entry[2]:
+                    self.stale_hits += 1
+                    results[key] = entry[0]
+                    if cache_key not in self._inflight:
+                        stale.append(key)
+                elif cache_key in self._inflight:
+                    self.coalesced += 1
+                    waiting[key] = self._inflight[cache_key]
+                else:
+                    self.misses += 1
+                    missing.append(key)
+
+            stale_flights = self._start_flights(field, stale)
+            flights = self._start_flights(field, missing)
+        return results, flights, stale_flights, waiting
+
+    def _start_flights(self, field: str, keys: List[Hashable]) -> Dict[Hashable, Future]:
+        flights = {key: Future() for key in keys}
+        for key, flight in flights.items():
+            self._inflight[(field, key)] = flight
+        return flights
+
+    def _load(
+        self,
+        field: str,
+        flights: Dict[Hashable, Future],
+        loader: Callable[[List[Hashable]], Dict[Hashable, Any]],
+    ) -> None:
+        try:
+            values = loader(list(flights))
+        except Exception as e:
+            self._settle(field, flights, error=e)
+        else:
+            self._settle(field, flights, values=values)
+
+    async def _aload(
+        self,
+        field: str,
+        flights: Dict[Hashable, Future],
+        loader: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+    ) -> None:
+        try:
+            values = await loader(list(flights))
+        except Exception as e:
+            self._settle(field, flights, error=e)
+        except BaseException:
+            # Cancelled, e.g. a losing speculative agent or a disconnected client. Callers
+            # sharing the load fail as on an upstream error, and the next request loads again.
+            self._settle(field, flights, error=RuntimeError(f"Loading {field} was cancelled"))
+            raise
+        else:
+            self._settle(field, flights, values=values)
+
+    def _settle(
+        self,
+        field: str,
+        flights: Dict[Hashable, Future],
+        values: Optional[Dict[Hashable, Any]] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        """Cache loaded values and hand them, or the load's error, to every waiting caller"""
+        try:
+            if error is not None:
+                logger.warning(f"Failed to load {field} for {list(flights)}: {error}")
+                for flight in flights.values():
+                    flight.set_exception(error)
+            else:
+                for key, flight in flights.items():
+                    self.put(field, key, values.get(key))
+                    flight.set_result(values.get(key))
+        finally:
+            with self._lock:
+                for key in flights:
+                    self._inflight.pop((field, key), None)
+
+    def put(self, field: str, key: Hashable, value: Any) -> None:
+        """Store a freshly loaded value."""
+        ttl = self.ttls.get(field, 0)
+        now = time.monotonic()
+        with self._lock:
+            self._entries[(field, key)] = (value, now + ttl, now + ttl + self.stale_seconds)
+            self._entries.move_to_end((field, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
+
+
+# Create an instance to act as a singleton cache
+market_cache = MarketDataCache(Config.MARKET_CACHE_TTL_SECONDS, Config.MARKET_CACHE_STALE_SECONDS)
@@ -0,0 +1,148 @@
+import logging
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from src.agents.crypto_data.config import Config
+from src.agents.crypto_data.http_client import get_json
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before retrying a failed refresh
+REFRESH_RETRY_SECONDS = 300
+
+
+def _normalize(text: str) -> str:
+    return " ".join(str(text).lower().split())
+
+
+class ProtocolIndex:
+    """
+    Local catalog of DefiLlama protocols for resolving protocol names to slugs.
+
+    The catalog holds slug, name and CoinGecko id lookups plus a TF-IDF model already fit
+    over the protocol names. It is persisted with pickle, loaded on first use and refreshed
+    from the /protocols endpoint on a background thread, so a query never downloads the
+    protocol list or refits the vectorizer.
+
+    Attributes:
+        path (Path): Location of the persisted catalog
+        refresh_interval_seconds (float): Age after which the catalog is refreshed
+    """
+
+    def __init__(self, path: str, refresh_interval_seconds: float) -> None:
+        self.path = Path(path)
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self._catalog: Optional[Dict] = None
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    @property
+    def updated_at(self) -> Optional[float]:
+        return self._catalog["updated_at"] if self._catalog else None
+
+    def is_stale(self) -> bool:
+        return (
+            self.updated_at is None or time.time() - self.updated_at > self.refresh_interval_seconds
+        )
+
+    def _ensure_loaded(self) -> Dict:
+        if self._catalog is None:
+            with self._lock:
+                if self._catalog is None and self.path.exists():
+                    try:
+                        with open(self.path, "rb") as f:
+                            self._catalog = pickle.load(f)
+                    except (OSError, pickle.UnpicklingError, EOFError) as e:
+                        logger.warning(f"Ignoring unreadable protocol catalog {self.path}: {e}")
+                if self._catalog is None:
+                    # Nothing to answer from yet, so the first query waits for the download
+                    self.refresh()
+
+        if self._refresh_thread is None:
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_loop, name="defillama-index", daemon=True
+            )
+            self._refresh_thread.start()
+        return self._catalog
+
+    def _refresh_loop(self) -> None:
+        while True:
+            delay = self.refresh_interval_seconds
+            if self.is_stale():
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.warning(f"Failed to refresh protocol catalog: {e}")
+                    delay = REFRESH_RETRY_SECONDS
+            time.sleep(delay)
+
+    def refresh(self) -> None:
+        """Download the protocol list, refit the name model and persist the catalog."""
+        protocols = get_json(f"{Config.DEFILLAMA_BASE_URL}/protocols")
+        catalog = self._build(protocols)
+
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, "wb") as f:
+            pickle.dump(catalog, f)
+        os.replace(temp_path, self.path)
+        self._catalog = catalog
+        logger.info(f"Indexed {len(catalog['slugs'])} DefiLlama protocols")
+
+    @staticmethod
+    def _build(protocols: List[Dict]) -> Dict:
+        slugs = [protocol["slug"] for protocol in protocols]
+        names = [protocol["name"] for protocol in protocols]
+
+        by_name: Dict[str, str] = {}
+        by_gecko_id: Dict[str, str] = {}
+        for protocol in protocols:
+            # Keep the first protocol listed for a name or id, as DefiLlama lists by TVL
+            by_name.setdefault(_normalize(protocol["name"]), protocol["slug"])
+            by_name.setdefault(_normalize(protocol["slug"]), protocol["slug"])
+            if protocol.get("gecko_id"):
+                by_gecko_id.setdefault(protocol["gecko_id"], protocol["slug"])
+
+        vectorizer = TfidfVectorizer()
+        return {
+            "updated_at": time.time(),
+            "slugs": slugs,
+            "by_name": by_name,
+            "by_gecko_id": by_gecko_id,
+            "vectorizer": vectorizer,
+            "matrix": vectorizer.fit_transform(names),
+        }
+
+    def find_by_name(self, name: str) -> Optional[str]:
+        """Get the slug of the protocol with exactly this name or slug."""
+        return self._ensure_loaded()["by_name"].get(_normalize(name))
+
+    def find_by_gecko_id(self, gecko_id: str) -> Optional[str]:
+        """Get the slug of the protocol with this CoinGecko id."""
+        return self._ensure_loaded()["by_gecko_id"].get(gecko_id)
+
+    def search(self, text: str, limit: int = 20, threshold: float = 0.5) -> List[str]:
+        """
+        Find protocols whose names are similar to the text.
+
+        Args:
+            text (str): Protocol name as written by the user
+            limit (int): Maximum number of candidates
+            threshold (float): Minimum cosine similarity
+
+        Returns:
+            List[str]: Slugs of the matching protocols, least similar first
+        """
+        catalog = self._ensure_loaded()
+        # Rows are L2-normalized, so the dot product is the cosine similarity
+        scores = (catalog["matrix"] @ catalog["vectorizer"].transform([text]).T).toarray().ravel()
+        top = scores.argsort()[-limit:]
+        return [catalog["slugs"][index] for index in top if scores[index] > threshold]
+
+
+# Create an instance to act as a singleton index
+protocol_index = ProtocolIndex(Config.PROTOCOL_INDEX_PATH, Config.PROTOCOL_INDEX_REFRESH_SECONDS)
@@ -1,7 +1,8 @@
 import logging
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
-from src.stores import chat_manager_instance, agent_manager_instance
+from src.config import Config
+from src.stores import agent_manager_instance, session_manager_instance
 
 logger = logging.getLogger(__name__)
 
@@ -9,11 +10,11 @@ router = APIRouter(prefix="/crypto_data", tags=["crypto_data"])
 
 
 @router.post("/process_data")
-async def process_data(data: dict):
+async def process_data(data: dict, session_id: str = Config.DEFAULT_SESSION_ID):
     """Process crypto data"""
     logger.info("Data Agent: Received process_data request")
     try:
-        crypto_agent = agent_manager_instance.get_agent("crypto data")
+        crypto_agent = await agent_manager_instance.aget_agent("crypto data")
         if not crypto_agent:
             return JSONResponse(
                 status_code=400,
@@ -21,7 +22,8 @@ async def process_data(data: dict):
             )
 
         response = await crypto_agent.process_data(data)
-        chat_manager_instance.add_message(response)
+        session = await session_manager_instance.aget_session(session_id)
+        session.chat_manager.add_message(response)
         return response
     except Exception as e:
         logger.error(f"Failed to process data: {str(e)}")
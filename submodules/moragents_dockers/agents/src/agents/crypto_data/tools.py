@@ -1,30 +1,32 @@
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from src.agents.crypto_data.coin_index import coin_index
 from src.agents.crypto_data.config import Config
-
-
-def get_most_similar(text, data):
-    """Returns a list of most similar items based on cosine similarity."""
-    vectorizer = TfidfVectorizer()
-    sentence_vectors = vectorizer.fit_transform(data)
-    text_vector = vectorizer.transform([text])
-    similarity_scores = cosine_similarity(text_vector, sentence_vectors)
-    top_indices = similarity_scores.argsort()[0][-20:]
-    top_matches = [data[item] for item in top_indices if similarity_scores[0][item] > 0.5]
-    return top_matches
+from src.agents.crypto_data.http_client import aget_json, get_json
+from src.agents.crypto_data.market_cache import market_cache
+from src.agents.crypto_data.protocol_index import protocol_index
 
 
 def get_coingecko_id(text, type="coin"):
     """Get the CoinGecko ID for a given coin or NFT."""
+    coingecko_id = coin_index.lookup(text, type)
+    if coingecko_id:
+        return coingecko_id
+
+    # Fall back to search for assets listed since the index was last refreshed. Results,
+    # including misses, are cached so a turn's prefetch and tool calls share one search.
+    key = (type, " ".join(str(text).lower().split()))
+    return market_cache.get("search", key, lambda: _search_coingecko_id(text, type))
+
+
+def _search_coingecko_id(text, type):
     url = f"{Config.COINGECKO_BASE_URL}/search"
     params = {"query": text}
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = get_json(url, params)
         if type == "coin":
             return data["coins"][0]["id"] if data["coins"] else None
         elif type == "nft":
@@ -38,11 +40,16 @@ def get_coingecko_id(text, type="coin"):
 
 def get_tradingview_symbol(coingecko_id):
     """Convert a CoinGecko ID to a TradingView symbol."""
+    symbol = coin_index.get_symbol(coingecko_id)
+    if symbol:
+        return f"CRYPTO:{symbol.upper()}USD"
+    return market_cache.get("symbol", coingecko_id, lambda: _fetch_tradingview_symbol(coingecko_id))
+
+
+def _fetch_tradingview_symbol(coingecko_id):
     url = f"{Config.COINGECKO_BASE_URL}/coins/{coingecko_id}"
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        data = get_json(url)
         symbol = data.get("symbol", "").upper()
         return f"CRYPTO:{symbol}USD" if symbol else None
     except requests.exceptions.RequestException as e:
@@ -50,22 +57,45 @@ def get_tradingview_symbol(coingecko_id):
         raise
 
 
-def get_price(coin):
-    """Get the price of a coin from CoinGecko API."""
-    coin_id = get_coingecko_id(coin, type="coin")
-    if not coin_id:
-        return None
+def get_prices(coin_ids):
+    """Get USD prices for several coins with a single CoinGecko request."""
     url = f"{Config.COINGECKO_BASE_URL}/simple/price"
-    params = {"ids": coin_id, "vs_currencies": "USD"}
+
+    def load(missing_ids):
+        data = get_json(url, {"ids": ",".join(missing_ids), "vs_currencies": "usd"})
+        return {coin_id: data.get(coin_id, {}).get("usd") for coin_id in missing_ids}
+
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()[coin_id]["usd"]
+        return market_cache.get_many("price", coin_ids, load)
     except requests.exceptions.RequestException as e:
         logging.error(f"Failed to retrieve price: {str(e)}")
         raise
 
 
+def get_markets(coin_ids):
+    """Get market data (market cap, FDV, ...) for several coins with a single CoinGecko request."""
+    url = f"{Config.COINGECKO_BASE_URL}/coins/markets"
+
+    def load(missing_ids):
+        rows = get_json(url, {"ids": ",".join(missing_ids), "vs_currency": "usd"})
+        by_id = {row["id"]: row for row in rows}
+        return {coin_id: by_id.get(coin_id) for coin_id in missing_ids}
+
+    try:
+        return market_cache.get_many("markets", coin_ids, load)
+    except requests.exceptions.RequestException as e:
+        logging.error(f"Failed to retrieve market data: {str(e)}")
+        raise
+
+
+def get_price(coin):
+    """Get the price of a coin from CoinGecko API."""
+    coin_id = get_coingecko_id(coin, type="coin")
+    if not coin_id:
+        return None
+    return get_prices([coin_id])[coin_id]
+
+
 def get_floor_price(nft):
     """Get the floor price of an NFT from CoinGecko API."""
     nft_id = get_coingecko_id(str(nft), type="nft")
@@ -73,9 +103,7 @@ def get_floor_price(nft):
         return None
     url = f"{Config.COINGECKO_BASE_URL}/nfts/{nft_id}"
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.json()["floor_price"]["usd"]
+        return market_cache.get("floor_price", nft_id, lambda: get_json(url)["floor_price"]["usd"])
     except requests.exceptions.RequestException as e:
         logging.error(f"Failed to retrieve floor price: {str(e)}")
         raise
@@ -86,15 +114,7 @@ def get_fdv(coin):
     coin_id = get_coingecko_id(coin, type="coin")
     if not coin_id:
         return None
-    url = f"{Config.COINGECKO_BASE_URL}/coins/{coin_id}"
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        return data.get("market_data", {}).get("fully_diluted_valuation", {}).get("usd")
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Failed to retrieve FDV: {str(e)}")
-        raise
+    return (get_markets([coin_id])[coin_id] or {}).get("fully_diluted_valuation")
 
 
 def get_market_cap(coin):
@@ -102,41 +122,57 @@ def get_market_cap(coin):
     coin_id = get_coingecko_id(coin, type="coin")
     if not coin_id:
         return None
-    url = f"{Config.COINGECKO_BASE_URL}/coins/markets"
-    params = {"ids": coin_id, "vs_currency": "USD"}
-    try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()[0]["market_cap"]
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Failed to retrieve market cap: {str(e)}")
-        raise
-
+    return (get_markets([coin_id])[coin_id] or {}).get("market_cap")
+
+
+def _market_data_ids(tool_calls):
+    """Group the coins named in a turn's tool calls by the batched endpoint serving them."""
+    price_ids, market_ids = set(), set()
+    for tool_call in tool_calls:
+        coin_name = (tool_call.get("args") or {}).get("coin_name")
+        coin_id = get_coingecko_id(coin_name) if coin_name else None
+        if not coin_id:
+            continue
+        if tool_call.get("name") == "get_price":
+            price_ids.add(coin_id)
+        elif tool_call.get("name") in ("get_market_cap", "get_fdv"):
+            market_ids.add(coin_id)
+    return sorted(price_ids), sorted(market_ids)
+
+
+async def aprefetch_market_data(tool_calls):
+    """Warm the cache for every coin in a turn, requesting prices and market data concurrently."""
+    price_ids, market_ids = await asyncio.to_thread(_market_data_ids, tool_calls)
+
+    async def fetch_prices(coin_ids):
+        data = await aget_json(
+            f"{Config.COINGECKO_BASE_URL}/simple/price",
+            {"ids": ",".join(coin_ids), "vs_currencies": "usd"},
+        )
+        return {coin_id: data.get(coin_id, {}).get("usd") for coin_id in coin_ids}
 
-def get_protocols_list():
-    """Get the list of protocols from DefiLlama API."""
-    url = f"{Config.DEFILLAMA_BASE_URL}/protocols"
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
-        return (
-            [item["slug"] for item in data],
-            [item["name"] for item in data],
-            [item["gecko_id"] for item in data],
+    async def fetch_markets(coin_ids):
+        rows = await aget_json(
+            f"{Config.COINGECKO_BASE_URL}/coins/markets",
+            {"ids": ",".join(coin_ids), "vs_currency": "usd"},
         )
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Failed to retrieve protocols list: {str(e)}")
-        raise
+        return {row["id"]: row for row in rows}
+
+    fetches = []
+    if price_ids:
+        fetches.append(market_cache.aget_many("price", price_ids, fetch_prices))
+    if market_ids:
+        fetches.append(market_cache.aget_many("markets", market_ids, fetch_markets))
+    for result in await asyncio.gather(*fetches, return_exceptions=True):
+        if isinstance(result, Exception):
+            logging.warning(f"Failed to prefetch market data: {str(result)}")
 
 
 def get_tvl_value(protocol_id):
     """Gets the TVL value using the protocol ID from DefiLlama API."""
     url = f"{Config.DEFILLAMA_BASE_URL}/tvl/{protocol_id}"
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.json()
+        return get_json(url)
     except requests.exceptions.RequestException as e:
         logging.error(f"Failed to retrieve protocol TVL: {str(e)}")
         raise
@@ -144,26 +180,29 @@ def get_tvl_value(protocol_id):
 
 def get_protocol_tvl(protocol_name):
     """Get the TVL (Total Value Locked) of a protocol from DefiLlama API."""
-    id, name, gecko = get_protocols_list()
+    key = " ".join(protocol_name.lower().split())
+    return market_cache.get("tvl", key, lambda: _find_protocol_tvl(protocol_name))
+
+
+def _find_protocol_tvl(protocol_name):
+    protocol_id = protocol_index.find_by_name(protocol_name)
+    if protocol_id:
+        return {protocol_id: get_tvl_value(protocol_id)}
+
     tag = get_coingecko_id(protocol_name)
     if tag:
-        protocol_id = next((i for i, j in zip(id, gecko) if j == tag), None)
+        protocol_id = protocol_index.find_by_gecko_id(tag)
         if protocol_id:
             return {tag: get_tvl_value(protocol_id)}
-    if not tag or not protocol_id:
-        res = get_most_similar(protocol_name, name)
-        if not res:
-            return None
-        else:
-            result = []
-            for item in res:
-                protocol_id = next((i for i, j in zip(id, name) if j == item), None)
-                tvl = get_tvl_value(protocol_id)
-                result.append({protocol_id: tvl})
-            if not result:
-                return None
-            max_key = max(result, key=lambda dct: dct.get(list(dct.keys())[0]))
-            return max_key
+
+    candidates = protocol_index.search(protocol_name)
+    if not candidates:
+        return None
+    # Fetch candidate TVLs concurrently rather than one round trip at a time
+    with ThreadPoolExecutor(max_workers=Config.TVL_FETCH_WORKERS) as pool:
+        tvls = list(pool.map(get_tvl_value, candidates))
+    protocol_id, tvl = max(zip(candidates, tvls), key=lambda candidate: candidate[1])
+    return {protocol_id: tvl}
 
 
 def get_coin_price_tool(coin_name):
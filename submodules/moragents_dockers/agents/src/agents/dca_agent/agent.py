@@ -49,3 +49,8 @@ class DCAAgent:
         except Exception as e:
             logger.error(f"Error in chat method: {str(e)}")
             return {"role": "assistant", "content": str(e)}
+
+    async def achat(self, request: ChatRequest):
+        """Handle incoming chat requests without blocking the event loop"""
+        # CDP configuration and wallet lookups are in-memory, so the sync path never blocks
+        return self.chat(request)
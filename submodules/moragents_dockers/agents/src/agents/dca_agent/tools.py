@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Dict, Optional, Any
 from datetime import timedelta
@@ -69,7 +70,7 @@ class DCAActionHandler:
     def __init__(self):
         self.wallet_manager = wallet_manager_instance
 
-    async def execute(self, params: Dict[str, Any]) -> None:
+    async def execute(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Execute DCA trade"""
         try:
             dca_params = DCAParams.from_dict(params)
@@ -82,8 +83,8 @@ class DCAActionHandler:
             if not wallet:
                 raise ValueError(f"Wallet {dca_params.wallet_id} not found")
 
-            # Check balance
-            balance_result = get_balance(wallet, dca_params.origin_token)
+            # CDP calls block until the chain responds, so keep them off the event loop
+            balance_result = await asyncio.to_thread(get_balance, wallet, dca_params.origin_token)
             if Decimal(balance_result["balance"]) < dca_params.step_size:
                 raise ValueError(f"Insufficient {dca_params.origin_token} balance")
 
@@ -103,7 +104,8 @@ class DCAActionHandler:
             #         return
 
             # Execute trade using swap_assets
-            swap_assets(
+            result = await asyncio.to_thread(
+                swap_assets,
                 agent_wallet=wallet,
                 amount=str(dca_params.step_size),
                 from_asset_id=dca_params.origin_token,
@@ -111,6 +113,7 @@ class DCAActionHandler:
             )
 
             logger.info(f"DCA trade executed successfully")
+            return result
 
         except Exception as e:
             logger.error(f"DCA execution failed: {e}")
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from src.models.messages import ChatRequest
@@ -11,42 +12,62 @@ class DefaultAgent:
         self.config = config
         self.llm = llm
 
+    def _build_messages(self, prompt):
+        # Get currently selected agents for system prompt
+        available_agents = agent_manager_instance.get_available_agents()
+        selected_agent_names = agent_manager_instance.get_selected_agents()
+
+        # Build list of human readable names for selected agents
+        selected_agents_info = []
+        for agent in available_agents:
+            if agent["name"] in selected_agent_names and agent["name"] != "default":
+                human_name = agent.get("human_readable_name", agent["name"])
+                selected_agents_info.append(f"- {human_name}: {agent['description']}")
+
+        system_prompt = (
+            "You are a helpful assistant that can engage in general conversation and provide information about Morpheus agents when specifically asked.\n"
+            "For general questions, respond naturally without mentioning Morpheus or its agents.\n"
+            "Only when explicitly asked about Morpheus or its capabilities, use this list of available agents:\n"
+            f"{chr(10).join(selected_agents_info)}\n"
+            "Remember: Only mention Morpheus agents if directly asked about them. Otherwise, simply answer questions normally as a helpful assistant."
+        )
+
+        return [
+            {
+                "role": "system",
+                "content": system_prompt,
+            },
+            {"role": "user", "content": prompt},
+        ]
+
     def chat(self, request: ChatRequest):
+        # Synchronous entry point for callers outside the event loop
+        return asyncio.run(self.achat(request))
+
+    async def achat(self, request: ChatRequest):
         try:
             data = request.dict()
             if "prompt" in data:
                 prompt = data["prompt"]["content"]
-                # Get currently selected agents for system prompt
-                available_agents = agent_manager_instance.get_available_agents()
-                selected_agent_names = agent_manager_instance.get_selected_agents()
-
-                # Build list of human readable names for selected agents
-                selected_agents_info = []
-                for agent in available_agents:
-                    if agent["name"] in selected_agent_names and agent["name"] != "default":
-                        human_name = agent.get("human_readable_name", agent["name"])
-                        selected_agents_info.append(f"- {human_name}: {agent['description']}")
-
-                system_prompt = (
-                    "You are a helpful assistant that can engage in general conversation and provide information about Morpheus agents when specifically asked.\n"
-                    "For general questions, respond naturally without mentioning Morpheus or its agents.\n"
-                    "Only when explicitly asked about Morpheus or its capabilities, use this list of available agents:\n"
-                    f"{chr(10).join(selected_agents_info)}\n"
-                    "Remember: Only mention Morpheus agents if directly asked about them. Otherwise, simply answer questions normally as a helpful assistant."
-                )
-
-                messages = [
-                    {
-                        "role": "system",
-                        "content": system_prompt,
-                    },
-                    {"role": "user", "content": prompt},
-                ]
-
-                result = self.llm.invoke(messages)
+                messages = self._build_messages(prompt)
+
+                result = await self.llm.ainvoke(messages)
                 return {"role": "assistant", "content": result.content.strip()}
             else:
                 return {"error": "Missing required parameters"}, 400
         except Exception as e:
             logger.error(f"Error in chat endpoint: {str(e)}")
             return {"Error": str(e)}, 500
+
+    async def astream_chat(self, request: ChatRequest):
+        prompt = request.prompt.content
+        messages = self._build_messages(prompt)
+
+        chunks = []
+        async for chunk in self.llm.astream(messages):
+            if chunk.content:
+                chunks.append(chunk.content)
+                yield {"type": "token", "content": chunk.content}
+
+        response = {"role": "assistant", "content": "".join(chunks).strip()}
+        yield {"type": "done", "response": response}
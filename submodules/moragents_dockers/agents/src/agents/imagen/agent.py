@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import logging
 from io import BytesIO
@@ -142,12 +143,17 @@ class ImagenAgent:
         }
 
     def chat(self, request: ChatRequest):
+        # Synchronous entry point for callers outside the event loop
+        return asyncio.run(self.achat(request))
+
+    async def achat(self, request: ChatRequest):
         try:
             data = request.dict()
             logger.info(f"Received chat request: {data}")
             if "prompt" in data:
                 prompt = data["prompt"]
-                result = self.generate_image(prompt["content"])
+                # Selenium drives a real browser, so keep it off the event loop
+                result = await asyncio.to_thread(self.generate_image, prompt["content"])
                 return {"role": "assistant", "content": result}
             else:
                 logger.error("Missing 'prompt' in chat request data")
@@ -1,8 +1,11 @@
+import asyncio
 import logging
+from typing import Any, Dict
 
 from src.agents.mor_claims import tools
 from src.models.messages import ChatRequest
-from src.stores import agent_manager_instance
+from src.stores import session_manager_instance
+from src.stores.session_manager import Session
 
 logger = logging.getLogger(__name__)
 
@@ -15,14 +18,14 @@ class MorClaimsAgent:
         self.tools_provided = tools.get_tools()
         self.conversation_state = {}
 
-    def _get_response(self, message, wallet_address):
+    def _get_response(self, message, wallet_address, session: Session):
         if wallet_address not in self.conversation_state:
             self.conversation_state[wallet_address] = {"state": "initial"}
 
         state = self.conversation_state[wallet_address]["state"]
 
         if state == "initial":
-            agent_manager_instance.set_active_agent(self.agent_info["name"])
+            session.active_agent = self.agent_info["name"]
 
             rewards = {
                 0: tools.get_current_user_reward(wallet_address, 0),
@@ -95,12 +98,23 @@ class MorClaimsAgent:
         )
 
     def chat(self, request: ChatRequest):
+        return self._chat(request, session_manager_instance.get_session(request.session_id))
+
+    async def achat(self, request: ChatRequest):
+        # The session is looked up on the event loop, as the session manager isn't thread-safe;
+        # only the blocking reward lookups run in a worker thread
+        session = session_manager_instance.get_session(request.session_id)
+        return await asyncio.to_thread(self._chat, request, session)
+
+    def _chat(self, request: ChatRequest, session: Session):
         try:
             data = request.dict()
             if "prompt" in data and "wallet_address" in data:
                 prompt = data["prompt"]
                 wallet_address = data["wallet_address"]
-                response, role, next_turn_agent = self._get_response([prompt], wallet_address)
+                response, role, next_turn_agent = self._get_response(
+                    [prompt], wallet_address, session
+                )
                 return {
                     "role": role,
                     "content": response,
@@ -112,12 +126,11 @@ class MorClaimsAgent:
             logger.error(f"Unexpected error in chat method: {str(e)}, request: {request}")
             raise e
 
-    def claim(self, request: ChatRequest):
+    def claim(self, data: Dict[str, Any], session: Session):
         try:
-            data = request.dict()
             wallet_address = data["wallet_address"]
             transactions = self.conversation_state[wallet_address]["transactions"]
-            agent_manager_instance.clear_active_agent()
+            session.active_agent = None
             return {"transactions": transactions}
         except Exception as e:
             return {"error": str(e)}, 500
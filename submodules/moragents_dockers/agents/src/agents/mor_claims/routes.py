@@ -1,7 +1,8 @@
 import logging
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
-from src.stores import chat_manager_instance, agent_manager_instance
+from src.config import Config
+from src.stores import agent_manager_instance, session_manager_instance
 
 logger = logging.getLogger(__name__)
 
@@ -9,19 +10,23 @@ router = APIRouter(prefix="/claim", tags=["claim"])
 
 
 @router.post("/claim")
-async def claim(request: Request):
+async def claim(request: Request, session_id: str = Config.DEFAULT_SESSION_ID):
     """Process a claim request"""
     logger.info("Received claim request")
     try:
-        claim_agent = agent_manager_instance.get_agent("claim")
+        claim_agent = await agent_manager_instance.aget_agent("claim")
         if not claim_agent:
             return JSONResponse(
                 status_code=400,
                 content={"status": "error", "message": "Claim agent not found"},
             )
 
-        response = await claim_agent.claim(request)
-        chat_manager_instance.add_message(response)
+        session = await session_manager_instance.aget_session(session_id)
+        response = claim_agent.claim(await request.json(), session)
+        if isinstance(response, tuple):
+            content, status_code = response
+            return JSONResponse(status_code=status_code, content=content)
+        session.chat_manager.add_message(response)
         return response
     except Exception as e:
         logger.error(f"Failed to process claim: {str(e)}")
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from src.agents.mor_rewards import tools
@@ -13,18 +14,19 @@ class MorRewardsAgent:
         self.embeddings = embeddings
         self.tools_provided = tools.get_tools()
 
-    def get_response(self, message, wallet_address):
+    async def aget_response(self, message, wallet_address):
         logger.info(f"Checking rewards for wallet address: {wallet_address}")
 
         try:
-            rewards = {
-                0: tools.get_current_user_reward(wallet_address, 0),
-                1: tools.get_current_user_reward(wallet_address, 1),
-            }
+            # Both pools are read over blocking web3 RPC calls, so query them concurrently
+            pool_0_reward, pool_1_reward = await asyncio.gather(
+                asyncio.to_thread(tools.get_current_user_reward, wallet_address, 0),
+                asyncio.to_thread(tools.get_current_user_reward, wallet_address, 1),
+            )
 
-            response = f"Your current MOR rewards:\n"
-            response += f"Capital Providers Pool (Pool 0): {rewards[0]} MOR\n"
-            response += f"Code Providers Pool (Pool 1): {rewards[1]} MOR"
+            response = "Your current MOR rewards:\n"
+            response += f"Capital Providers Pool (Pool 0): {pool_0_reward} MOR\n"
+            response += f"Code Providers Pool (Pool 1): {pool_1_reward} MOR"
 
             logger.info(f"Rewards retrieved successfully for {wallet_address}")
             return response, "assistant", None
@@ -37,12 +39,16 @@ class MorRewardsAgent:
             )
 
     def chat(self, request: ChatRequest):
+        # Synchronous entry point for callers outside the event loop
+        return asyncio.run(self.achat(request))
+
+    async def achat(self, request: ChatRequest):
         try:
             data = request.dict()
             if "prompt" in data and "wallet_address" in data:
                 prompt = data["prompt"]
                 wallet_address = data["wallet_address"]
-                response, role, next_turn_agent = self.get_response(prompt, wallet_address)
+                response, role, next_turn_agent = await self.aget_response(prompt, wallet_address)
                 return {
                     "role": role,
                     "content": response,
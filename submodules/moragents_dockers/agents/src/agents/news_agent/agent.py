@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import re
 
@@ -40,19 +41,19 @@ class NewsAgent:
             }
         ]
 
-    def check_relevance_and_summarize(self, title, content, coin):
+    async def acheck_relevance_and_summarize(self, title, content, coin):
         logger.info(f"Checking relevance for {coin}: {title}")
         prompt = Config.RELEVANCE_PROMPT.format(coin=coin, title=title, content=content)
-        result = self.llm.invoke(
+        result = await self.llm.ainvoke(
             input=[{"role": "user", "content": prompt}],
             max_tokens=Config.LLM_MAX_TOKENS,
             temperature=Config.LLM_TEMPERATURE,
         )
         return result.content.strip()
 
-    def process_rss_feed(self, feed_url, coin):
+    async def aprocess_rss_feed(self, feed_url, coin):
         logger.info(f"Processing RSS feed for {coin}: {feed_url}")
-        feed = fetch_rss_feed(feed_url)
+        feed = await asyncio.to_thread(fetch_rss_feed, feed_url)
         results = []
         for entry in feed.entries:
             published_time = entry.get("published") or entry.get("updated")
@@ -60,7 +61,7 @@ class NewsAgent:
                 title = clean_html(entry.title)
                 content = clean_html(entry.summary)
                 logger.info(f"Checking relevance for article: {title}")
-                result = self.check_relevance_and_summarize(title, content, coin)
+                result = await self.acheck_relevance_and_summarize(title, content, coin)
                 if not result.upper().startswith("NOT RELEVANT"):
                     results.append({"Title": title, "Summary": result, "Link": entry.link})
                 if len(results) >= Config.ARTICLES_PER_TOKEN:
@@ -70,22 +71,44 @@ class NewsAgent:
         logger.info(f"Found {len(results)} relevant articles for {coin}")
         return results
 
-    def fetch_crypto_news(self, coins):
+    async def afetch_crypto_news(self, coins):
         logger.info(f"Fetching news for coins: {coins}")
-        all_news = []
-        for coin in coins:
+
+        async def fetch_coin_news(coin):
             logger.info(f"Processing news for {coin}")
             coin_name = Config.CRYPTO_DICT.get(coin.upper(), coin)
             google_news_url = Config.GOOGLE_NEWS_BASE_URL.format(coin_name)
-            results = self.process_rss_feed(google_news_url, coin_name)
-            all_news.extend(
-                [{"Coin": coin, **result} for result in results[: Config.ARTICLES_PER_TOKEN]]
-            )
+            results = await self.aprocess_rss_feed(google_news_url, coin_name)
+            return [{"Coin": coin, **result} for result in results[: Config.ARTICLES_PER_TOKEN]]
+
+        # Coins are independent, so their feeds and relevance checks can overlap
+        coin_results = await asyncio.gather(*(fetch_coin_news(coin) for coin in coins))
+        all_news = [item for news in coin_results for item in news]
 
         logger.info(f"Total news items fetched: {len(all_news)}")
         return all_news
 
+    def _extract_coins(self, prompt):
+        return re.findall(
+            r"\b(" + "|".join(re.escape(key) for key in Config.CRYPTO_DICT.keys()) + r")\b",
+            prompt.upper(),
+        )
+
+    def _format_news_response(self, news, short_urls):
+        response = "Here are the latest news items relevant to changes in price movement of the mentioned tokens in the last 24 hours:\n\n"
+        for index, (item, short_url) in enumerate(zip(news, short_urls), start=1):
+            coin_name = Config.CRYPTO_DICT.get(item["Coin"], item["Coin"])
+            response += f"{index}. ***{coin_name} News***:\n"
+            response += f"{item['Title']}\n"
+            response += f"{item['Summary']}\n"
+            response += f"Read more: {short_url}\n\n"
+        return response
+
     def chat(self, request: ChatRequest):
+        # Synchronous entry point for callers outside the event loop
+        return asyncio.run(self.achat(request))
+
+    async def achat(self, request: ChatRequest):
         try:
             data = request.dict()
             if "prompt" in data:
@@ -93,11 +116,7 @@ class NewsAgent:
                 if isinstance(prompt, dict) and "content" in prompt:
                     prompt = prompt["content"]
 
-                # Updated coin detection logic
-                coins = re.findall(
-                    r"\b(" + "|".join(re.escape(key) for key in Config.CRYPTO_DICT.keys()) + r")\b",
-                    prompt.upper(),
-                )
+                coins = self._extract_coins(prompt)
 
                 if not coins:
                     return {
@@ -106,7 +125,7 @@ class NewsAgent:
                         "next_turn_agent": None,
                     }
 
-                news = self.fetch_crypto_news(coins)
+                news = await self.afetch_crypto_news(coins)
 
                 if not news:
                     return {
@@ -115,18 +134,15 @@ class NewsAgent:
                         "next_turn_agent": None,
                     }
 
-                response = "Here are the latest news items relevant to changes in price movement of the mentioned tokens in the last 24 hours:\n\n"
-                for index, item in enumerate(news, start=1):
-                    coin_name = Config.CRYPTO_DICT.get(item["Coin"], item["Coin"])
-                    short_url = self.url_shortener.tinyurl.short(item["Link"])
-                    response += f"{index}. ***{coin_name} News***:\n"
-                    response += f"{item['Title']}\n"
-                    response += f"{item['Summary']}\n"
-                    response += f"Read more: {short_url}\n\n"
-
+                short_urls = await asyncio.gather(
+                    *(
+                        asyncio.to_thread(self.url_shortener.tinyurl.short, item["Link"])
+                        for item in news
+                    )
+                )
                 return {
                     "role": "assistant",
-                    "content": response,
+                    "content": self._format_news_response(news, short_urls),
                     "next_turn_agent": None,
                 }
             else:
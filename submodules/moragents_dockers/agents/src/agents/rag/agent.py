@@ -1,19 +1,21 @@
+import asyncio
 import logging
 import os
 
 from fastapi import Request
-from langchain_community.document_loaders import PyMuPDFLoader
-from langchain_community.vectorstores import FAISS
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_text_splitters.character import RecursiveCharacterTextSplitter
-from werkzeug.utils import secure_filename
-
+from src.agents.rag.config import Config
+from src.agents.rag.embedding_cache import cache_embeddings
+from src.agents.rag.ingestion import DocumentIngestor, spool_upload
+from src.agents.rag.jobs import ingestion_jobs
+from src.agents.rag.vector_store import document_index_store
 from src.models.messages import ChatRequest
-from src.stores import agent_manager_instance, chat_manager_instance
+from src.stores import session_manager_instance
+from werkzeug.utils import secure_filename
 
 logger = logging.getLogger(__name__)
 
-UPLOAD_FOLDER = os.path.join(os.getcwd(), "uploads")
+UPLOAD_FOLDER = Config.UPLOAD_FOLDER
 
 
 class RagAgent:
@@ -21,6 +23,9 @@ class RagAgent:
         self.config = config
         self.llm = llm
         self.embedding = embeddings
+        # Chunks are embedded through the cache, queries go straight to the model
+        self.document_embedding = cache_embeddings(embeddings, Config.EMBEDDING_CACHE_FOLDER)
+        self.ingestor = DocumentIngestor(self.document_embedding)
         self.messages = [{"role": "assistant", "content": "Please upload a file to begin"}]
 
         self.prompt = ChatPromptTemplate.from_template(
@@ -35,80 +40,131 @@ class RagAgent:
             """
         )
         self.max_size = 5 * 1024 * 1024
-        self.retriever = None
-
-    async def handle_file_upload(self, file):
-        if not os.path.exists(UPLOAD_FOLDER):
-            os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-        filename = secure_filename(file.filename)
-        file_path = os.path.join(UPLOAD_FOLDER, filename)
-
-        # Save the file
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-
-        # DocumentToolsGenerator class instantiation
-        loader = PyMuPDFLoader(file_path)
-        docs = loader.load()
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1024,
-            chunk_overlap=20,
-            length_function=len,
-            is_separator_regex=False,
-        )
-        split_documents = text_splitter.split_documents(docs)
-        vector_store = FAISS.from_documents(split_documents, self.embedding)
-        self.retriever = vector_store.as_retriever(search_kwargs={"k": 7})
 
-    async def upload_file(self, request: Request):
+        # Upload status lives with the in-memory session, so a session's documents can't be
+        # searched once it expires. Drop those left by earlier runs, and the rest as they expire.
+        document_index_store.retain_sessions(session_manager_instance.list_sessions())
+        session_manager_instance.add_expiry_listener(document_index_store.remove_session)
+
+    async def _aget_retriever(self, session_id):
+        # Each session searches every document it uploaded itself
+        return await document_index_store.aget_retriever(session_id, self.embedding)
+
+    def _no_retriever_message(self, session_id):
+        if document_index_store.get_session_documents(session_id):
+            return "Your document is still being processed, please try again in a moment"
+        return "Please upload a file first"
+
+    async def handle_file_upload(self, job, file_path, doc_hash):
+        filename, session_id = job.filename, job.session_id
+        chat_manager = session_manager_instance.get_session(session_id).chat_manager
+        if document_index_store.has(doc_hash):
+            logger.info(f"Reusing the index of {filename}, its content was already indexed")
+            os.remove(file_path)
+            document_index_store.add_session_document(session_id, doc_hash)
+            chat_manager.set_uploaded_file(True)
+            return
+
+        document_path = self._store_document(file_path, doc_hash, filename)
+        # Register the document up front so chat can search batches as soon as they're indexed
+        document_index_store.add_session_document(session_id, doc_hash)
+
+        def on_batch(batch_store):
+            document_index_store.add_partial(doc_hash, batch_store)
+            # The session has something to search from the first indexed batch on
+            if not chat_manager.get_uploaded_file_status():
+                chat_manager.set_uploaded_file(True)
+
+        try:
+            vector_store = await self.ingestor.ingest(
+                document_path, on_progress=job.update_progress, on_batch=on_batch
+            )
+            if vector_store is None:
+                raise ValueError(f"No text could be extracted from {filename}")
+            job.stage = "saving"
+            await asyncio.to_thread(document_index_store.save, doc_hash, vector_store, filename)
+        except Exception:
+            self._discard_document(session_id, doc_hash, document_path)
+            raise
+
+    @staticmethod
+    def _store_document(file_path, doc_hash, filename):
+        # Stored under its content hash, so uploads sharing a filename can't overwrite each other
+        document_path = os.path.join(UPLOAD_FOLDER, f"{doc_hash}{os.path.splitext(filename)[1]}")
+        try:
+            os.replace(file_path, document_path)
+        except OSError:
+            os.remove(file_path)
+            raise
+        return document_path
+
+    @staticmethod
+    def _discard_document(session_id, doc_hash, document_path):
+        document_index_store.discard_partial(doc_hash)
+        document_index_store.remove_session_document(session_id, doc_hash)
+        if not document_index_store.get_session_documents(session_id):
+            chat_manager = session_manager_instance.get_session(session_id).chat_manager
+            chat_manager.set_uploaded_file(False)
+        if os.path.exists(document_path):
+            os.remove(document_path)
+
+    async def upload_file(self, request: Request, session_id: str):
         logger.info(f"Received upload request: {request}")
         file = request["file"]
         if file.filename == "":
             return {"error": "No selected file"}, 400
 
-        # Check file size to ensure it's less than 5 MB
-        content = await file.read()
-        await file.seek(0)
-        if len(content) > self.max_size:
+        # Stream the file to disk, rejecting it once it grows past 5 MB
+        spooled = await spool_upload(file, UPLOAD_FOLDER, self.max_size)
+        if spooled is None:
             return {"role": "assistant", "content": "Please use a file less than 5 MB"}
+        file_path, doc_hash = spooled
 
-        try:
-            await self.handle_file_upload(file)
-            chat_manager_instance.set_uploaded_file(True)
-            return {
-                "role": "assistant",
-                "content": "You have successfully uploaded the text",
-            }
-        except Exception as e:
-            logging.error(f"Error during file upload: {str(e)}")
-            return {"error": str(e)}, 500
+        # Parsing and embedding continue in the background, polled through /rag/jobs/{job_id}
+        job = ingestion_jobs.submit(
+            session_id,
+            secure_filename(file.filename),
+            lambda job: self.handle_file_upload(job, file_path, doc_hash),
+        )
+        return {
+            "role": "assistant",
+            "content": "You have successfully uploaded the text, it is being processed now",
+            "job_id": job.id,
+        }
 
-    def _get_rag_response(self, prompt):
-        retrieved_docs = self.retriever.invoke(prompt)
+    def _build_rag_messages(self, prompt, retrieved_docs):
         formatted_context = "\n\n".join(doc.page_content for doc in retrieved_docs)
         formatted_prompt = f"Question: {prompt}\n\nContext: {formatted_context}"
         system_prompt = "You are a helpful assistant. Use the provided context to respond to the following question."
 
-        messages = [
+        return [
             {
                 "role": "system",
                 "content": system_prompt,
             },
             {"role": "user", "content": formatted_prompt},
         ]
-        result = self.llm.invoke(messages)
+
+    async def _aget_rag_response(self, prompt, retriever):
+        retrieved_docs = await retriever.ainvoke(prompt)
+        messages = self._build_rag_messages(prompt, retrieved_docs)
+        result = await self.llm.ainvoke(messages)
         return result.content.strip()
 
     def chat(self, request: ChatRequest):
+        # Synchronous entry point for callers outside the event loop
+        return asyncio.run(self.achat(request))
+
+    async def achat(self, request: ChatRequest):
         try:
             data = request.dict()
             if "prompt" in data:
                 prompt = data["prompt"]["content"]
-                if chat_manager_instance.get_uploaded_file_status():
-                    response = self._get_rag_response(prompt)
+                retriever = await self._aget_retriever(request.session_id)
+                if retriever:
+                    response = await self._aget_rag_response(prompt, retriever)
                 else:
-                    response = "Please upload a file first"
+                    response = self._no_retriever_message(request.session_id)
                 return {"role": "assistant", "content": response}
 
             else:
@@ -116,3 +172,24 @@ class RagAgent:
         except Exception as e:
             logging.error(f"Error in chat endpoint: {str(e)}")
             raise e
+
+    async def astream_chat(self, request: ChatRequest):
+        prompt = request.prompt.content
+        retriever = await self._aget_retriever(request.session_id)
+        if not retriever:
+            content = self._no_retriever_message(request.session_id)
+            yield {"type": "done", "response": {"role": "assistant", "content": content}}
+            return
+
+        yield {"type": "status", "content": "Searching the uploaded documents"}
+        retrieved_docs = await retriever.ainvoke(prompt)
+        messages = self._build_rag_messages(prompt, retrieved_docs)
+
+        chunks = []
+        async for chunk in self.llm.astream(messages):
+            if chunk.content:
+                chunks.append(chunk.content)
+                yield {"type": "token", "content": chunk.content}
+
+        response = {"role": "assistant", "content": "".join(chunks).strip()}
+        yield {"type": "done", "response": response}
@@ -1,4 +1,5 @@
 import logging
+import os
 
 # Logging configuration
 logging.basicConfig(level=logging.INFO)
@@ -8,3 +9,23 @@ logging.basicConfig(level=logging.INFO)
 class Config:
     MAX_FILE_SIZE = 5 * 1024 * 1024  # 5 MB
     MAX_LENGTH = 16 * 1024 * 1024
+
+    # Persistent FAISS indices, one per uploaded document keyed by its content hash
+    UPLOAD_FOLDER = os.path.join(os.getcwd(), "uploads")
+    INDEX_FOLDER = os.path.join(UPLOAD_FOLDER, "indices")
+    MAX_LOADED_INDICES = 32
+    RETRIEVER_K = 7
+
+    # Ingestion: uploads are spooled to disk, then pages are split and embedded in batches
+    UPLOAD_CHUNK_BYTES = 1024 * 1024
+    CHUNK_SIZE = 1024
+    CHUNK_OVERLAP = 20
+    INGEST_BATCH_SIZE = 64
+    INGEST_WORKERS = 4
+
+    # Background ingestion jobs behind /rag/upload
+    MAX_CONCURRENT_INGESTIONS = 2
+    MAX_INGESTION_JOBS = 256
+
+    # Document embeddings cached by model name and chunk text hash
+    EMBEDDING_CACHE_FOLDER = os.path.join(UPLOAD_FOLDER, "embedding_cache")
@@ -0,0 +1,37 @@
+import logging
+import re
+
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+
+def get_model_name(embeddings: Embeddings) -> str:
+    model = getattr(embeddings, "model", None)
+    name = model if isinstance(model, str) else type(embeddings).__name__
+    # Cache keys become file names, and Ollama model tags contain a colon
+    return re.sub(r"[^a-zA-Z0-9_.\-]", "_", name)
+
+
+def cache_embeddings(embeddings: Embeddings, folder: str) -> CacheBackedEmbeddings:
+    """
+    Wrap an embedding model with an on-disk cache of document embeddings.
+
+    Cached vectors are keyed by the model name and a hash of the chunk text, so re-uploading
+    a document, or one sharing pages with an earlier upload, only sends the new chunks to
+    the model. Queries are not cached.
+
+    Args:
+        embeddings (Embeddings): Model computing embeddings on a cache miss
+        folder (str): Folder holding the cached vectors
+
+    Returns:
+        CacheBackedEmbeddings: Embeddings reading through the cache
+    """
+    namespace = get_model_name(embeddings)
+    logger.info(f"Caching {namespace} document embeddings in {folder}")
+    return CacheBackedEmbeddings.from_bytes_store(
+        embeddings, LocalFileStore(folder), namespace=f"{namespace}/"
+    )
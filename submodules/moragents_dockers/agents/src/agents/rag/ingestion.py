@@ -0,0 +1,229 @@
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import aiofiles
+from langchain_community.document_loaders import PyMuPDFLoader
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_text_splitters.character import RecursiveCharacterTextSplitter
+from src.agents.rag.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Parsing and embedding run here, off the event loop; shared so concurrent uploads can't
+# take more than a fixed number of threads between them
+_executor = ThreadPoolExecutor(max_workers=Config.INGEST_WORKERS, thread_name_prefix="rag-ingest")
+
+
+@dataclass
+class IngestionProgress:
+    """
+    Progress of a document through the ingestion pipeline.
+
+    Attributes:
+        stage (str): "parsing" while pages are still being read, then "done"
+        pages_parsed (int): Pages read from the document so far
+        chunks_split (int): Chunks produced by the splitter so far
+        chunks_indexed (int): Chunks embedded and added to the index so far
+        started_at (float): Unix time the ingestion started
+    """
+
+    stage: str = "parsing"
+    pages_parsed: int = 0
+    chunks_split: int = 0
+    chunks_indexed: int = 0
+    started_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+async def spool_upload(file, folder: str, max_size: int) -> Optional[Tuple[str, str]]:
+    """
+    Write an upload to a temporary file in fixed-size chunks, hashing it on the way.
+
+    Args:
+        file: Uploaded file exposing an async read(size)
+        folder (str): Folder the temporary file is created in
+        max_size (int): Largest accepted upload in bytes
+
+    Returns:
+        Optional[Tuple[str, str]]: Temporary file path and SHA-256 of the content, or None if
+            the upload is larger than max_size
+    """
+    os.makedirs(folder, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=folder, suffix=".part")
+    os.close(fd)
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(temp_path, "wb") as buffer:
+            while chunk := await file.read(Config.UPLOAD_CHUNK_BYTES):
+                size += len(chunk)
+                if size > max_size:
+                    break
+                digest.update(chunk)
+                await buffer.write(chunk)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+    if size > max_size:
+        os.remove(temp_path)
+        return None
+    return temp_path, digest.hexdigest()
+
+
+class _BatchPipeline:
+    """
+    Embeds batches of one document on the shared worker pool and indexes them in order.
+
+    At most ``max_inflight`` batches are embedding at a time; submitting another first waits
+    for the oldest one and indexes it.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        max_inflight: int,
+        progress: IngestionProgress,
+        on_progress: Optional[Callable[[IngestionProgress], None]],
+        on_batch: Optional[Callable[[FAISS], None]],
+    ) -> None:
+        self.embeddings = embeddings
+        self.max_inflight = max_inflight
+        self.progress = progress
+        self.on_progress = on_progress
+        self.on_batch = on_batch
+        self.vector_store: Optional[FAISS] = None
+        self._inflight: List[Tuple[List[Document], asyncio.Future]] = []
+
+    async def submit(self, batch: List[Document]) -> None:
+        if len(self._inflight) >= self.max_inflight:
+            await self._index_oldest_batch()
+        texts = [doc.page_content for doc in batch]
+        embedding_future = asyncio.get_running_loop().run_in_executor(
+            _executor, self.embeddings.embed_documents, texts
+        )
+        self._inflight.append((batch, embedding_future))
+
+    async def drain(self) -> Optional[FAISS]:
+        """Index every submitted batch, returning the index over all of them"""
+        while self._inflight:
+            await self._index_oldest_batch()
+        return self.vector_store
+
+    def cancel(self) -> None:
+        """Drop the batches that haven't started embedding yet"""
+        for _, embedding_future in self._inflight:
+            embedding_future.cancel()
+
+    async def _index_oldest_batch(self) -> None:
+        batch, embedding_future = self._inflight.pop(0)
+        vectors = await embedding_future
+        text_embeddings = [(doc.page_content, vector) for doc, vector in zip(batch, vectors)]
+        metadatas = [doc.metadata for doc in batch]
+        batch_store = FAISS.from_embeddings(text_embeddings, self.embeddings, metadatas)
+        if self.on_batch:
+            self.on_batch(batch_store)
+        if self.vector_store is None:
+            self.vector_store = FAISS.from_embeddings(text_embeddings, self.embeddings, metadatas)
+        else:
+            self.vector_store.merge_from(batch_store)
+        self.progress.chunks_indexed += len(batch)
+        if self.on_progress:
+            self.on_progress(self.progress)
+
+
+class DocumentIngestor:
+    """
+    Streams a PDF into a FAISS index in batches.
+
+    Pages are parsed one at a time and split as they arrive; chunks are grouped into batches
+    embedded on the shared worker pool, with a bounded number of batches in flight. Nothing
+    blocks the event loop, and memory holds at most a few batches beyond the index itself.
+
+    Attributes:
+        embeddings (Embeddings): Model embedding the chunks
+        batch_size (int): Chunks per embedding call
+        max_inflight_batches (int): Batches embedded concurrently for one document
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        batch_size: int = Config.INGEST_BATCH_SIZE,
+        max_inflight_batches: int = Config.INGEST_WORKERS,
+    ) -> None:
+        self.embeddings = embeddings
+        self.batch_size = batch_size
+        self.max_inflight_batches = max_inflight_batches
+        self.splitter = RecursiveCharacterTextSplitter(
+            chunk_size=Config.CHUNK_SIZE,
+            chunk_overlap=Config.CHUNK_OVERLAP,
+            length_function=len,
+            is_separator_regex=False,
+        )
+
+    async def ingest(
+        self,
+        file_path: str,
+        on_progress: Optional[Callable[[IngestionProgress], None]] = None,
+        on_batch: Optional[Callable[[FAISS], None]] = None,
+    ) -> Optional[FAISS]:
+        """
+        Parse, split, embed and index a PDF.
+
+        Args:
+            file_path (str): PDF to ingest
+            on_progress (Optional[Callable[[IngestionProgress], None]]): Called after each
+                indexed batch and when ingestion finishes
+            on_batch (Optional[Callable[[FAISS], None]]): Called with a separate index over
+                each batch, which is never modified afterwards, so the document can be
+                searched from other threads while the rest is still being ingested
+
+        Returns:
+            Optional[FAISS]: Index over the document's chunks, or None if it has no text
+        """
+        loop = asyncio.get_running_loop()
+        progress = IngestionProgress()
+        pages = PyMuPDFLoader(file_path).lazy_load()
+        pipeline = _BatchPipeline(
+            self.embeddings, self.max_inflight_batches, progress, on_progress, on_batch
+        )
+        pending: List[Document] = []
+
+        try:
+            while (page := await loop.run_in_executor(_executor, next, pages, None)) is not None:
+                progress.pages_parsed += 1
+                chunks = self.splitter.split_documents([page])
+                progress.chunks_split += len(chunks)
+                pending.extend(chunks)
+                while len(pending) >= self.batch_size:
+                    await pipeline.submit(pending[: self.batch_size])
+                    pending = pending[self.batch_size :]
+
+            if pending:
+                await pipeline.submit(pending)
+            vector_store = await pipeline.drain()
+        finally:
+            # If the ingestion failed, drop the batches that haven't started embedding yet
+            pipeline.cancel()
+
+        progress.stage = "done"
+        if on_progress:
+            on_progress(progress)
+        logger.info(
+            f"Ingested {file_path}: {progress.pages_parsed} pages, "
+            f"{progress.chunks_indexed} chunks in {time.time() - progress.started_at:.1f}s"
+        )
+        return vector_store
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from src.agents.rag.config import Config
+from src.agents.rag.ingestion import IngestionProgress
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STAGES = ("done", "failed")
+
+
+@dataclass
+class IngestionJob:
+    """
+    A document upload being ingested in the background.
+
+    Attributes:
+        id (str): Unique job identifier
+        session_id (str): Session that uploaded the document
+        filename (str): Name the document was uploaded under
+        stage (str): "queued", "indexing", "saving", then "done" or "failed"
+        progress (IngestionProgress): Pages parsed and chunks split and indexed so far
+        error (Optional[str]): Failure reason, if the job failed
+        created_at (float): Unix time the job was submitted
+        started_at (Optional[float]): Unix time ingestion started
+        first_batch_at (Optional[float]): Unix time the document first became searchable
+        finished_at (Optional[float]): Unix time the job finished
+    """
+
+    session_id: str
+    filename: str
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    stage: str = "queued"
+    progress: IngestionProgress = field(default_factory=IngestionProgress)
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    first_batch_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.stage in FINISHED_STAGES
+
+    def update_progress(self, progress: IngestionProgress) -> None:
+        self.progress = progress
+        if self.first_batch_at is None and progress.chunks_indexed:
+            self.first_batch_at = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        def since(start: Optional[float], end: Optional[float]) -> Optional[float]:
+            return round(end - start, 3) if start is not None and end is not None else None
+
+        now = time.time()
+        return {
+            "job_id": self.id,
+            "session_id": self.session_id,
+            "filename": self.filename,
+            "stage": self.stage,
+            "pages_parsed": self.progress.pages_parsed,
+            "chunks_split": self.progress.chunks_split,
+            "chunks_indexed": self.progress.chunks_indexed,
+            "error": self.error,
+            "timings": {
+                "queued_seconds": since(self.created_at, self.started_at or now),
+                "time_to_first_batch_seconds": since(self.started_at, self.first_batch_at),
+                "elapsed_seconds": since(self.started_at, self.finished_at or now),
+            },
+        }
+
+
+class IngestionJobManager:
+    """
+    Runs document ingestion jobs in the background and keeps their status for polling.
+
+    At most ``max_concurrent`` jobs ingest at a time; the rest wait in the "queued" stage.
+    Finished jobs are kept until more than ``max_jobs`` are tracked, oldest dropped first.
+    Job status lives in memory, so it does not survive a restart.
+
+    Attributes:
+        max_concurrent (int): Jobs ingesting at the same time
+        max_jobs (int): Finished jobs kept for status polling
+        jobs (OrderedDict[str, IngestionJob]): Tracked jobs, oldest first
+    """
+
+    def __init__(self, max_concurrent: int, max_jobs: int) -> None:
+        self.max_concurrent = max_concurrent
+        self.max_jobs = max_jobs
+        self.jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._tasks: Set[asyncio.Task] = set()
+
+    def submit(
+        self,
+        session_id: str,
+        filename: str,
+        run: Callable[[IngestionJob], Awaitable[None]],
+    ) -> IngestionJob:
+        """
+        Queue an ingestion job on the running event loop.
+
+        Args:
+            session_id (str): Session that uploaded the document
+            filename (str): Name the document was uploaded under
+            run (Callable[[IngestionJob], Awaitable[None]]): Ingests the document, updating
+                the job's stage and progress as it goes
+
+        Returns:
+            IngestionJob: The queued job
+        """
+        job = IngestionJob(session_id=session_id, filename=filename)
+        self.jobs[job.id] = job
+        self._evict_finished()
+
+        task = asyncio.create_task(self._run(job, run))
+        # Keep a reference so the task isn't garbage collected while it runs
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job: IngestionJob, run: Callable[[IngestionJob], Awaitable[None]]):
+        async with self._slots:
+            job.started_at = time.time()
+            job.stage = "indexing"
+            try:
+                await run(job)
+                job.stage = "done"
+            except Exception as e:
+                logger.error(f"Ingestion job {job.id} for {job.filename} failed: {str(e)}")
+                job.stage = "failed"
+                job.error = str(e)
+            finally:
+                job.finished_at = time.time()
+
+    def _evict_finished(self) -> None:
+        excess = len(self.jobs) - self.max_jobs
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.is_finished][:excess]:
+            del self.jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        return self.jobs.get(job_id)
+
+
+# Create an instance to act as a singleton manager
+ingestion_jobs = IngestionJobManager(Config.MAX_CONCURRENT_INGESTIONS, Config.MAX_INGESTION_JOBS)
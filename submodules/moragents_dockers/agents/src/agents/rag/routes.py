@@ -1,7 +1,9 @@
 import logging
 from fastapi import APIRouter, File, UploadFile
 from fastapi.responses import JSONResponse
-from src.stores import chat_manager_instance, agent_manager_instance
+from src.agents.rag.jobs import ingestion_jobs
+from src.config import Config
+from src.stores import agent_manager_instance, session_manager_instance
 
 logger = logging.getLogger(__name__)
 
@@ -9,23 +11,43 @@ router = APIRouter(prefix="/rag", tags=["rag"])
 
 
 @router.post("/upload")
-async def upload_file(file: UploadFile = File(...)):
-    """Upload a file for RAG processing"""
+async def upload_file(file: UploadFile = File(...), session_id: str = Config.DEFAULT_SESSION_ID):
+    """Upload a file for RAG processing, returning the id of the background ingestion job"""
     logger.info("Received upload request")
     try:
-        rag_agent = agent_manager_instance.get_agent("rag")
+        rag_agent = await agent_manager_instance.aget_agent("rag")
         if not rag_agent:
             return JSONResponse(
                 status_code=400,
                 content={"status": "error", "message": "RAG agent not found"},
             )
 
-        response = await rag_agent.upload_file({"file": file})
-        chat_manager_instance.add_message(response)
-        return response
+        response = await rag_agent.upload_file({"file": file}, session_id)
+        if not isinstance(response, dict) or "job_id" not in response:
+            session = await session_manager_instance.aget_session(session_id)
+            session.chat_manager.add_message(response)
+            return response
+
+        # The job id is for polling, it doesn't belong in the chat history
+        message = {key: value for key, value in response.items() if key != "job_id"}
+        session = await session_manager_instance.aget_session(session_id)
+        session.chat_manager.add_message(message)
+        return {**response, "status_url": f"/rag/jobs/{response['job_id']}"}
     except Exception as e:
         logger.error(f"Failed to upload file: {str(e)}")
         return JSONResponse(
             status_code=500,
             content={"status": "error", "message": f"Failed to upload file: {str(e)}"},
         )
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get the stage, chunk counts and timings of an ingestion job"""
+    job = ingestion_jobs.get(job_id)
+    if not job:
+        return JSONResponse(
+            status_code=404,
+            content={"status": "error", "message": f"Ingestion job {job_id} not found"},
+        )
+    return job.to_dict()
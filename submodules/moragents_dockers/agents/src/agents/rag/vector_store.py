@@ -0,0 +1,253 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+from src.agents.rag.config import Config
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = "index"
+MANIFEST_NAME = "manifest.json"
+
+
+class MultiIndexRetriever(BaseRetriever):
+    """
+    Retriever searching several FAISS indices as one.
+
+    The query is embedded once, each index returns its own top k, and the results are merged
+    by distance so the best chunks win regardless of which document they came from.
+    """
+
+    stores: List[FAISS]
+    embeddings: Embeddings
+    k: int = Config.RETRIEVER_K
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        embedding = self.embeddings.embed_query(query)
+        scored = []
+        for store in self.stores:
+            scored.extend(store.similarity_search_with_score_by_vector(embedding, k=self.k))
+        # FAISS scores are L2 distances, lower is closer
+        scored.sort(key=lambda item: item[1])
+        return [doc for doc, _ in scored[: self.k]]
+
+
+class DocumentIndexStore:
+    """
+    Persists a FAISS index per uploaded document under the uploads folder.
+
+    Indices are keyed by the SHA-256 of the uploaded file, so uploading the same document
+    again reuses its index instead of re-embedding it. A manifest records the indexed
+    documents and which documents each session uploaded, so sessions can query all of
+    their documents together, including after a restart. A session's entry is dropped
+    once the session expires. Loaded indices are kept in a bounded LRU. While a document is being ingested, the batches indexed so far are
+    searchable as partial indices.
+
+    Attributes:
+        root (Path): Folder holding one subfolder per indexed document
+        max_loaded (int): Maximum number of indices kept loaded
+    """
+
+    def __init__(self, root: str, max_loaded: int) -> None:
+        self.root = Path(root)
+        self.max_loaded = max_loaded
+        self._loaded: "OrderedDict[str, FAISS]" = OrderedDict()
+        self._partial: Dict[str, List[FAISS]] = {}
+        self._manifest: Optional[Dict] = None
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
+
+    def _index_path(self, doc_hash: str) -> Path:
+        return self.root / doc_hash
+
+    def _load_manifest(self) -> Dict:
+        if self._manifest is None:
+            manifest = {"documents": {}, "sessions": {}}
+            path = self.root / MANIFEST_NAME
+            if path.exists():
+                try:
+                    manifest.update(json.loads(path.read_text()))
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable index manifest {path}: {e}")
+            self._manifest = manifest
+        return self._manifest
+
+    def _save_manifest(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / MANIFEST_NAME
+        temp_path = path.with_name(path.name + ".tmp")
+        temp_path.write_text(json.dumps(self._manifest))
+        os.replace(temp_path, path)
+
+    def has(self, doc_hash: str) -> bool:
+        """Check whether a document with this content hash is already indexed."""
+        return (self._index_path(doc_hash) / f"{INDEX_NAME}.faiss").exists()
+
+    def save(self, doc_hash: str, vector_store: FAISS, filename: str) -> None:
+        """
+        Persist the index of a document.
+
+        Args:
+            doc_hash (str): Content hash of the uploaded file
+            vector_store (FAISS): Index built from the document's chunks
+            filename (str): Name the document was uploaded under
+        """
+        path = self._index_path(doc_hash)
+        temp_path = path.with_name(f"{doc_hash}.tmp-{os.getpid()}-{threading.get_ident()}")
+        vector_store.save_local(str(temp_path), INDEX_NAME)
+        with self._lock:
+            if path.exists():
+                # Another upload of the same content got there first, its index is identical
+                shutil.rmtree(temp_path, ignore_errors=True)
+            else:
+                os.replace(temp_path, path)
+            self._remember(doc_hash, vector_store)
+            self._partial.pop(doc_hash, None)
+            self._load_manifest()["documents"][doc_hash] = {
+                "filename": filename,
+                "chunks": vector_store.index.ntotal,
+                "created_at": time.time(),
+            }
+            self._save_manifest()
+
+    def load(self, doc_hash: str, embeddings: Embeddings) -> Optional[FAISS]:
+        """
+        Get the index of a document, reading it from disk if it isn't loaded.
+
+        Args:
+            doc_hash (str): Content hash of the uploaded file
+            embeddings (Embeddings): Model used to embed queries against the index
+
+        Returns:
+            Optional[FAISS]: The index, or None if the document was never indexed
+        """
+        with self._lock:
+            if doc_hash in self._loaded:
+                self._loaded.move_to_end(doc_hash)
+                return self._loaded[doc_hash]
+
+        if not self.has(doc_hash):
+            return None
+        vector_store = self._read(doc_hash, embeddings)
+        with self._lock:
+            self._remember(doc_hash, vector_store)
+        return vector_store
+
+    def _read(self, doc_hash: str, embeddings: Embeddings) -> FAISS:
+        # The docstore is pickled, which is only safe for trusted files. These are only ever
+        # written by save(), from chunks embedded here, so they're as trusted as the folder.
+        return FAISS.load_local(
+            str(self._index_path(doc_hash)),
+            embeddings,
+            INDEX_NAME,
+            allow_dangerous_deserialization=True,
+        )
+
+    def _remember(self, doc_hash: str, vector_store: FAISS) -> None:
+        self._loaded[doc_hash] = vector_store
+        self._loaded.move_to_end(doc_hash)
+        while len(self._loaded) > self.max_loaded:
+            self._loaded.popitem(last=False)
+
+    def add_partial(self, doc_hash: str, batch_store: FAISS) -> None:
+        """Make a batch of a document that is still being ingested searchable."""
+        with self._lock:
+            self._partial.setdefault(doc_hash, []).append(batch_store)
+
+    def discard_partial(self, doc_hash: str) -> None:
+        """Drop the partial indices of a document whose ingestion failed."""
+        with self._lock:
+            self._partial.pop(doc_hash, None)
+
+    def add_session_document(self, session_id: str, doc_hash: str) -> None:
+        """Record that a session uploaded a document, making it searchable for the session."""
+        with self._lock:
+            documents = self._load_manifest()["sessions"].setdefault(session_id, [])
+            if doc_hash not in documents:
+                documents.append(doc_hash)
+                self._save_manifest()
+
+    def remove_session_document(self, session_id: str, doc_hash: str) -> None:
+        """Stop searching a document for a session."""
+        with self._lock:
+            documents = self._load_manifest()["sessions"].get(session_id, [])
+            if doc_hash in documents:
+                documents.remove(doc_hash)
+                self._save_manifest()
+
+    def remove_session(self, session_id: str) -> None:
+        """Forget which documents an expired session uploaded."""
+        with self._lock:
+            if self._load_manifest()["sessions"].pop(session_id, None) is not None:
+                self._save_manifest()
+
+    def retain_sessions(self, session_ids: List[str]) -> None:
+        """Forget the documents of every session but the given ones."""
+        with self._lock:
+            sessions = self._load_manifest()["sessions"]
+            expired = [session_id for session_id in sessions if session_id not in session_ids]
+            for session_id in expired:
+                del sessions[session_id]
+            if expired:
+                self._save_manifest()
+
+    def get_session_documents(self, session_id: str) -> List[str]:
+        """Get the content hashes of the documents a session uploaded, oldest first."""
+        with self._lock:
+            return list(self._load_manifest()["sessions"].get(session_id, []))
+
+    def get_retriever(self, session_id: str, embeddings: Embeddings) -> Optional[BaseRetriever]:
+        """
+        Get a retriever over every document a session uploaded.
+
+        Args:
+            session_id (str): Session whose documents are searched
+            embeddings (Embeddings): Model used to embed queries
+
+        Returns:
+            Optional[BaseRetriever]: Retriever, or None if the session has no documents
+        """
+        stores = []
+        for doc_hash in self.get_session_documents(session_id):
+            # Check for partial indices first, as saving the full index replaces them
+            with self._lock:
+                partial = list(self._partial.get(doc_hash, []))
+            if partial:
+                stores.extend(partial)
+                continue
+            vector_store = self.load(doc_hash, embeddings)
+            if vector_store is None:
+                logger.warning(f"Index for document {doc_hash} is missing, skipping it")
+                continue
+            stores.append(vector_store)
+        if not stores:
+            return None
+        return MultiIndexRetriever(stores=stores, embeddings=embeddings)
+
+    async def aget_retriever(
+        self, session_id: str, embeddings: Embeddings
+    ) -> Optional[BaseRetriever]:
+        """Get a retriever like get_retriever, reading indices from disk off the event loop."""
+        return await asyncio.to_thread(self.get_retriever, session_id, embeddings)
+
+
+# Create an instance to act as a singleton store
+document_index_store = DocumentIndexStore(Config.INDEX_FOLDER, Config.MAX_LOADED_INDICES)
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import time
 
@@ -8,6 +9,7 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from src.models.messages import ChatRequest
+from src.stores import session_manager_instance
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -22,16 +24,22 @@ class RealtimeSearchAgent:
         self.config = config
         self.llm = llm
         self.embeddings = embeddings
-        self.last_search_term = None
 
-    def perform_search_with_web_scraping(self, search_term=None):
+    def _resolve_search_term(self, search_term, session_id):
+        # The last search term is remembered per session so follow-ups can reuse it. Called on
+        # the event loop, as the session manager isn't thread-safe.
+        state = session_manager_instance.get_session(session_id).get_agent_state(
+            self.config["name"]
+        )
         if search_term is not None:
-            self.last_search_term = search_term
-        elif self.last_search_term is None:
+            state["last_search_term"] = search_term
+            return search_term
+        return state.get("last_search_term")
+
+    def perform_search_with_web_scraping(self, search_term=None):
+        if search_term is None:
             logger.warning("No search term available for web search")
             return "Web search failed. Please provide a search term."
-        else:
-            search_term = self.last_search_term
 
         logger.info(f"Performing web search for: {search_term}")
 
@@ -89,9 +97,8 @@ class RealtimeSearchAgent:
         finally:
             driver.quit()
 
-    def synthesize_answer(self, search_term, search_results):
-        logger.info("Synthesizing answer from search results")
-        messages = [
+    def _build_synthesis_messages(self, search_term, search_results):
+        return [
             {
                 "role": "system",
                 "content": """You are a helpful assistant that synthesizes information from web search results to answer user queries.
@@ -104,8 +111,12 @@ class RealtimeSearchAgent:
             },
         ]
 
+    async def asynthesize_answer(self, search_term, search_results):
+        logger.info("Synthesizing answer from search results")
+        messages = self._build_synthesis_messages(search_term, search_results)
+
         try:
-            result = self.llm.invoke(messages)
+            result = await self.llm.ainvoke(messages)
             logger.info(f"Received response from LLM: {result}")
             return result.content.strip()
         except Exception as e:
@@ -113,6 +124,10 @@ class RealtimeSearchAgent:
             raise
 
     def chat(self, request: ChatRequest):
+        # Synchronous entry point for callers outside the event loop
+        return asyncio.run(self.achat(request))
+
+    async def achat(self, request: ChatRequest):
         try:
             data = request.dict()
             logger.info(f"Received chat request: {data}")
@@ -121,10 +136,14 @@ class RealtimeSearchAgent:
                 search_term = prompt["content"]
                 logger.info(f"Performing web search for prompt: {search_term}")
 
-                search_results = self.perform_search_with_web_scraping(search_term)
-                logger.info(f"Search results obtained")
+                # Scraping uses blocking requests / selenium calls
+                search_term = self._resolve_search_term(search_term, request.session_id)
+                search_results = await asyncio.to_thread(
+                    self.perform_search_with_web_scraping, search_term
+                )
+                logger.info("Search results obtained")
 
-                synthesized_answer = self.synthesize_answer(search_term, search_results)
+                synthesized_answer = await self.asynthesize_answer(search_term, search_results)
                 logger.info(f"Synthesized answer: {synthesized_answer}")
 
                 return {"role": "assistant", "content": synthesized_answer}
@@ -134,3 +153,22 @@ class RealtimeSearchAgent:
         except Exception as e:
             logger.error(f"Unexpected error in chat method: {str(e)}, request: {request}")
             raise e
+
+    async def astream_chat(self, request: ChatRequest):
+        search_term = request.prompt.content
+
+        yield {"type": "status", "content": f"Searching the web for: {search_term}"}
+        search_term = self._resolve_search_term(search_term, request.session_id)
+        search_results = await asyncio.to_thread(self.perform_search_with_web_scraping, search_term)
+
+        yield {"type": "status", "content": "Synthesizing answer from search results"}
+        messages = self._build_synthesis_messages(search_term, search_results)
+
+        chunks = []
+        async for chunk in self.llm.astream(messages):
+            if chunk.content:
+                chunks.append(chunk.content)
+                yield {"type": "token", "content": chunk.content}
+
+        response = {"role": "assistant", "content": "".join(chunks).strip()}
+        yield {"type": "done", "response": response}
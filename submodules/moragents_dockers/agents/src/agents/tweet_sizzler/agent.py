@@ -1,8 +1,10 @@
+import asyncio
 import logging
 
 import tweepy
 from src.agents.tweet_sizzler.config import Config
 from src.models.messages import ChatRequest
+from src.stores import session_manager_instance
 
 # Configure logging
 logging.basicConfig(
@@ -17,21 +19,21 @@ class TweetSizzlerAgent:
         self.llm = llm
         self.embeddings = embeddings
         self.x_api_key = None
-        self.last_prompt_content = None
         self.twitter_client = None
 
-    def generate_tweet(self, prompt_content=None):
-        # State management for tweet regeneration purposes
+    def _resolve_prompt_content(self, prompt_content, session_id):
+        # State management for tweet regeneration purposes, scoped to the user's session
+        state = session_manager_instance.get_session(session_id).get_agent_state(
+            self.config["name"]
+        )
         if prompt_content is not None:
-            self.last_prompt_content = prompt_content
-        elif self.last_prompt_content is None:
-            logger.warning("No prompt content available for tweet generation")
-            return "Tweet generation failed. Please provide a prompt."
-        else:
-            prompt_content = self.last_prompt_content
+            state["last_prompt_content"] = prompt_content
+        elif state.get("last_prompt_content") is not None:
+            prompt_content = state["last_prompt_content"]
+        return prompt_content
 
-        logger.info(f"Generating tweet for prompt_content: {prompt_content}")
-        messages = [
+    def _build_tweet_messages(self, prompt_content):
+        return [
             {
                 "role": "system",
                 "content": Config.TWEET_GENERATION_PROMPT,
@@ -39,16 +41,29 @@ class TweetSizzlerAgent:
             {"role": "user", "content": f"Generate a tweet for: {prompt_content}"},
         ]
 
-        try:
-            result = self.llm.invoke(messages)
-            logger.info(f"Received response from LLM: {result}")
-            tweet = result.content.strip()
-            tweet = " ".join(tweet.split())
+    def _clean_tweet(self, content):
+        tweet = content.strip()
+        tweet = " ".join(tweet.split())
+
+        # Remove any dictionary-like formatting, if present
+        if tweet.startswith("{") and tweet.endswith("}"):
+            tweet = tweet.strip("{}").split(":", 1)[-1].strip().strip('"')
 
-            # Remove any dictionary-like formatting, if present
-            if tweet.startswith("{") and tweet.endswith("}"):
-                tweet = tweet.strip("{}").split(":", 1)[-1].strip().strip('"')
+        return tweet
 
+    async def agenerate_tweet(self, prompt_content=None, session_id=None):
+        prompt_content = self._resolve_prompt_content(prompt_content, session_id)
+        if prompt_content is None:
+            logger.warning("No prompt content available for tweet generation")
+            return "Tweet generation failed. Please provide a prompt."
+
+        logger.info(f"Generating tweet for prompt_content: {prompt_content}")
+        messages = self._build_tweet_messages(prompt_content)
+
+        try:
+            result = await self.llm.ainvoke(messages)
+            logger.info(f"Received response from LLM: {result}")
+            tweet = self._clean_tweet(result.content)
             logger.info(f"Tweet generated successfully: {tweet}")
             return tweet
         except Exception as e:
@@ -88,7 +103,7 @@ class TweetSizzlerAgent:
             )
 
             # Post tweet
-            response = client.create_tweet(text=tweet_content)
+            response = await asyncio.to_thread(client.create_tweet, text=tweet_content)
             logger.info(f"Tweet posted successfully: {response}")
             return {
                 "success": "Tweet posted successfully",
@@ -120,6 +135,10 @@ class TweetSizzlerAgent:
         return {"success": "API credentials saved successfully"}, 200
 
     def chat(self, chat_request: ChatRequest):
+        # Synchronous entry point for callers outside the event loop
+        return asyncio.run(self.achat(chat_request))
+
+    async def achat(self, chat_request: ChatRequest):
         try:
             prompt = chat_request.prompt.dict()
             logger.info(f"Received chat request: {prompt}")
@@ -129,12 +148,12 @@ class TweetSizzlerAgent:
 
             if action == "generate":
                 logger.info(f"Generating tweet for prompt: {prompt['content']}")
-                tweet = self.generate_tweet(prompt["content"])
+                tweet = await self.agenerate_tweet(prompt["content"], chat_request.session_id)
                 logger.info(f"Generated tweet: {tweet}")
                 return {"role": "assistant", "content": tweet}
             elif action == "post":
                 logger.info("Attempting to post tweet")
-                result, status_code = self.post_tweet(chat_request)
+                result, status_code = await self.post_tweet(chat_request)
                 logger.info(f"Posted tweet result: {result}, status code: {status_code}")
                 if isinstance(result, dict) and "error" in result:
                     return result, status_code
@@ -149,3 +168,24 @@ class TweetSizzlerAgent:
         except Exception as e:
             logger.error(f"Unexpected error in chat method: {str(e)}, request: {chat_request}")
             raise e
+
+    async def astream_chat(self, chat_request: ChatRequest):
+        prompt = chat_request.prompt.dict()
+        action = prompt.get("action", Config.DEFAULT_ACTION)
+        if action != "generate":
+            yield {"type": "done", "response": await self.achat(chat_request)}
+            return
+
+        prompt_content = self._resolve_prompt_content(prompt["content"], chat_request.session_id)
+        messages = self._build_tweet_messages(prompt_content)
+
+        chunks = []
+        async for chunk in self.llm.astream(messages):
+            if chunk.content:
+                chunks.append(chunk.content)
+                yield {"type": "token", "content": chunk.content}
+
+        # The streamed draft is raw model output; the recorded tweet is the cleaned version
+        tweet = self._clean_tweet("".join(chunks))
+        logger.info(f"Tweet generated successfully: {tweet}")
+        yield {"type": "done", "response": {"role": "assistant", "content": tweet}}
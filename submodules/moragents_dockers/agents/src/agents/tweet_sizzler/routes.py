@@ -1,7 +1,8 @@
 import logging
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
-from src.stores import chat_manager_instance, agent_manager_instance
+from src.config import Config
+from src.stores import agent_manager_instance, session_manager_instance
 
 logger = logging.getLogger(__name__)
 
@@ -9,19 +10,20 @@ router = APIRouter(prefix="/tweet", tags=["tweet"])
 
 
 @router.post("/regenerate")
-async def regenerate_tweet():
+async def regenerate_tweet(session_id: str = Config.DEFAULT_SESSION_ID):
     """Regenerate a tweet"""
     logger.info("Received regenerate tweet request")
     try:
-        tweet_agent = agent_manager_instance.get_agent("tweet sizzler")
+        tweet_agent = await agent_manager_instance.aget_agent("tweet sizzler")
         if not tweet_agent:
             return JSONResponse(
                 status_code=400,
                 content={"status": "error", "message": "Tweet sizzler agent not found"},
             )
 
-        response = tweet_agent.generate_tweet()
-        chat_manager_instance.add_message(response)
+        response = await tweet_agent.agenerate_tweet(session_id=session_id)
+        session = await session_manager_instance.aget_session(session_id)
+        session.chat_manager.add_message(response)
         return response
     except Exception as e:
         logger.error(f"Failed to regenerate tweet: {str(e)}")
@@ -32,11 +34,11 @@ async def regenerate_tweet():
 
 
 @router.post("/post")
-async def post_tweet(request: Request):
+async def post_tweet(request: Request, session_id: str = Config.DEFAULT_SESSION_ID):
     """Post a tweet"""
     logger.info("Received post tweet request")
     try:
-        tweet_agent = agent_manager_instance.get_agent("tweet sizzler")
+        tweet_agent = await agent_manager_instance.aget_agent("tweet sizzler")
         if not tweet_agent:
             return JSONResponse(
                 status_code=400,
@@ -44,7 +46,8 @@ async def post_tweet(request: Request):
             )
 
         response = await tweet_agent.post_tweet(request)
-        chat_manager_instance.add_message(response)
+        session = await session_manager_instance.aget_session(session_id)
+        session.chat_manager.add_message(response)
         return response
     except Exception as e:
         logger.error(f"Failed to post tweet: {str(e)}")
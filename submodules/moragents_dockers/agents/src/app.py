@@ -1,24 +1,38 @@
-import logging
-import os
-import time
-
-import uvicorn
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from langchain_community.embeddings import OllamaEmbeddings
-from langchain_ollama import ChatOllama
-
-from src.config import Config
-from src.delegator import Delegator
-from src.models.messages import ChatRequest
-from src.stores import agent_manager_instance, chat_manager_instance, workflow_manager_instance
-from src.routes import (
+from src.startup_profiler import startup_profiler
+
+# Start profiling before anything else is imported so every module load is timed. The
+# imports below have to come after this call, hence the E402 suppressions.
+startup_profiler.start()
+
+import json  # noqa: E402
+import logging  # noqa: E402
+import os  # noqa: E402
+import time  # noqa: E402
+
+import uvicorn  # noqa: E402
+from fastapi import FastAPI, HTTPException  # noqa: E402
+from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
+from fastapi.responses import StreamingResponse  # noqa: E402
+from langchain_community.embeddings import OllamaEmbeddings  # noqa: E402
+from langchain_ollama import ChatOllama  # noqa: E402
+from src.agents.crypto_data import http_client as crypto_http_client  # noqa: E402
+from src.config import Config  # noqa: E402
+from src.delegator import Delegator  # noqa: E402
+from src.models.messages import ChatRequest  # noqa: E402
+from src.routes import (  # noqa: E402
     agent_manager_routes,
     chat_manager_routes,
+    debug_routes,
     key_manager_routes,
     wallet_manager_routes,
-    workflow_manager_routes
+    workflow_manager_routes,
 )
+from src.stores import (  # noqa: E402
+    agent_manager_instance,
+    session_manager_instance,
+    workflow_manager_instance,
+)
+from src.stores.session_manager import Session  # noqa: E402
 
 # Constants
 UPLOAD_FOLDER = os.path.join(os.getcwd(), "uploads")
@@ -40,41 +54,49 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-@app.on_event("startup")
-async def startup_event():
-    await workflow_manager_instance.initialize()
 
 
 @app.on_event("startup")
 async def startup_event():
+    session_manager_instance.open_storage(Config.CHAT_STORAGE_BACKEND, Config.CHAT_STORAGE_PATH)
     await workflow_manager_instance.initialize()
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await workflow_manager_instance.close()
+    await crypto_http_client.aclose()
+    session_manager_instance.close()
+
+
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-llm = ChatOllama(
-    model=Config.OLLAMA_MODEL,
-    base_url=Config.OLLAMA_URL,
-)
-embeddings = OllamaEmbeddings(model=Config.OLLAMA_EMBEDDING_MODEL, base_url=Config.OLLAMA_URL)
+with startup_profiler.phase("models"):
+    llm = ChatOllama(
+        model=Config.OLLAMA_MODEL,
+        base_url=Config.OLLAMA_URL,
+    )
+    embeddings = OllamaEmbeddings(model=Config.OLLAMA_EMBEDDING_MODEL, base_url=Config.OLLAMA_URL)
 
-delegator = Delegator(llm, embeddings)
+with startup_profiler.phase("delegator"):
+    delegator = Delegator(llm, embeddings)
 
 # Include base store routes
 app.include_router(agent_manager_routes.router)
 app.include_router(key_manager_routes.router)
 app.include_router(chat_manager_routes.router)
+app.include_router(debug_routes.router)
 app.include_router(wallet_manager_routes.router)
 app.include_router(workflow_manager_routes.router)
 
 # Agent route imports
-from src.agents.crypto_data.routes import router as crypto_router
-from src.agents.rag.routes import router as rag_router
-from src.agents.mor_claims.routes import router as claim_router
-from src.agents.tweet_sizzler.routes import router as tweet_router
-from src.agents.token_swap.routes import router as swap_router
-from src.agents.dca_agent.routes import router as dca_router
-from src.agents.base_agent.routes import router as base_router
+from src.agents.base_agent.routes import router as base_router  # noqa: E402
+from src.agents.crypto_data.routes import router as crypto_router  # noqa: E402
+from src.agents.dca_agent.routes import router as dca_router  # noqa: E402
+from src.agents.mor_claims.routes import router as claim_router  # noqa: E402
+from src.agents.rag.routes import router as rag_router  # noqa: E402
+from src.agents.token_swap.routes import router as swap_router  # noqa: E402
+from src.agents.tweet_sizzler.routes import router as tweet_router  # noqa: E402
 
 # Include agent routes
 app.include_router(crypto_router)
@@ -86,15 +108,16 @@ app.include_router(dca_router)
 app.include_router(base_router)
 
 
-async def get_active_agent_for_chat(prompt: dict) -> str:
+async def get_active_agent_for_chat(prompt: dict, session: Session) -> str:
     """Get the active agent for handling the chat request."""
-    active_agent = agent_manager_instance.get_active_agent()
-    if active_agent:
+    active_agent = session.active_agent
+    if active_agent in agent_manager_instance.get_selected_agents():
         return active_agent
+    session.active_agent = None
 
     logger.info("No active agent, getting delegator response")
     start_time = time.time()
-    result = delegator.get_delegator_response(prompt)
+    result = await delegator.get_delegator_response(prompt, session)
     logger.info(f"Delegator response time: {time.time() - start_time:.2f} seconds")
     logger.info(f"Delegator response: {result}")
 
@@ -120,17 +143,19 @@ def validate_agent_response(response: dict, current_agent: str) -> dict:
 @app.post("/chat")
 async def chat(chat_request: ChatRequest):
     prompt = chat_request.prompt.dict()
-    chat_manager_instance.add_message(prompt)
+    session = await session_manager_instance.aget_session(chat_request.session_id)
+    session.chat_manager.add_message(prompt)
 
     try:
-        delegator.reset_attempted_agents()
-        active_agent = await get_active_agent_for_chat(prompt)
+        delegator.reset_attempted_agents(session)
+        active_agent = await get_active_agent_for_chat(prompt, session)
 
         logger.info(f"Delegating chat to active agent: {active_agent}")
-        current_agent, response = delegator.delegate_chat(active_agent, chat_request)
+        current_agent, response = await delegator.delegate_chat(active_agent, chat_request)
 
         validated_response = validate_agent_response(response, current_agent)
-        chat_manager_instance.add_response(validated_response, current_agent)
+        session.chat_manager.add_response(validated_response, current_agent)
+        session.chat_manager.schedule_compaction(llm)
 
         logger.info(f"Sending response: {validated_response}")
         return validated_response
@@ -146,5 +171,47 @@ async def chat(chat_request: ChatRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def format_sse_event(event: dict) -> str:
+    """Serialize a delegator stream event as a Server-Sent Event."""
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+@app.post("/chat/stream")
+async def chat_stream(chat_request: ChatRequest):
+    prompt = chat_request.prompt.dict()
+    session = await session_manager_instance.aget_session(chat_request.session_id)
+    session.chat_manager.add_message(prompt)
+
+    async def event_stream():
+        try:
+            delegator.reset_attempted_agents(session)
+            active_agent = await get_active_agent_for_chat(prompt, session)
+
+            logger.info(f"Streaming chat from active agent: {active_agent}")
+            async for event in delegator.stream_chat(active_agent, chat_request):
+                if event["type"] == "done":
+                    validated_response = validate_agent_response(event["response"], event["agent"])
+                    session.chat_manager.add_response(validated_response, event["agent"])
+                    session.chat_manager.schedule_compaction(llm)
+                    logger.info(f"Sending streamed response: {validated_response}")
+                yield format_sse_event(event)
+
+        except HTTPException as he:
+            yield format_sse_event({"type": "error", "detail": he.detail})
+        except Exception as e:
+            logger.error(f"Error in chat stream route: {str(e)}", exc_info=True)
+            yield format_sse_event({"type": "error", "detail": str(e)})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@app.get("/delegator/stats")
+async def delegator_stats():
+    """Report routing cache hit/miss counters for monitoring."""
+    return {"routing_cache": delegator.routing_cache.stats()}
+
+
+startup_profiler.stop()
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=5000, reload=True)
@@ -14,6 +14,55 @@ class Config:
     OLLAMA_URL = "http://host.docker.internal:11434"
 
     MAX_UPLOAD_LENGTH = 16 * 1024 * 1024
+
+    # Agent loading configuration
+    # Agents are imported and constructed on first use, which keeps heavy dependencies out of
+    # cold start. Prewarming loads the selected agents on a background thread after startup.
+    LAZY_AGENT_LOADING = True
+    PREWARM_SELECTED_AGENTS = False
+    # Upper bound on total module import time during boot, enforced by tests/startup
+    STARTUP_IMPORT_BUDGET_SECONDS = 15
+
+    # Session configuration
+    # Requests without a session id share the default session. Idle sessions are evicted,
+    # and the least recently used ones are dropped once MAX_SESSIONS is reached.
+    DEFAULT_SESSION_ID = "default"
+    MAX_SESSIONS = 1000
+    SESSION_IDLE_TIMEOUT_SECONDS = 60 * 60
+
+    # Chat history configuration
+    # Recent turns are kept verbatim within the token budget; evicted turns are summarized
+    # by the LLM into a rolling summary of at most CHAT_SUMMARY_MAX_WORDS words.
+    CHAT_HISTORY_TOKEN_BUDGET = 4000
+    CHAT_HISTORY_MAX_MESSAGES = 200
+    CHAT_SUMMARY_MAX_PENDING_MESSAGES = 100
+    CHAT_SUMMARY_MAX_WORDS = 200
+    CHAT_SUMMARY_MAX_CHARS = 2000
+    # Chat history is persisted so sessions survive restarts and eviction.
+    # Set the backend to None to keep history in memory only.
+    CHAT_STORAGE_BACKEND = "sqlite"
+    CHAT_STORAGE_PATH = "chat_history.db"
+    CHAT_MESSAGES_PAGE_SIZE = 50
+    CHAT_MESSAGES_MAX_PAGE_SIZE = 500
+
+    # Semantic routing configuration
+    # Prompts are routed by embedding similarity to agent descriptions, falling back to the
+    # LLM delegator when the best agent doesn't beat the runner-up by at least the margin.
+    SEMANTIC_ROUTER_ENABLED = True
+    SEMANTIC_ROUTER_MARGIN_THRESHOLD = 0.05
+    SEMANTIC_ROUTER_MIN_SIMILARITY = 0.3
+    # Cache of delegator decisions for repeated prompts
+    ROUTING_CACHE_MAX_SIZE = 1024
+    ROUTING_CACHE_TTL_SECONDS = 600
+    # When an agent fails, rank the top-k remaining agents in one LLM call and race them,
+    # keeping the first good response. Off by default: racing runs several agents per prompt.
+    # Only agents marked "side_effect_free" in AGENTS_CONFIG are raced. A losing agent can't
+    # be stopped once it is running on a worker thread, so marking an agent that sends
+    # transactions, posts or changes session state is unsafe.
+    SPECULATIVE_ROUTING_ENABLED = False
+    SPECULATIVE_ROUTING_TOP_K = 3
+    SPECULATIVE_ROUTING_DEADLINE_SECONDS = 30
+
     AGENTS_CONFIG = {
         "agents": [
             {
@@ -23,6 +72,7 @@ class Config:
                 "name": "default",
                 "human_readable_name": "Default General Purpose",
                 "upload_required": False,
+                "side_effect_free": True,
             },
             {
                 "path": "src.agents.imagen.agent",
@@ -31,6 +81,7 @@ class Config:
                 "name": "imagen",
                 "human_readable_name": "Image Generator",
                 "upload_required": False,
+                "side_effect_free": True,
             },
             {
                 "path": "src.agents.base_agent.agent",
@@ -47,6 +98,7 @@ class Config:
                 "name": "crypto data",
                 "human_readable_name": "Crypto Data Fetcher",
                 "upload_required": False,
+                "side_effect_free": True,
             },
             # DISABLED: Pending 1inch protocol fix
             #
@@ -80,6 +132,7 @@ class Config:
                 "name": "rag",
                 "human_readable_name": "Document Assistant",
                 "upload_required": True,
+                "side_effect_free": True,
             },
             # DISABLED:
             #
@@ -97,6 +150,7 @@ class Config:
                 "name": "mor rewards",
                 "human_readable_name": "MOR Rewards Tracker",
                 "upload_required": False,
+                "side_effect_free": True,
             },
             {
                 "path": "src.agents.realtime_search.agent",
@@ -105,6 +159,7 @@ class Config:
                 "name": "realtime search",
                 "human_readable_name": "Real-Time Search",
                 "upload_required": False,
+                "side_effect_free": True,
             },
             {
                 "path": "src.agents.news_agent.agent",
@@ -113,6 +168,7 @@ class Config:
                 "name": "crypto news",
                 "human_readable_name": "Crypto News Analyst",
                 "upload_required": False,
+                "side_effect_free": True,
             },
         ]
     }
@@ -1,8 +1,13 @@
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from langchain.schema import HumanMessage, SystemMessage
-from src.stores import chat_manager_instance, agent_manager_instance
+from src.config import Config
+from src.routing_cache import RoutingCache
+from src.semantic_router import SemanticRouter
+from src.stores import agent_manager_instance, session_manager_instance
+from src.stores.session_manager import Session
 
 logger = logging.getLogger(__name__)
 
@@ -10,42 +15,115 @@ logger = logging.getLogger(__name__)
 class Delegator:
     def __init__(self, llm, embeddings):
         self.llm = llm  # Keep llm instance on delegator
-        self.attempted_agents = set()  # Track attempted agents within a chat session
 
-        # Load all agents via agent manager
-        agent_manager_instance.load_all_agents(llm, embeddings)
-        logger.info(f"Delegator initialized with {len(agent_manager_instance.agents)} agents")
+        # Agents are imported and constructed on first use unless lazy loading is disabled
+        if Config.LAZY_AGENT_LOADING:
+            agent_manager_instance.set_models(llm, embeddings)
+            if Config.PREWARM_SELECTED_AGENTS:
+                agent_manager_instance.prewarm_agents(agent_manager_instance.get_selected_agents())
+        else:
+            agent_manager_instance.load_all_agents(llm, embeddings)
+        logger.info(f"Delegator initialized, {len(agent_manager_instance.agents)} agents loaded")
         logger.info(f"Active agents: {agent_manager_instance.get_selected_agents()}")
 
-    def reset_attempted_agents(self):
-        """Reset the set of attempted agents"""
-        self.attempted_agents = set()
-        logger.info("Reset attempted agents")
+        # Embed agent descriptions once so most prompts skip the LLM routing call
+        self.semantic_router = SemanticRouter(
+            embeddings,
+            margin_threshold=Config.SEMANTIC_ROUTER_MARGIN_THRESHOLD,
+            min_similarity=Config.SEMANTIC_ROUTER_MIN_SIMILARITY,
+        )
+        if Config.SEMANTIC_ROUTER_ENABLED:
+            self.semantic_router.fit(agent_manager_instance.get_available_agents())
+
+        # Remember first-choice decisions for repeated prompts; a new agent selection
+        # changes the cache key, but clearing keeps stale entries from holding LRU slots
+        self.routing_cache = RoutingCache(
+            max_size=Config.ROUTING_CACHE_MAX_SIZE, ttl_seconds=Config.ROUTING_CACHE_TTL_SECONDS
+        )
+        agent_manager_instance.add_selection_listener(self.routing_cache.invalidate)
 
-    def get_available_unattempted_agents(self) -> List[Dict]:
-        """Get available agents that haven't been attempted yet"""
+    def reset_attempted_agents(self, session: Session):
+        """Reset the set of attempted agents for a session"""
+        session.attempted_agents = set()
+        logger.info(f"Reset attempted agents for session {session.session_id}")
+
+    def get_available_unattempted_agents(self, session: Session) -> List[Dict]:
+        """Get available agents that haven't been attempted yet in this session"""
         return [
             agent_config
             for agent_config in agent_manager_instance.get_available_agents()
             if agent_config["name"] in agent_manager_instance.get_selected_agents()
-            and agent_config["name"] not in self.attempted_agents
+            and agent_config["name"] not in session.attempted_agents
             and not (
                 agent_config["upload_required"]
-                and not chat_manager_instance.get_uploaded_file_status()
+                and not session.chat_manager.get_uploaded_file_status()
             )
         ]
 
-    def get_delegator_response(self, prompt: Dict) -> Dict[str, str]:
+    async def get_delegator_response(self, prompt: Dict, session: Session) -> Dict[str, str]:
         """Get appropriate agent based on prompt, excluding previously attempted agents"""
-        available_agents = self.get_available_unattempted_agents()
+        available_agents = self.get_available_unattempted_agents(session)
         logger.info(f"Available, unattempted agents: {available_agents}")
 
         if not available_agents:
             # If no specialized agents are available, use default agent as last resort
-            if "default" not in self.attempted_agents:
+            if "default" not in session.attempted_agents:
                 return {"agent": "default"}
             raise ValueError("No remaining agents available for current state")
 
+        # Only first attempts are cached; fallbacks depend on which agents already failed
+        cache_key = None
+        if not session.attempted_agents:
+            cache_key = self.routing_cache.make_key(
+                prompt["content"],
+                agent_manager_instance.get_selected_agents(),
+                session.chat_manager.get_uploaded_file_status(),
+            )
+
+        selected_agent_name = self.routing_cache.get(cache_key) if cache_key else None
+        if selected_agent_name:
+            logger.info(f"Routing cache hit: {selected_agent_name}")
+        else:
+            selected_agent_name = await self._select_agent_semantically(prompt, available_agents)
+            if selected_agent_name:
+                logger.info(f"Semantic router selected agent: {selected_agent_name}")
+            else:
+                selected_agent_name = await self._select_agent_with_llm(prompt, available_agents)
+
+            if cache_key and selected_agent_name:
+                self.routing_cache.put(cache_key, selected_agent_name)
+
+        # Track this agent as attempted
+        session.attempted_agents.add(selected_agent_name)
+        logger.info(
+            f"Added {selected_agent_name} to attempted agents. Current attempts: {session.attempted_agents}"
+        )
+
+        return {"agent": selected_agent_name}
+
+    async def _select_agent_semantically(
+        self, prompt: Dict, available_agents: List[Dict]
+    ) -> Optional[str]:
+        """Pick an agent by embedding similarity, or None if the LLM should decide"""
+        if not Config.SEMANTIC_ROUTER_ENABLED:
+            return None
+
+        # Descriptions couldn't be embedded at startup (e.g. Ollama not up yet), so retry
+        if not self.semantic_router.is_ready:
+            await asyncio.to_thread(
+                self.semantic_router.fit, agent_manager_instance.get_available_agents()
+            )
+
+        try:
+            return await self.semantic_router.route(
+                prompt["content"], [agent["name"] for agent in available_agents]
+            )
+        except Exception as e:
+            logger.warning(f"Semantic routing failed, falling back to LLM: {str(e)}")
+            return None
+
+    async def _select_agent_with_llm(self, prompt: Dict, available_agents: List[Dict]) -> str:
+        """Ask the LLM to pick an agent with the select_agent tool"""
         system_prompt = (
             "Your name is Morpheus. "
             "Your primary function is to select the correct agent from the list of available agents based on the user's input. "
@@ -79,7 +157,7 @@ class Delegator:
             HumanMessage(content=prompt["content"]),
         ]
 
-        result = agent_selection_llm.invoke(messages)
+        result = await agent_selection_llm.ainvoke(messages)
         tool_calls = result.tool_calls
 
         if not tool_calls:
@@ -87,42 +165,53 @@ class Delegator:
 
         selected_agent = tool_calls[0]
         logger.info(f"Selected agent: {selected_agent}")
-        selected_agent_name = selected_agent.get("args", {}).get("agent")
+        return selected_agent.get("args", {}).get("agent")
 
-        # Track this agent as attempted
-        self.attempted_agents.add(selected_agent_name)
-        logger.info(
-            f"Added {selected_agent_name} to attempted agents. Current attempts: {self.attempted_agents}"
-        )
+    async def run_agent_chat(self, agent: Any, chat_request: Any) -> Any:
+        """Run an agent's chat, awaiting achat or falling back to a worker thread"""
+        if hasattr(agent, "achat"):
+            return await agent.achat(chat_request)
 
-        return {"agent": selected_agent_name}
+        # Agents without an async contract must not block the event loop
+        return await asyncio.to_thread(agent.chat, chat_request)
 
-    def delegate_chat(self, agent_name: str, chat_request: Any) -> Tuple[Optional[str], Any]:
+    async def delegate_chat(self, agent_name: str, chat_request: Any) -> Tuple[Optional[str], Any]:
         """Delegate chat to specific agent with cascading fallback"""
         logger.info(f"Attempting to delegate chat to agent: {agent_name}")
 
         if agent_name not in agent_manager_instance.get_selected_agents():
             logger.warning(f"Attempted to delegate to unselected agent: {agent_name}")
-            return self._try_next_agent(chat_request)
+            return await self._try_next_agent(chat_request)
 
-        agent = agent_manager_instance.get_agent(agent_name)
+        agent = await agent_manager_instance.aget_agent(agent_name)
         if not agent:
             logger.error(f"Agent {agent_name} is selected but not loaded")
-            return self._try_next_agent(chat_request)
+            return await self._try_next_agent(chat_request)
 
         try:
-            result = agent.chat(chat_request)
+            result = await self.run_agent_chat(agent, chat_request)
             logger.info(f"Chat delegation to {agent_name} completed successfully")
             return agent_name, result
         except Exception as e:
             logger.error(f"Error during chat delegation to {agent_name}: {str(e)}")
-            return self._try_next_agent(chat_request)
+            return await self._try_next_agent(chat_request)
 
-    def _try_next_agent(self, chat_request: Any) -> Tuple[Optional[str], Any]:
+    async def _try_next_agent(self, chat_request: Any) -> Tuple[Optional[str], Any]:
         """Try to get a response from the next best available agent"""
+        session = session_manager_instance.get_session(chat_request.session_id)
+        if Config.SPECULATIVE_ROUTING_ENABLED:
+            candidates = await self._rank_next_agents(chat_request.prompt.dict(), session)
+            if candidates and not self._is_side_effect_free(candidates[0]):
+                # The best agent may act on the user's behalf, so it runs alone, and only once
+                session.attempted_agents.add(candidates[0])
+                return await self.delegate_chat(candidates[0], chat_request)
+            racers = [name for name in candidates if self._is_side_effect_free(name)]
+            if racers:
+                return await self._race_agents(racers, chat_request, session)
+
         try:
             # Get next best agent
-            result = self.get_delegator_response(chat_request.prompt.dict())
+            result = await self.get_delegator_response(chat_request.prompt.dict(), session)
 
             if "agent" not in result:
                 return None, {"error": "No suitable agent found"}
@@ -130,8 +219,205 @@ class Delegator:
             next_agent = result["agent"]
             logger.info(f"Cascading to next agent: {next_agent}")
 
-            return self.delegate_chat(next_agent, chat_request)
+            return await self.delegate_chat(next_agent, chat_request)
         except ValueError as ve:
             # No more agents available
             logger.error(f"No more agents available: {str(ve)}")
             return None, {"error": "All available agents have been attempted without success"}
+
+    async def _rank_next_agents(self, prompt: Dict, session: Session) -> List[str]:
+        """Ask the LLM for the best remaining agents, best first, in a single call"""
+        available_agents = self.get_available_unattempted_agents(session)
+        if not available_agents:
+            return []
+
+        agent_names = [agent["name"] for agent in available_agents]
+        top_k = Config.SPECULATIVE_ROUTING_TOP_K
+        system_prompt = (
+            "Your name is Morpheus. "
+            "Your primary function is to rank the available agents by how well they can answer "
+            "the user's input. "
+            f"You MUST use the 'rank_agents' function to list up to {top_k} agents, best first. "
+            "Available agents and their descriptions in the format `{agent_name}: {agent_description}`"
+            "You must use the available agent names.\n"
+            + "\n".join(f"- {agent['name']}: {agent['description']}" for agent in available_agents)
+        )
+
+        tools = [
+            {
+                "name": "rank_agents",
+                "description": "Rank the agents that should be used to respond to the user query",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "agents": {
+                            "type": "array",
+                            "items": {"type": "string", "enum": agent_names},
+                            "maxItems": top_k,
+                            "description": "Names of the agents to use, best first",
+                        }
+                    },
+                    "required": ["agents"],
+                },
+            }
+        ]
+
+        agent_ranking_llm = self.llm.bind_tools(tools, tool_choice="rank_agents")
+        messages = [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=prompt["content"]),
+        ]
+
+        try:
+            result = await agent_ranking_llm.ainvoke(messages)
+        except Exception as e:
+            logger.warning(f"Agent ranking failed, falling back to serial delegation: {str(e)}")
+            return []
+
+        ranked = []
+        for tool_call in result.tool_calls[:1]:
+            for name in tool_call.get("args", {}).get("agents", []):
+                if name in agent_names and name not in ranked:
+                    ranked.append(name)
+        logger.info(f"Ranked fallback agents: {ranked}")
+        return ranked[:top_k]
+
+    @staticmethod
+    def _is_side_effect_free(agent_name: str) -> bool:
+        """Whether an agent is safe to run speculatively alongside others"""
+        agent_config = agent_manager_instance.get_agent_config(agent_name) or {}
+        return agent_config.get("side_effect_free", False) is True
+
+    @staticmethod
+    def _is_error_response(result: Any) -> bool:
+        """Agents report handled failures as error dicts or (body, status) tuples"""
+        if isinstance(result, tuple):
+            return len(result) == 2 and isinstance(result[1], int) and result[1] >= 400
+        return isinstance(result, dict) and ("error" in result or "Error" in result)
+
+    async def _run_candidate(self, agent_name: str, chat_request: Any) -> Any:
+        """Run one speculative candidate, raising if it can't produce a usable response"""
+        agent = await agent_manager_instance.aget_agent(agent_name)
+        if not agent:
+            raise ValueError(f"Agent {agent_name} is selected but not loaded")
+
+        result = await self.run_agent_chat(agent, chat_request)
+        if self._is_error_response(result):
+            raise ValueError(f"Agent {agent_name} returned an error: {result}")
+        return result
+
+    async def _race_agents(
+        self, agent_names: List[str], chat_request: Any, session: Session
+    ) -> Tuple[Optional[str], Any]:
+        """Run candidate agents concurrently and return the first successful response"""
+        session.attempted_agents.update(agent_names)
+        logger.info(f"Racing fallback agents: {agent_names}")
+
+        tasks = {
+            asyncio.create_task(self._run_candidate(name, chat_request)): name
+            for name in agent_names
+        }
+        pending = set(tasks)
+        deadline = asyncio.get_running_loop().time() + Config.SPECULATIVE_ROUTING_DEADLINE_SECONDS
+
+        try:
+            while pending:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                # Prefer the higher-ranked agent when several finish together
+                for task in sorted(done, key=lambda t: agent_names.index(tasks[t])):
+                    if task.exception() is None:
+                        logger.info(f"Speculative fallback answered by {tasks[task]}")
+                        return tasks[task], task.result()
+                    logger.error(
+                        f"Error during chat delegation to {tasks[task]}: {task.exception()}"
+                    )
+        finally:
+            # Losers are cancelled; agents running on worker threads finish in the background
+            for task in pending:
+                task.cancel()
+
+        if pending:
+            logger.error(f"Speculative fallback timed out waiting for {agent_names}")
+            return None, {"error": "Timed out waiting for fallback agents"}
+
+        return await self._try_next_agent(chat_request)
+
+    async def stream_chat(self, agent_name: str, chat_request: Any) -> AsyncIterator[Dict]:
+        """
+        Stream chat events from a specific agent with cascading fallback.
+
+        Yields event dicts with a "type" of "agent", "status", "token" or "done". The final
+        "done" event carries the agent that answered and its full response. Fallback to the
+        next agent only happens while nothing has been streamed to the client yet.
+        """
+        logger.info(f"Attempting to stream chat from agent: {agent_name}")
+        yield {"type": "agent", "agent": agent_name}
+
+        agent = await self._aget_selected_agent(agent_name)
+        if agent:
+            streamed = False
+            try:
+                async for event in self._stream_agent(agent, agent_name, chat_request):
+                    streamed = streamed or event["type"] == "token"
+                    yield event
+                logger.info(f"Chat stream from {agent_name} completed successfully")
+                return
+            except Exception as e:
+                logger.error(f"Error during chat stream from {agent_name}: {str(e)}")
+                if streamed:
+                    raise
+
+        async for event in self._stream_next_agent(chat_request):
+            yield event
+
+    async def _aget_selected_agent(self, agent_name: str) -> Any:
+        """Get an agent if it is selected and loaded, otherwise None"""
+        if agent_name not in agent_manager_instance.get_selected_agents():
+            logger.warning(f"Attempted to delegate to unselected agent: {agent_name}")
+            return None
+
+        agent = await agent_manager_instance.aget_agent(agent_name)
+        if not agent:
+            logger.error(f"Agent {agent_name} is selected but not loaded")
+        return agent
+
+    async def _stream_agent(
+        self, agent: Any, agent_name: str, chat_request: Any
+    ) -> AsyncIterator[Dict]:
+        """Stream one agent's events, tagging the final one with the agent's name"""
+        if not hasattr(agent, "astream_chat"):
+            result = await self.run_agent_chat(agent, chat_request)
+            yield {"type": "done", "agent": agent_name, "response": result}
+            return
+
+        async for event in agent.astream_chat(chat_request):
+            if event["type"] == "done":
+                event = {**event, "agent": agent_name}
+            yield event
+
+    async def _stream_next_agent(self, chat_request: Any) -> AsyncIterator[Dict]:
+        """Stream a response from the next best available agent"""
+        session = session_manager_instance.get_session(chat_request.session_id)
+        try:
+            result = await self.get_delegator_response(chat_request.prompt.dict(), session)
+        except ValueError as ve:
+            logger.error(f"No more agents available: {str(ve)}")
+            yield {
+                "type": "done",
+                "agent": None,
+                "response": {"error": "All available agents have been attempted without success"},
+            }
+            return
+
+        if "agent" not in result:
+            yield {"type": "done", "agent": None, "response": {"error": "No suitable agent found"}}
+            return
+
+        logger.info(f"Cascading stream to next agent: {result['agent']}")
+        async for event in self.stream_chat(result["agent"], chat_request):
+            yield event
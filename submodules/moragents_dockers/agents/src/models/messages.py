@@ -1,5 +1,7 @@
 from pydantic import BaseModel
 
+from src.config import Config
+
 
 class ChatMessage(BaseModel):
     role: str
@@ -10,3 +12,4 @@ class ChatRequest(BaseModel):
     prompt: ChatMessage
     chain_id: str
     wallet_address: str
+    session_id: str = Config.DEFAULT_SESSION_ID
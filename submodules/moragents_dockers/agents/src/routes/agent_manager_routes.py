@@ -29,3 +29,9 @@ async def set_selected_agents(request: Request) -> JSONResponse:
     logger.info(f"Newly selected agents: {agent_manager_instance.get_selected_agents()}")
 
     return JSONResponse(content={"status": "success", "agents": agent_names})
+
+
+@router.get("/load_report")
+async def get_load_report() -> JSONResponse:
+    """Get load status and import/construct timings for each agent"""
+    return JSONResponse(content=agent_manager_instance.get_load_report())
@@ -1,6 +1,10 @@
+import asyncio
 import logging
-from fastapi import APIRouter
-from src.stores import chat_manager_instance
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from src.config import Config
+from src.stores import session_manager_instance
 
 logger = logging.getLogger(__name__)
 
@@ -8,15 +12,32 @@ router = APIRouter(prefix="/chat", tags=["chat"])
 
 
 @router.get("/messages")
-async def get_messages():
-    """Get all chat messages"""
-    logger.info("Received get_messages request")
-    return {"messages": chat_manager_instance.get_messages()}
+async def get_messages(
+    session_id: str = Config.DEFAULT_SESSION_ID,
+    cursor: Optional[int] = None,
+    limit: int = Query(Config.CHAT_MESSAGES_PAGE_SIZE, ge=1, le=Config.CHAT_MESSAGES_MAX_PAGE_SIZE),
+):
+    """Get a page of chat messages for a session, newest page first"""
+    logger.info(f"Received get_messages request for session {session_id}")
+    session = session_manager_instance.get_session(session_id)
+    messages, next_cursor = await asyncio.to_thread(
+        session.chat_manager.get_message_page, cursor, limit
+    )
+    return {"messages": messages, "next_cursor": next_cursor}
 
 
 @router.get("/clear")
-async def clear_messages():
-    """Clear chat message history"""
-    logger.info("Clearing message history")
-    chat_manager_instance.clear_messages()
+async def clear_messages(session_id: str = Config.DEFAULT_SESSION_ID):
+    """Clear chat message history for a session"""
+    logger.info(f"Clearing message history for session {session_id}")
+    session_manager_instance.get_session(session_id).chat_manager.clear_messages()
     return {"response": "successfully cleared message history"}
+
+
+@router.delete("/sessions/{session_id}")
+async def delete_session(session_id: str):
+    """Delete a session and all of its state"""
+    logger.info(f"Deleting session {session_id}")
+    if not session_manager_instance.delete_session(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {"response": "successfully deleted session"}
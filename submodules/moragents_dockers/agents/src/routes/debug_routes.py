@@ -0,0 +1,18 @@
+import logging
+
+from fastapi import APIRouter
+from src.startup_profiler import startup_profiler
+from src.stores import agent_manager_instance
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+
+@router.get("/startup")
+async def get_startup_profile(top: int = 25):
+    """Get module import times, boot phase times and agent load times from startup"""
+    return {
+        **startup_profiler.report(top=top),
+        "agents": agent_manager_instance.get_load_report(),
+    }
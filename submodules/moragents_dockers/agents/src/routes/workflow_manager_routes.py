@@ -1,6 +1,7 @@
 import logging
 from datetime import timedelta
-from fastapi import APIRouter, Request
+from typing import Optional
+from fastapi import APIRouter, Query, Request
 from fastapi.responses import JSONResponse
 from src.stores import workflow_manager_instance
 
@@ -55,6 +56,24 @@ async def get_workflow(workflow_id: str) -> JSONResponse:
         return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
 
 
+@router.get("/{workflow_id}/runs")
+async def get_workflow_runs(
+    workflow_id: str, limit: Optional[int] = Query(None, ge=1)
+) -> JSONResponse:
+    """Get recent runs of a workflow with lag and latency statistics"""
+    try:
+        history = await workflow_manager_instance.get_workflow_runs(workflow_id, limit)
+        if history["runs"] or await workflow_manager_instance.get_workflow(workflow_id):
+            return JSONResponse(content=history)
+        return JSONResponse(
+            status_code=404,
+            content={"status": "error", "message": f"Workflow {workflow_id} not found"},
+        )
+    except Exception as e:
+        logger.error(f"Failed to get workflow runs: {str(e)}")
+        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+
+
 @router.put("/{workflow_id}")
 async def update_workflow(workflow_id: str, request: Request) -> JSONResponse:
     """Update workflow properties"""
@@ -0,0 +1,104 @@
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Words that don't change which agent should answer a prompt
+STOPWORDS = {
+    "a",
+    "an",
+    "and",
+    "are",
+    "can",
+    "could",
+    "do",
+    "for",
+    "give",
+    "i",
+    "is",
+    "me",
+    "my",
+    "of",
+    "please",
+    "show",
+    "tell",
+    "the",
+    "to",
+    "what",
+    "whats",
+    "you",
+}
+
+RoutingKey = Tuple[str, Tuple[str, ...], bool]
+
+
+class RoutingCache:
+    """
+    LRU cache with expiry for delegator routing decisions.
+
+    Keys combine a normalized prompt fingerprint with the selected agents and upload status,
+    so "price of eth" and "eth price?" share an entry but a change in which agents can be
+    chosen never serves a stale decision.
+
+    Attributes:
+        max_size (int): Maximum number of cached decisions
+        ttl_seconds (float): How long a decision stays valid
+        hits (int): Number of lookups served from the cache
+        misses (int): Number of lookups that required routing
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[RoutingKey, Tuple[str, float]]" = OrderedDict()
+
+    @staticmethod
+    def fingerprint(prompt: str) -> str:
+        """Normalize a prompt so trivially different phrasings map to the same key."""
+        words = re.findall(r"[a-z0-9]+", prompt.lower())
+        return " ".join(sorted({word for word in words if word not in STOPWORDS}))
+
+    def make_key(
+        self, prompt: str, selected_agents: Iterable[str], has_uploaded_file: bool
+    ) -> RoutingKey:
+        return (self.fingerprint(prompt), tuple(sorted(selected_agents)), has_uploaded_file)
+
+    def get(self, key: RoutingKey) -> Optional[str]:
+        """Return the cached agent for a key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[1] > self.ttl_seconds:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: RoutingKey, agent_name: str) -> None:
+        self._entries[key] = (agent_name, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Drop every cached decision."""
+        self._entries.clear()
+        logger.info("Routing cache invalidated")
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+        }
@@ -0,0 +1,110 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticRouter:
+    """
+    Picks an agent by cosine similarity between the prompt and each agent's description.
+
+    Agent descriptions are embedded once, so routing a prompt costs a single query embedding
+    instead of a tool-calling LLM round trip. The router only answers when the best agent beats
+    the runner-up by a clear margin; ambiguous prompts are left to the LLM delegator.
+
+    Attributes:
+        embeddings (Embeddings): Embeddings model used for descriptions and prompts
+        margin_threshold (float): Minimum similarity gap between the top two agents
+        min_similarity (float): Minimum similarity the top agent must reach
+        agent_names (List[str]): Agent names, aligned with the rows of agent_vectors
+        agent_vectors (Optional[np.ndarray]): Normalized description embeddings
+    """
+
+    def __init__(self, embeddings, margin_threshold: float, min_similarity: float) -> None:
+        self.embeddings = embeddings
+        self.margin_threshold = margin_threshold
+        self.min_similarity = min_similarity
+        self.agent_names: List[str] = []
+        self.agent_vectors: Optional[np.ndarray] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.agent_vectors is not None
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def fit(self, agent_configs: List[Dict]) -> bool:
+        """
+        Embed the description of every configured agent.
+
+        Args:
+            agent_configs (List[Dict]): Agent configurations with "name" and "description"
+
+        Returns:
+            bool: True if the router is ready to route, False if embedding failed
+        """
+        descriptions = [f"{agent['name']}: {agent['description']}" for agent in agent_configs]
+        try:
+            vectors = np.array(self.embeddings.embed_documents(descriptions), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Semantic router unavailable, failed to embed agents: {str(e)}")
+            return False
+
+        self.agent_names = [agent["name"] for agent in agent_configs]
+        self.agent_vectors = self._normalize(vectors)
+        logger.info(f"Semantic router embedded {len(self.agent_names)} agent descriptions")
+        return True
+
+    async def score(self, prompt: str, candidates: List[str]) -> List[Tuple[str, float]]:
+        """
+        Score candidate agents against a prompt.
+
+        Args:
+            prompt (str): User prompt
+            candidates (List[str]): Names of agents that may be selected
+
+        Returns:
+            List[Tuple[str, float]]: (agent name, cosine similarity) pairs, best first
+        """
+        query = np.array(await self.embeddings.aembed_query(prompt), dtype=np.float32)
+        similarities = self.agent_vectors @ self._normalize(query)
+        scored = [
+            (name, float(similarity))
+            for name, similarity in zip(self.agent_names, similarities)
+            if name in candidates
+        ]
+        return sorted(scored, key=lambda item: item[1], reverse=True)
+
+    async def route(self, prompt: str, candidates: List[str]) -> Optional[str]:
+        """
+        Select an agent for the prompt if the choice is unambiguous.
+
+        Args:
+            prompt (str): User prompt
+            candidates (List[str]): Names of agents that may be selected
+
+        Returns:
+            Optional[str]: Selected agent name, or None to defer to the LLM delegator
+        """
+        if not self.is_ready:
+            return None
+
+        scored = await self.score(prompt, candidates)
+        if len(scored) < 2:
+            return scored[0][0] if scored else None
+
+        (top_agent, top_score), (_, runner_up_score) = scored[0], scored[1]
+        margin = top_score - runner_up_score
+        logger.info(
+            f"Semantic router top match: {top_agent} ({top_score:.3f}, margin {margin:.3f})"
+        )
+
+        if top_score < self.min_similarity or margin < self.margin_threshold:
+            return None
+        return top_agent
@@ -0,0 +1,132 @@
+import builtins
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfiler:
+    """
+    Records how long the agents service spends importing modules and running boot phases.
+
+    While active, the profiler wraps ``builtins.__import__`` and times every import statement
+    that loads new modules. Nested imports are tracked per thread so each module gets both its
+    cumulative time (including its own imports) and its self time.
+
+    Attributes:
+        module_times (Dict[str, Dict[str, float]]): Cumulative and self seconds per module
+        phase_times (Dict[str, float]): Seconds spent in each named boot phase
+        started_at (Optional[float]): perf_counter value when profiling started
+        boot_seconds (Optional[float]): Time between start and stop
+        is_active (bool): Whether imports are currently being timed
+    """
+
+    def __init__(self) -> None:
+        self.module_times: Dict[str, Dict[str, float]] = {}
+        self.phase_times: Dict[str, float] = {}
+        self.started_at: Optional[float] = None
+        self.boot_seconds: Optional[float] = None
+        self.is_active = False
+        self._original_import = builtins.__import__
+        self._local = threading.local()
+
+    def start(self) -> None:
+        """Begin timing imports. Safe to call more than once."""
+        if self.is_active:
+            return
+        self.started_at = time.perf_counter()
+        self.is_active = True
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def stop(self) -> None:
+        """Stop timing imports and record the total boot time."""
+        if not self.is_active:
+            return
+        # Bound methods compare equal, but are never identical, across attribute lookups
+        if builtins.__import__ == self._timed_import:
+            builtins.__import__ = self._original_import
+        self.is_active = False
+        self.boot_seconds = time.perf_counter() - self.started_at
+        logger.info(
+            f"Startup took {self.boot_seconds:.2f}s, "
+            f"{self.total_import_seconds():.2f}s of it importing modules"
+        )
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        modules_before = len(sys.modules)
+        stack: List[float] = getattr(self._local, "stack", None) or []
+        self._local.stack = stack
+
+        # Each stack entry accumulates the time spent in nested imports
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            if len(sys.modules) > modules_before:
+                self._record(self._resolve_name(name, globals, level), elapsed, elapsed - nested)
+
+    @staticmethod
+    def _resolve_name(name: str, globals: Optional[Dict], level: int) -> str:
+        if level == 0 or not globals:
+            return name
+        package = (globals.get("__package__") or "").rsplit(".", level - 1)[0]
+        return f"{package}.{name}" if name else package
+
+    def _record(self, module: str, cumulative: float, self_time: float) -> None:
+        times = self.module_times.setdefault(module, {"cumulative": 0.0, "self": 0.0})
+        times["cumulative"] += cumulative
+        times["self"] += self_time
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a named boot phase, such as constructing the delegator."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[name] = time.perf_counter() - start
+
+    def total_import_seconds(self) -> float:
+        """Total time spent in top-level imports, excluding double counting of nested ones."""
+        return sum(times["self"] for times in self.module_times.values())
+
+    def report(self, top: int = 25) -> Dict:
+        """
+        Summarize the startup profile.
+
+        Args:
+            top (int): Number of slowest modules to include
+
+        Returns:
+            Dict: Boot time, total import time, phase timings and the slowest imports
+        """
+        slowest = sorted(
+            self.module_times.items(), key=lambda item: item[1]["cumulative"], reverse=True
+        )[:top]
+        return {
+            "boot_seconds": round(self.boot_seconds, 4) if self.boot_seconds else None,
+            "total_import_seconds": round(self.total_import_seconds(), 4),
+            "phases": {name: round(seconds, 4) for name, seconds in self.phase_times.items()},
+            "slowest_imports": [
+                {
+                    "module": module,
+                    "cumulative_seconds": round(times["cumulative"], 4),
+                    "self_seconds": round(times["self"], 4),
+                }
+                for module, times in slowest
+            ],
+        }
+
+
+# Create an instance to act as a singleton profiler
+startup_profiler = StartupProfiler()
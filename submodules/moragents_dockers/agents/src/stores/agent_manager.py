@@ -1,7 +1,10 @@
+import asyncio
 import importlib
 import logging
+import threading
+import time
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from langchain_ollama import ChatOllama
 from langchain_community.embeddings import OllamaEmbeddings
 
@@ -12,15 +15,16 @@ logger = logging.getLogger(__name__)
 
 class AgentManager:
     """
-    Manages the loading, selection and activation of agents in the system.
+    Manages the loading and selection of agents in the system.
 
     Attributes:
-        active_agent (Optional[str]): Currently active agent name
         selected_agents (List[str]): List of selected agent names
         config (Dict): Configuration dictionary for agents
         agents (Dict[str, Any]): Dictionary of loaded agent instances
+        load_report (Dict[str, Dict]): Per-agent load status and import/construct timings
         llm (ChatOllama): Language model instance
         embeddings (OllamaEmbeddings): Embeddings model instance
+        selection_listeners (List[Callable[[], None]]): Callbacks run when the selection changes
     """
 
     def __init__(self, config: Dict) -> None:
@@ -30,12 +34,14 @@ class AgentManager:
         Args:
             config (Dict): Configuration dictionary containing agent definitions
         """
-        self.active_agent: Optional[str] = None
         self.selected_agents: List[str] = []
         self.config = config
         self.agents: Dict[str, Any] = {}
+        self.load_report: Dict[str, Dict] = {}
+        self._load_lock = threading.RLock()
         self.llm: Optional[ChatOllama] = None
         self.embeddings: Optional[OllamaEmbeddings] = None
+        self.selection_listeners: List[Callable[[], None]] = []
 
         # Select first 6 agents by default
         self.set_selected_agents([agent["name"] for agent in config["agents"][:6]])
@@ -51,19 +57,33 @@ class AgentManager:
         Returns:
             bool: True if agent loaded successfully, False otherwise
         """
+        report = {"status": "loading", "import_seconds": None, "construct_seconds": None}
+        self.load_report[agent_config["name"]] = report
         try:
+            start = time.perf_counter()
             module = importlib.import_module(agent_config["path"])
             agent_class = getattr(module, agent_config["class"])
+            report["import_seconds"] = round(time.perf_counter() - start, 4)
+
+            start = time.perf_counter()
             self.agents[agent_config["name"]] = agent_class(agent_config, self.llm, self.embeddings)
-            logger.info(f"Loaded agent: {agent_config['name']}")
+            report["construct_seconds"] = round(time.perf_counter() - start, 4)
+
+            report["status"] = "loaded"
+            logger.info(
+                f"Loaded agent: {agent_config['name']} (import {report['import_seconds']}s, "
+                f"construct {report['construct_seconds']}s)"
+            )
             return True
         except Exception as e:
+            report["status"] = "failed"
+            report["error"] = str(e)
             logger.error(f"Failed to load agent {agent_config['name']}: {str(e)}")
             return False
 
-    def load_all_agents(self, llm: ChatOllama, embeddings: OllamaEmbeddings) -> None:
+    def set_models(self, llm: ChatOllama, embeddings: OllamaEmbeddings) -> None:
         """
-        Load all available agents with the given language and embedding models.
+        Set the language and embedding models that agents are constructed with.
 
         Args:
             llm (ChatOllama): Language model instance
@@ -71,36 +91,51 @@ class AgentManager:
         """
         self.llm = llm
         self.embeddings = embeddings
+
+    def load_all_agents(self, llm: ChatOllama, embeddings: OllamaEmbeddings) -> None:
+        """
+        Load all available agents with the given language and embedding models.
+
+        Args:
+            llm (ChatOllama): Language model instance
+            embeddings (OllamaEmbeddings): Embeddings model instance
+        """
+        self.set_models(llm, embeddings)
         for agent_config in self.get_available_agents():
-            self._load_agent(agent_config)
+            self.get_agent(agent_config["name"])
         logger.info(f"Loaded {len(self.agents)} agents")
 
-    def get_active_agent(self) -> Optional[str]:
+    def prewarm_agents(self, agent_names: List[str]) -> threading.Thread:
         """
-        Get the name of the currently active agent.
+        Load agents on a background thread so their first request doesn't pay the import cost.
+
+        Args:
+            agent_names (List[str]): Names of agents to load
 
         Returns:
-            Optional[str]: Name of active agent or None if no agent is active
+            threading.Thread: The started prewarm thread
         """
-        return self.active_agent
 
-    def set_active_agent(self, agent_name: Optional[str]) -> None:
-        """
-        Set the active agent.
+        def prewarm():
+            for agent_name in agent_names:
+                self.get_agent(agent_name)
+            logger.info(f"Prewarmed agents: {agent_names}")
 
-        Args:
-            agent_name (Optional[str]): Name of agent to activate
+        thread = threading.Thread(target=prewarm, name="agent-prewarm", daemon=True)
+        thread.start()
+        return thread
 
-        Raises:
-            ValueError: If agent_name is not in selected_agents
+    def get_load_report(self) -> Dict[str, Dict]:
         """
-        if agent_name and agent_name not in self.selected_agents:
-            raise ValueError(f"Agent {agent_name} is not selected")
-        self.active_agent = agent_name
+        Get the load status and timings of every configured agent.
 
-    def clear_active_agent(self) -> None:
-        """Clear the currently active agent."""
-        self.active_agent = None
+        Returns:
+            Dict[str, Dict]: Report per agent name; agents never requested are "not_loaded"
+        """
+        return {
+            agent["name"]: self.load_report.get(agent["name"], {"status": "not_loaded"})
+            for agent in self.get_available_agents()
+        }
 
     def get_available_agents(self) -> List[Dict]:
         """
@@ -138,8 +173,17 @@ class AgentManager:
 
         self.selected_agents = agent_names
 
-        if self.active_agent not in agent_names:
-            self.clear_active_agent()
+        for listener in self.selection_listeners:
+            listener()
+
+    def add_selection_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Register a callback to run whenever the selected agents change.
+
+        Args:
+            listener (Callable[[], None]): Callback taking no arguments
+        """
+        self.selection_listeners.append(listener)
 
     def get_agent_config(self, agent_name: str) -> Optional[Dict]:
         """
@@ -155,16 +199,43 @@ class AgentManager:
 
     def get_agent(self, agent_name: str) -> Optional[Any]:
         """
-        Get agent instance by name.
+        Get agent instance by name, importing and constructing it on first use.
 
         Args:
             agent_name (str): Name of agent
 
         Returns:
-            Optional[Any]: Agent instance if found, None otherwise
+            Optional[Any]: Agent instance if found and loadable, None otherwise
         """
+        agent = self.agents.get(agent_name)
+        if agent is not None:
+            return agent
+
+        agent_config = self.get_agent_config(agent_name)
+        if agent_config is None:
+            return None
+
+        with self._load_lock:
+            # Another caller may have loaded it, or already failed to, while we waited
+            if agent_name not in self.agents and agent_name not in self.load_report:
+                self._load_agent(agent_config)
         return self.agents.get(agent_name)
 
+    async def aget_agent(self, agent_name: str) -> Optional[Any]:
+        """
+        Get agent instance by name without blocking the event loop on a first-time load.
+
+        Args:
+            agent_name (str): Name of agent
+
+        Returns:
+            Optional[Any]: Agent instance if found and loadable, None otherwise
+        """
+        agent = self.agents.get(agent_name)
+        if agent is not None:
+            return agent
+        return await asyncio.to_thread(self.get_agent, agent_name)
+
 
 # Create an instance to act as a singleton store
 agent_manager_instance = AgentManager(Config.AGENTS_CONFIG)
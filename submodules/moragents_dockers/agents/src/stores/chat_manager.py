@@ -1,28 +1,132 @@
+import asyncio
 import logging
-from typing import Dict, List
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
 
-logger = logging.getLogger(__name__)
+from langchain.schema import HumanMessage, SystemMessage
+from src.config import Config
+from src.stores.chat_storage import ChatStorage, StoredMessage
 
+logger = logging.getLogger(__name__)
 
-class ChatManager:
-    def __init__(self):
-        self.has_uploaded_file = False
-        self.messages: List[Dict[str, str]] = [
-            {
-                "role": "assistant",
-                "content": """This highly experimental chatbot is not intended for making important decisions,
+INTRO_MESSAGE = {
+    "role": "assistant",
+    "content": """This highly experimental chatbot is not intended for making important decisions,
                             and its responses are generated based on incomplete data and algorithms that may evolve rapidly.
                             By using this chatbot, you acknowledge that you use it at your own discretion
                             and assume all risks associated with its limitations and potential errors.""",
-            }
-        ]
+}
 
-    def add_message(self, message: Dict[str, str]):
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a conversation between a user and a crypto assistant. "
+    "Update the summary with the new turns below, keeping facts the assistant may need later "
+    "(assets, amounts, wallet addresses, decisions). Reply with the updated summary only, "
+    "in at most {max_words} words."
+)
+
+
+class ChatManager:
+    def __init__(self, session_id: Optional[str] = None, storage: Optional[ChatStorage] = None):
+        self.session_id = session_id
+        self.storage = storage
+        self.has_uploaded_file = False
+        self.intro_message: Dict[str, str] = INTRO_MESSAGE
+
+        # Recent turns stay verbatim within the token budget; older turns are folded into
+        # a rolling summary so memory and prompt size stay constant in long sessions
+        self.messages: Deque[Dict[str, str]] = deque()
+        self.token_count = 0
+        self.summary = ""
+        self.evicted_messages: Deque[Dict[str, str]] = deque(
+            maxlen=Config.CHAT_SUMMARY_MAX_PENDING_MESSAGES
+        )
+        self._compaction_task: Optional[asyncio.Task] = None
+        self._rendered_history: Optional[str] = None
+
+        # Resumed sessions reload their recent history from storage on first use
+        self._loaded = storage is None
+
+    @staticmethod
+    def _estimate_tokens(message: Dict[str, str]) -> int:
+        # Rough heuristic of ~4 characters per token, good enough for budgeting
+        return len(str(message.get("content", ""))) // 4 + 1
+
+    def _load_history(self) -> List[StoredMessage]:
+        return self.storage.load_page(self.session_id, limit=Config.CHAT_HISTORY_MAX_MESSAGES)
+
+    def _restore(self, page: List[StoredMessage]):
+        # A synchronous caller may have loaded the history while this page was being read
+        if self._loaded:
+            return
+        self._loaded = True
+        for _, message in page:
+            # Older turns are already persisted, so anything over budget is simply dropped
+            self._append(message, summarize_evicted=False)
+        logger.info(f"Reloaded {len(self.messages)} messages for session {self.session_id}")
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self._restore(self._load_history())
+
+    async def aload(self) -> None:
+        """Reload a resumed session's history from storage without blocking the event loop"""
+        if not self._loaded:
+            self._restore(await asyncio.to_thread(self._load_history))
+
+    def _append(self, message: Dict[str, str], summarize_evicted: bool = True):
         self.messages.append(message)
-        logger.info(f"Added message: {message}")
+        self.token_count += self._estimate_tokens(message)
+        self._rendered_history = None
+
+        # Always keep the latest turn, even if it alone exceeds the budget
+        while len(self.messages) > 1 and (
+            self.token_count > Config.CHAT_HISTORY_TOKEN_BUDGET
+            or len(self.messages) > Config.CHAT_HISTORY_MAX_MESSAGES
+        ):
+            evicted = self.messages.popleft()
+            self.token_count -= self._estimate_tokens(evicted)
+            if summarize_evicted:
+                self.evicted_messages.append(evicted)
+
+    def add_message(self, message: Dict[str, str]):
+        self._ensure_loaded()
+        self._append(message)
+        if self.storage:
+            self.storage.append(self.session_id, message)
+        logger.debug(f"Added message: {message}")
 
     def get_messages(self) -> List[Dict[str, str]]:
-        return self.messages
+        self._ensure_loaded()
+        return [self.intro_message, *self.messages]
+
+    def get_message_page(
+        self, cursor: Optional[int] = None, limit: int = 50
+    ) -> Tuple[List[Dict[str, str]], Optional[int]]:
+        """
+        Get a page of chat history, walking backwards from the newest message.
+
+        Args:
+            cursor (Optional[int]): Cursor returned by the previous page, None for the newest
+            limit (int): Maximum number of messages in the page
+
+        Returns:
+            Tuple[List[Dict[str, str]], Optional[int]]: Messages in chronological order and
+                the cursor for the next (older) page, or None when the history is exhausted
+        """
+        if self.storage:
+            page = self.storage.load_page(self.session_id, before=cursor, limit=limit)
+            messages = [message for _, message in page]
+            next_cursor = page[0][0] if len(page) == limit else None
+        else:
+            # Without storage only the in-memory window can be paged, by position
+            end = len(self.messages) if cursor is None else min(cursor, len(self.messages))
+            start = max(0, end - limit)
+            messages = list(self.messages)[start:end]
+            next_cursor = start if start > 0 else None
+
+        if next_cursor is None:
+            messages.insert(0, self.intro_message)
+        return messages, next_cursor
 
     def set_uploaded_file(self, has_file: bool):
         self.has_uploaded_file = has_file
@@ -32,21 +136,68 @@ class ChatManager:
         return self.has_uploaded_file
 
     def clear_messages(self):
-        self.messages = [self.messages[0]]  # Keep the initial message
+        self._loaded = True
+        if self.storage:
+            self.storage.clear(self.session_id)
+        self.messages.clear()
+        self.evicted_messages.clear()
+        self.token_count = 0
+        self.summary = ""
+        self._rendered_history = None
         logger.info("Cleared message history")
 
     def get_last_message(self) -> Dict[str, str]:
-        return self.messages[-1] if self.messages else {}
+        self._ensure_loaded()
+        return self.messages[-1] if self.messages else self.intro_message
 
     def add_response(self, response: Dict[str, str], agent_name: str):
         response_with_agent = response.copy()
         response_with_agent["agentName"] = agent_name
         self.add_message(response_with_agent)
-        logger.info(f"Added response from agent {agent_name}: {response_with_agent}")
+        logger.info(f"Added response from agent {agent_name}")
 
     def get_chat_history(self) -> str:
-        return "\n".join([f"{msg['role']}: {msg['content']}" for msg in self.messages])
+        self._ensure_loaded()
+        if self._rendered_history is None:
+            lines = [f"summary: {self.summary}"] if self.summary else []
+            lines.extend(f"{msg['role']}: {msg['content']}" for msg in self.messages)
+            self._rendered_history = "\n".join(lines)
+        return self._rendered_history
+
+    async def compact(self, llm) -> None:
+        """Fold evicted turns into the rolling summary"""
+        if not self.evicted_messages:
+            return
+
+        evicted = list(self.evicted_messages)
+        self.evicted_messages.clear()
+        turns = "\n".join(f"{msg['role']}: {msg['content']}" for msg in evicted)
+        messages = [
+            SystemMessage(content=SUMMARY_PROMPT.format(max_words=Config.CHAT_SUMMARY_MAX_WORDS)),
+            HumanMessage(
+                content=f"Current summary: {self.summary or '(empty)'}\n\nNew turns:\n{turns}"
+            ),
+        ]
+
+        try:
+            result = await llm.ainvoke(messages)
+        except Exception as e:
+            # Put the turns back so the next compaction can retry them
+            self.evicted_messages = deque(
+                evicted + list(self.evicted_messages),
+                maxlen=Config.CHAT_SUMMARY_MAX_PENDING_MESSAGES,
+            )
+            logger.warning(f"Failed to summarize chat history: {str(e)}")
+            return
 
+        self.summary = result.content.strip()[: Config.CHAT_SUMMARY_MAX_CHARS]
+        self._rendered_history = None
+        logger.debug(f"Summarized {len(evicted)} evicted messages")
 
-# Create an instance to act as a singleton store
-chat_manager_instance = ChatManager()
+    def schedule_compaction(self, llm) -> None:
+        """Summarize evicted turns in the background, one compaction at a time"""
+        if not self.evicted_messages:
+            return
+        if self._compaction_task and not self._compaction_task.done():
+            return
+        self._compaction_task = asyncio.create_task(self.compact(llm))
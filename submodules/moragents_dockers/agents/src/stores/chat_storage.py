@@ -0,0 +1,175 @@
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A stored message paired with its storage id, which doubles as the paging cursor
+StoredMessage = Tuple[int, Dict[str, str]]
+
+
+class ChatStorage(ABC):
+    """Append-only persistence backend for chat history."""
+
+    @abstractmethod
+    def append(self, session_id: str, message: Dict[str, str]) -> None:
+        """Persist a message for a session."""
+
+    @abstractmethod
+    def clear(self, session_id: str) -> None:
+        """Delete all messages for a session."""
+
+    @abstractmethod
+    def load_page(
+        self, session_id: str, before: Optional[int] = None, limit: int = 50
+    ) -> List[StoredMessage]:
+        """
+        Load a page of messages, oldest first.
+
+        Args:
+            session_id (str): Session identifier
+            before (Optional[int]): Only return messages with an id lower than this cursor
+            limit (int): Maximum number of messages to return
+
+        Returns:
+            List[StoredMessage]: The newest messages before the cursor, in chronological order
+        """
+
+    def flush(self) -> None:
+        """Block until all pending writes are persisted."""
+
+    def close(self) -> None:
+        """Persist pending writes and release resources."""
+
+
+class SQLiteChatStorage(ChatStorage):
+    """
+    SQLite chat history with writes batched on a background thread.
+
+    Appends and clears are queued in order and committed in batches by a single writer
+    thread, so request handlers never wait on disk I/O.
+
+    Attributes:
+        db_path (str): Path to the SQLite database file
+        batch_size (int): Maximum number of operations committed per transaction
+    """
+
+    def __init__(self, db_path: str, batch_size: int = 100) -> None:
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[Optional[Tuple]]" = queue.Queue()
+        self._read_lock = threading.Lock()
+
+        connection = self._connect()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS messages ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "session_id TEXT NOT NULL, "
+            "created_at REAL NOT NULL, "
+            "message TEXT NOT NULL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_messages_session ON messages (session_id, id)"
+        )
+        connection.commit()
+        self._reader = connection
+
+        self._writer = threading.Thread(target=self._write_loop, name="chat-storage", daemon=True)
+        self._writer.start()
+        logger.info(f"Chat history stored in {db_path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, check_same_thread=False)
+
+    def append(self, session_id: str, message: Dict[str, str]) -> None:
+        self._queue.put(("append", session_id, time.time(), json.dumps(message, default=str)))
+
+    def clear(self, session_id: str) -> None:
+        self._queue.put(("clear", session_id))
+
+    def _write_loop(self) -> None:
+        connection = self._connect()
+        while True:
+            batch = self._next_batch()
+            try:
+                with connection:
+                    self._apply(connection, batch)
+            except sqlite3.Error as e:
+                logger.error(f"Failed to persist {len(batch)} chat operations: {str(e)}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+            if None in batch:
+                connection.close()
+                return
+
+    def _next_batch(self) -> List[Optional[Tuple]]:
+        """Wait for the next operation, then take whatever else is queued, up to batch_size"""
+        batch = [self._queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    @staticmethod
+    def _apply(connection: sqlite3.Connection, batch: List[Optional[Tuple]]) -> None:
+        for operation in batch:
+            if operation is None:
+                continue
+            if operation[0] == "append":
+                connection.execute(
+                    "INSERT INTO messages (session_id, created_at, message) VALUES (?, ?, ?)",
+                    operation[1:],
+                )
+            else:
+                connection.execute("DELETE FROM messages WHERE session_id = ?", (operation[1],))
+
+    def flush(self) -> None:
+        self._queue.join()
+
+    def load_page(
+        self, session_id: str, before: Optional[int] = None, limit: int = 50
+    ) -> List[StoredMessage]:
+        # Make messages queued by this process visible to the read
+        self.flush()
+        with self._read_lock:
+            rows = self._reader.execute(
+                "SELECT id, message FROM messages WHERE session_id = ? AND id < ? "
+                "ORDER BY id DESC LIMIT ?",
+                (session_id, before if before is not None else 2**63 - 1, limit),
+            ).fetchall()
+        return [(row_id, json.loads(message)) for row_id, message in reversed(rows)]
+
+    def close(self) -> None:
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        with self._read_lock:
+            self._reader.close()
+
+
+def create_chat_storage(backend: Optional[str], path: str) -> Optional[ChatStorage]:
+    """
+    Create the configured chat storage backend.
+
+    Args:
+        backend (Optional[str]): "sqlite", or None to keep history in memory only
+        path (str): Location of the backend's data
+
+    Returns:
+        Optional[ChatStorage]: Storage backend, or None for in-memory history
+    """
+    if not backend:
+        return None
+    if backend == "sqlite":
+        return SQLiteChatStorage(path)
+    raise ValueError(f"Unknown chat storage backend: {backend}")
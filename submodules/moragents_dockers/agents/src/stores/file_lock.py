@@ -0,0 +1,97 @@
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock; run a single worker there
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class FileLock:
+    """
+    Advisory lock on a file, shared by every process using the same path.
+
+    The lock is tied to an open file descriptor, so the kernel releases it when the holding
+    process exits or crashes. Held for the life of a process it acts as a lease that can't
+    outlive its owner, which makes it suitable for electing a single leader among workers.
+
+    Threads of the same process exclude each other through an in-process lock taken before
+    the file lock. The lock is not reentrant: acquiring it again while it is held waits for
+    the holder, as in any other process. It may be released from a different thread than the
+    one that acquired it, so async code can acquire it in a worker thread.
+
+    Attributes:
+        path (Path): Lock file location
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+        self._thread_lock = threading.Lock()
+
+    @property
+    def is_held(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """
+        Acquire the lock.
+
+        Args:
+            blocking (bool): Wait for the current holder to release it
+
+        Returns:
+            bool: True if the lock was acquired, False if it is held elsewhere and
+                blocking is False
+        """
+        if not self._thread_lock.acquire(blocking):
+            return False
+        try:
+            fd = self._lock_file(blocking)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        if fd is None:
+            self._thread_lock.release()
+            return False
+        self._fd = fd
+        return True
+
+    def _lock_file(self, blocking: bool) -> Optional[int]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                os.close(fd)
+                return None
+
+        # Record the holder to make it easy to see which worker owns the lock
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        return fd
+
+    def release(self) -> None:
+        """Release the lock if it is held"""
+        if self._fd is None:
+            return
+        fd, self._fd = self._fd, None
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+        finally:
+            self._thread_lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
@@ -0,0 +1,197 @@
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from src.config import Config
+from src.stores.chat_manager import ChatManager
+from src.stores.chat_storage import ChatStorage, create_chat_storage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Session:
+    """
+    State scoped to a single user conversation.
+
+    Attributes:
+        session_id (str): Unique session identifier
+        chat_manager (ChatManager): Chat history and upload status for this session
+        active_agent (Optional[str]): Agent handling a multi-turn exchange, if any
+        attempted_agents (Set[str]): Agents already tried for the current prompt
+        agent_state (Dict[str, Dict[str, Any]]): Per-agent scratch state, keyed by agent name
+        last_accessed (float): Monotonic time of the last lookup
+    """
+
+    session_id: str
+    chat_manager: ChatManager = field(default_factory=ChatManager)
+    active_agent: Optional[str] = None
+    attempted_agents: Set[str] = field(default_factory=set)
+    agent_state: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    last_accessed: float = field(default_factory=time.monotonic)
+
+    def get_agent_state(self, agent_name: str) -> Dict[str, Any]:
+        """
+        Get the scratch state an agent keeps for this session.
+
+        Args:
+            agent_name (str): Name of the agent
+
+        Returns:
+            Dict[str, Any]: Mutable state dict, created on first use
+        """
+        return self.agent_state.setdefault(agent_name, {})
+
+
+class SessionManager:
+    """
+    Keeps per-session state in memory with bounded size and idle eviction.
+
+    Attributes:
+        max_sessions (int): Maximum number of sessions kept in memory
+        idle_timeout_seconds (float): Sessions idle for longer than this are evicted
+        sessions (OrderedDict[str, Session]): Sessions ordered from least to most recently used
+        storage (Optional[ChatStorage]): Backend persisting chat history across evictions
+        expiry_listeners (List[Callable[[str], None]]): Callbacks run with the id of each
+            evicted or deleted session
+    """
+
+    def __init__(
+        self,
+        max_sessions: int,
+        idle_timeout_seconds: float,
+        storage: Optional[ChatStorage] = None,
+    ) -> None:
+        """
+        Initialize the SessionManager.
+
+        Args:
+            max_sessions (int): Maximum number of sessions kept in memory
+            idle_timeout_seconds (float): Idle time after which a session is evicted
+            storage (Optional[ChatStorage]): Chat history backend, None to keep it in memory
+        """
+        self.max_sessions = max_sessions
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.storage = storage
+        self.sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self.expiry_listeners: List[Callable[[str], None]] = []
+
+    def get_session(self, session_id: Optional[str] = None) -> Session:
+        """
+        Get a session by id, creating it if it doesn't exist.
+
+        Args:
+            session_id (Optional[str]): Session identifier, defaults to the shared session
+
+        Returns:
+            Session: The session for this id
+        """
+        session_id = session_id or Config.DEFAULT_SESSION_ID
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = Session(
+                session_id=session_id, chat_manager=ChatManager(session_id, self.storage)
+            )
+            self.sessions[session_id] = session
+            logger.info(f"Created session: {session_id}")
+        else:
+            self.sessions.move_to_end(session_id)
+
+        session.last_accessed = time.monotonic()
+        self._evict_sessions()
+        return session
+
+    async def aget_session(self, session_id: Optional[str] = None) -> Session:
+        """
+        Get a session by id, reloading a resumed session's history off the event loop.
+
+        Args:
+            session_id (Optional[str]): Session identifier, defaults to the shared session
+
+        Returns:
+            Session: The session for this id, with its chat history loaded
+        """
+        session = self.get_session(session_id)
+        await session.chat_manager.aload()
+        return session
+
+    def delete_session(self, session_id: str) -> bool:
+        """
+        Delete a session and all of its state, including persisted history.
+
+        Args:
+            session_id (str): Session identifier
+
+        Returns:
+            bool: True if the session existed, False otherwise
+        """
+        if self.storage:
+            self.storage.clear(session_id)
+        if self.sessions.pop(session_id, None) is None:
+            return False
+        logger.info(f"Deleted session: {session_id}")
+        self._notify_expired(session_id)
+        return True
+
+    def list_sessions(self) -> List[str]:
+        """
+        Get the ids of all sessions in memory.
+
+        Returns:
+            List[str]: Session ids, least recently used first
+        """
+        return list(self.sessions.keys())
+
+    def _evict_sessions(self) -> None:
+        """Drop idle sessions and the least recently used ones beyond max_sessions"""
+        now = time.monotonic()
+        while self.sessions:
+            session_id, session = next(iter(self.sessions.items()))
+            idle = now - session.last_accessed > self.idle_timeout_seconds
+            if not idle and len(self.sessions) <= self.max_sessions:
+                break
+            del self.sessions[session_id]
+            logger.info(f"Evicted session: {session_id}")
+            self._notify_expired(session_id)
+
+    def add_expiry_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        Register a callback to run whenever a session is evicted or deleted.
+
+        Args:
+            listener (Callable[[str], None]): Callback taking the expired session's id
+        """
+        self.expiry_listeners.append(listener)
+
+    def _notify_expired(self, session_id: str) -> None:
+        for listener in self.expiry_listeners:
+            try:
+                listener(session_id)
+            except Exception as e:
+                logger.error(f"Session expiry listener failed for {session_id}: {str(e)}")
+
+    def open_storage(self, backend: Optional[str], path: str) -> None:
+        """
+        Start persisting chat history, for sessions created from now on.
+
+        Called from the app's startup hook rather than at import, so importing the app
+        (e.g. from tests) doesn't create a database or start a writer thread.
+
+        Args:
+            backend (Optional[str]): "sqlite", or None to keep history in memory only
+            path (str): Location of the backend's data
+        """
+        if self.storage is None:
+            self.storage = create_chat_storage(backend, path)
+
+    def close(self) -> None:
+        """Persist pending chat history writes."""
+        if self.storage:
+            self.storage.close()
+            self.storage = None
+
+
+# Create an instance to act as a singleton store
+session_manager_instance = SessionManager(Config.MAX_SESSIONS, Config.SESSION_IDLE_TIMEOUT_SECONDS)
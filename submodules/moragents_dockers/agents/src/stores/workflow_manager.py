@@ -1,16 +1,44 @@
 import json
+import heapq
+import itertools
 import logging
-from typing import Dict, Optional, List, Any
+import os
+import random
+import time
+import uuid
+from typing import Dict, Optional, List, Any, Tuple, Type
 from pathlib import Path
 import asyncio
-import aiofiles
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
+from src.agents.base_agent.tools import TradeSubmittedError
 from src.agents.dca_agent.tools import DCAActionHandler
+from src.stores.file_lock import FileLock
+from src.stores.workflow_run_history import WorkflowRun, WorkflowRunHistory
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on a single scheduler sleep, so wall-clock adjustments are picked up
+MAX_SCHEDULER_SLEEP_SECONDS = 3600
+
+# Number of workflows that may execute at the same time across all wallets
+MAX_CONCURRENT_EXECUTIONS = 8
+
+# Journal entries appended before they are folded into a fresh snapshot
+JOURNAL_COMPACTION_THRESHOLD = 1000
+
+# Gap between overdue runs replayed after downtime, and the most missed runs replayed per workflow
+CATCH_UP_SPACING_SECONDS = 5
+MAX_CATCH_UP_RUNS = 10
+
+# How often workers refresh workflows written by other workers and retry for leadership
+LEADER_POLL_SECONDS = 5
+
+# How long shutdown waits for in-flight executions before giving up the scheduler lease
+SHUTDOWN_TIMEOUT_SECONDS = 30
+
 
 class WorkflowStatus(str, Enum):
     """Status states for workflows"""
@@ -22,6 +50,33 @@ class WorkflowStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+class CatchUpPolicy(str, Enum):
+    """What to do on startup with runs that were missed while the service was down"""
+
+    SKIP = "skip"  # Drop missed runs and resume at the next regular slot
+    RUN_ONCE = "run_once"  # Run once for all missed slots, then resume the interval
+    RUN_ALL = "run_all"  # Replay each missed slot, up to MAX_CATCH_UP_RUNS, spaced apart
+
+
+@dataclass
+class RetryPolicy:
+    """How a failed workflow action is retried"""
+
+    max_attempts: int = 1
+    base_delay_seconds: float = 1.0
+    max_delay_seconds: float = 60.0
+    # Errors that will fail the same way on every attempt, such as validation errors
+    non_retryable: Tuple[Type[Exception], ...] = (ValueError,)
+
+    def should_retry(self, error: Exception, attempt: int) -> bool:
+        """Whether to make another attempt after `attempt` attempts have failed"""
+        return attempt < self.max_attempts and not isinstance(error, self.non_retryable)
+
+    def get_delay(self, retry: int) -> float:
+        """Exponential backoff with full jitter, so workflows failing together retry apart"""
+        return random.uniform(0, min(self.max_delay_seconds, self.base_delay_seconds * 2**retry))
+
+
 @dataclass
 class Workflow:
     """Represents a scheduled recurring action workflow"""
@@ -38,6 +93,7 @@ class Workflow:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     metadata: Dict = field(default_factory=dict)
+    pending_catch_up_runs: int = 0  # Missed runs still to replay under CatchUpPolicy.RUN_ALL
 
     def to_dict(self) -> dict:
         """Convert workflow to dictionary format"""
@@ -54,6 +110,7 @@ class Workflow:
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
             "metadata": self.metadata,
+            "pending_catch_up_runs": self.pending_catch_up_runs,
         }
 
     @classmethod
@@ -70,6 +127,7 @@ class Workflow:
             created_at=datetime.fromisoformat(data["created_at"]),
             updated_at=datetime.fromisoformat(data["updated_at"]),
             metadata=data.get("metadata", {}),
+            pending_catch_up_runs=data.get("pending_catch_up_runs", 0),
         )
         if data.get("last_run"):
             workflow.last_run = datetime.fromisoformat(data["last_run"])
@@ -79,109 +137,393 @@ class Workflow:
 
 
 class WorkflowManager:
-    """Manages workflow persistence and operations"""
+    """
+    Manages workflow persistence and operations.
+
+    Workflows are persisted as a JSON snapshot plus an append-only journal of mutations
+    (one JSON object per line). Each change appends a single journal line; once the journal
+    grows past JOURNAL_COMPACTION_THRESHOLD entries it is folded into a new snapshot that is
+    written to a temporary file and atomically renamed over the old one.
+
+    Several worker processes may share the same storage. Only the worker holding the leader
+    lease (a file lock released by the kernel if the worker dies) runs the scheduler and
+    compacts the journal; the others serve reads and writes, tail the journal for changes
+    made elsewhere, and take over the lease when the leader goes away.
+    """
 
-    def __init__(self, storage_path: str = "workflows.json"):
+    def __init__(
+        self,
+        storage_path: str = "workflows.json",
+        max_concurrent_executions: int = MAX_CONCURRENT_EXECUTIONS,
+        catch_up_policy: CatchUpPolicy = CatchUpPolicy.RUN_ONCE,
+    ):
         """Initialize the WorkflowManager"""
         self.storage_path = Path(storage_path)
+        self.journal_path = self.storage_path.with_suffix(".journal")
         self.workflows: Dict[str, Workflow] = {}
+        self.catch_up_policy = catch_up_policy
+        self.is_leader = False
         self._lock = asyncio.Lock()
+        self._save_lock = asyncio.Lock()
+        self._journal_entries = 0
+
+        # Journal entries are tagged with this worker's id so it can skip its own when tailing
+        self._instance_id = uuid.uuid4().hex
+        self._journal_offset = 0
+        self._snapshot_id: Optional[Tuple[int, int]] = None
+        self._storage_lock = FileLock(str(self.storage_path.with_suffix(".lock")))
+        self._leader_lease = FileLock(str(self.storage_path.with_suffix(".leader")))
+        self._follower_task: Optional[asyncio.Task] = None
+        self.run_history = WorkflowRunHistory(
+            str(self.storage_path.with_name(f"{self.storage_path.stem}_runs"))
+        )
+
+        # Due workflows run as tasks bounded by a semaphore; actions on the same wallet are
+        # serialized so concurrent trades can't race on nonces or balances
+        self._execution_slots = asyncio.Semaphore(max_concurrent_executions)
+        self._wallet_locks: Dict[str, asyncio.Lock] = {}
+        self._wallet_lock_users: Dict[str, int] = {}
+        self._running: Dict[str, asyncio.Task] = {}
         self._scheduler_task: Optional[asyncio.Task] = None
         self._action_handlers: Dict[str, Any] = {}
+        self._retry_policies: Dict[str, RetryPolicy] = {}
+
+        # Min-heap of (next_run, seq, workflow_id). Entries are never removed in place;
+        # an entry is live only while its seq matches _scheduled_seq for the workflow.
+        self._schedule: List[Tuple[datetime, int, str]] = []
+        self._scheduled_seq: Dict[str, int] = {}
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+
+        # Register DCA action handler by default. Only failures before a swap is submitted are
+        # retried; once it may be on chain, retrying could trade twice
+        self.register_action_handler(
+            "dca_trade",
+            DCAActionHandler(),
+            RetryPolicy(
+                max_attempts=3,
+                base_delay_seconds=2.0,
+                non_retryable=(ValueError, TradeSubmittedError),
+            ),
+        )
 
-        # Register DCA action handler by default
-        self.register_action_handler("dca_trade", DCAActionHandler())
-
-    def register_action_handler(self, action_name: str, handler: Any) -> None:
-        """Register a handler for a workflow action"""
+    def register_action_handler(
+        self, action_name: str, handler: Any, retry_policy: Optional[RetryPolicy] = None
+    ) -> None:
+        """Register a handler for a workflow action, optionally retrying failed attempts"""
         self._action_handlers[action_name] = handler
+        self._retry_policies[action_name] = retry_policy or RetryPolicy()
 
     async def initialize(self) -> None:
-        """Initialize storage and load existing workflows"""
+        """Load existing workflows and start the scheduler if this worker wins the lease"""
         try:
-            if not self.storage_path.exists():
-                await self._save_workflows({})
-            await self._load_workflows()
-            self._scheduler_task = asyncio.create_task(self._scheduler_loop())
+            await self._locked_load_workflows()
+            if self._leader_lease.acquire(blocking=False):
+                await self._become_leader()
+            else:
+                logger.info("Another worker is running the workflow scheduler")
+                self._follower_task = asyncio.create_task(self._follower_loop())
             logger.info("Workflow manager initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize workflow manager: {e}")
             raise
 
+    async def _become_leader(self) -> None:
+        """Take over scheduling after acquiring the leader lease"""
+        self.is_leader = True
+        await self._refresh_workflows()
+        self._apply_catch_up_policy(datetime.now())
+        await self._compact()
+        self._rebuild_schedule()
+        self._scheduler_task = asyncio.create_task(self._scheduler_loop())
+        logger.info(f"Workflow scheduler running in worker {os.getpid()}")
+
+    async def _follower_loop(self) -> None:
+        """Follow changes made by other workers until the leader lease becomes free"""
+        while True:
+            await asyncio.sleep(LEADER_POLL_SECONDS)
+            try:
+                await self._refresh_workflows()
+                if self._leader_lease.acquire(blocking=False):
+                    await self._become_leader()
+                    return
+            except Exception as e:
+                logger.error(f"Error following workflow changes: {e}")
+
+    async def close(self) -> None:
+        """Stop scheduling, let in-flight executions finish, and release the leader lease"""
+        for task in (self._scheduler_task, self._follower_task):
+            if task:
+                task.cancel()
+        if self._running:
+            # Releasing the lease mid-trade would let another worker run the same workflow
+            await asyncio.wait(list(self._running.values()), timeout=SHUTDOWN_TIMEOUT_SECONDS)
+        self._leader_lease.release()
+        self.is_leader = False
+
+    def _apply_catch_up_policy(self, now: datetime) -> None:
+        """Reschedule workflows whose runs were missed while the service was down"""
+        overdue = sorted(
+            (
+                workflow
+                for workflow in self.workflows.values()
+                if workflow.status == WorkflowStatus.ACTIVE
+                and workflow.next_run
+                and workflow.next_run <= now
+            ),
+            key=lambda workflow: workflow.next_run,
+        )
+        for index, workflow in enumerate(overdue):
+            missed = 1
+            if workflow.interval.total_seconds() > 0:
+                missed += int((now - workflow.next_run) / workflow.interval)
+
+            if self.catch_up_policy == CatchUpPolicy.SKIP:
+                workflow.next_run += workflow.interval * missed
+            else:
+                if self.catch_up_policy == CatchUpPolicy.RUN_ALL:
+                    workflow.pending_catch_up_runs = min(missed, MAX_CATCH_UP_RUNS) - 1
+                # Stagger overdue workflows so a restart doesn't fire every swap at once
+                workflow.next_run = now + timedelta(seconds=index * CATCH_UP_SPACING_SECONDS)
+
+            logger.info(
+                f"Workflow {workflow.id} missed {missed} runs, "
+                f"applying {self.catch_up_policy.value} catch-up policy"
+            )
+
+    def _schedule_workflow(self, workflow: Workflow) -> None:
+        """Add or move a workflow in the schedule and wake the scheduler"""
+        if workflow.status != WorkflowStatus.ACTIVE or not workflow.next_run:
+            self._unschedule_workflow(workflow.id)
+            return
+
+        seq = next(self._seq)
+        self._scheduled_seq[workflow.id] = seq
+        heapq.heappush(self._schedule, (workflow.next_run, seq, workflow.id))
+        self._wakeup.set()
+
+        # Superseded entries are skipped lazily; rebuild once they dominate the heap
+        if len(self._schedule) > 2 * len(self._scheduled_seq) + 64:
+            self._rebuild_schedule()
+
+    def _unschedule_workflow(self, workflow_id: str) -> None:
+        """Remove a workflow from the schedule"""
+        if self._scheduled_seq.pop(workflow_id, None) is not None:
+            self._wakeup.set()
+
+    def _rebuild_schedule(self) -> None:
+        """Rebuild the schedule heap from the current workflows"""
+        self._scheduled_seq = {}
+        self._schedule = []
+        for workflow in self.workflows.values():
+            if workflow.status == WorkflowStatus.ACTIVE and workflow.next_run:
+                seq = next(self._seq)
+                self._scheduled_seq[workflow.id] = seq
+                self._schedule.append((workflow.next_run, seq, workflow.id))
+        heapq.heapify(self._schedule)
+        self._wakeup.set()
+
+    def _pop_due_workflows(self, now: datetime) -> List[Workflow]:
+        """Pop every live schedule entry that is due"""
+        due = []
+        while self._schedule and self._schedule[0][0] <= now:
+            _, seq, workflow_id = heapq.heappop(self._schedule)
+            if self._scheduled_seq.get(workflow_id) != seq:
+                continue
+            del self._scheduled_seq[workflow_id]
+            workflow = self.workflows.get(workflow_id)
+            if workflow and workflow.status == WorkflowStatus.ACTIVE:
+                due.append(workflow)
+        return due
+
+    def _seconds_until_next_run(self, now: datetime) -> Optional[float]:
+        """Seconds until the earliest live entry, or None if nothing is scheduled"""
+        while self._schedule:
+            _, seq, workflow_id = self._schedule[0]
+            if self._scheduled_seq.get(workflow_id) == seq:
+                break
+            heapq.heappop(self._schedule)
+        if not self._schedule:
+            return None
+        delay = (self._schedule[0][0] - now).total_seconds()
+        return min(max(delay, 0.0), MAX_SCHEDULER_SLEEP_SECONDS)
+
     async def _scheduler_loop(self) -> None:
-        """Main scheduler loop that checks and executes due workflows"""
+        """Main scheduler loop that sleeps until the next workflow is due"""
         while True:
             try:
-                logger.info("Workflow scheduler checking for due workflows...")
-                now = datetime.now()
-                active_workflows = [
-                    w for w in self.workflows.values() if w.status == WorkflowStatus.ACTIVE
-                ]
-                logger.info(f"Found {len(active_workflows)} active workflows")
-
-                for workflow in self.workflows.values():
-                    logger.info(f"Checking workflow {workflow.id} ({workflow.name})")
-                    if (
-                        workflow.status == WorkflowStatus.ACTIVE
-                        and workflow.next_run
-                        and now >= workflow.next_run
-                    ):
-                        logger.info(f"Executing workflow {workflow.id} ({workflow.name})")
-                        await self._execute_workflow(workflow)
-
-                # Sleep for a short interval before next check
-                await asyncio.sleep(60)  # Check every minute
+                # Changes made while executing set the event again, so nothing is missed
+                self._wakeup.clear()
+                for workflow_id in await self._refresh_workflows():
+                    if workflow_id in self.workflows:
+                        self._schedule_workflow(self.workflows[workflow_id])
+                    else:
+                        self._unschedule_workflow(workflow_id)
+
+                for workflow in self._pop_due_workflows(datetime.now()):
+                    self._dispatch_workflow(workflow)
+
+                # Wake up regularly to pick up workflows created through other workers
+                timeout = self._seconds_until_next_run(datetime.now())
+                if timeout is None or timeout > LEADER_POLL_SECONDS:
+                    timeout = LEADER_POLL_SECONDS
+                logger.debug(f"Workflow scheduler sleeping for {timeout}s")
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
 
             except Exception as e:
                 logger.error(f"Error in scheduler loop: {e}")
                 await asyncio.sleep(30)  # Wait longer on error
 
+    def _dispatch_workflow(self, workflow: Workflow) -> None:
+        """Start executing a due workflow in the background"""
+        if workflow.id in self._running:
+            logger.warning(f"Workflow {workflow.id} is still running, skipping this run")
+            return
+
+        task = asyncio.create_task(self._run_workflow(workflow))
+        self._running[workflow.id] = task
+        task.add_done_callback(lambda _: self._running.pop(workflow.id, None))
+
+    async def _run_workflow(self, workflow: Workflow) -> None:
+        """Execute a workflow once its wallet is free and an execution slot is available"""
+        # Take the wallet lock first so workflows queued behind a busy wallet don't hold slots
+        async with self._wallet_lock(workflow.params.get("wallet_id") or workflow.id):
+            async with self._execution_slots:
+                logger.info(f"Executing workflow {workflow.id} ({workflow.name})")
+                await self._execute_workflow(workflow)
+
+    @asynccontextmanager
+    async def _wallet_lock(self, wallet_id: str):
+        """Serialize actions per wallet, dropping the lock once nobody is using it"""
+        lock = self._wallet_locks.setdefault(wallet_id, asyncio.Lock())
+        self._wallet_lock_users[wallet_id] = self._wallet_lock_users.get(wallet_id, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._wallet_lock_users[wallet_id] -= 1
+            if not self._wallet_lock_users[wallet_id]:
+                del self._wallet_lock_users[wallet_id]
+                del self._wallet_locks[wallet_id]
+
     async def _execute_workflow(self, workflow: Workflow) -> None:
         """Execute a single workflow action"""
+        scheduled_for = workflow.next_run
+        started_at = datetime.now()
+        started = time.perf_counter()
+        retries = 0
         try:
             if workflow.action not in self._action_handlers:
                 raise ValueError(f"No handler registered for action: {workflow.action}")
 
             handler = self._action_handlers[workflow.action]
-            await handler.execute(workflow.params)
-
-            # Update workflow timing
-            workflow.last_run = datetime.now()
-            workflow.next_run = workflow.last_run + workflow.interval
-            workflow.updated_at = datetime.now()
-
-            # Check if we should keep or remove the workflow
-            should_remove = False
-
-            # Check if total investment amount is reached (for DCA workflows)
-            if workflow.action == "dca_trade" and "total_investment_amount" in workflow.params:
-                total_invested = workflow.params.get("total_invested", 0)
-                total_target = float(workflow.params["total_investment_amount"])
-                step_size = float(workflow.params["step_size"])
-
-                # Update total invested amount
-                total_invested += step_size
-                workflow.params["total_invested"] = total_invested
-
-                # Check if we've reached the target
-                if total_invested >= total_target:
-                    workflow.status = WorkflowStatus.COMPLETED
-                    should_remove = True
-                    logger.info(
-                        f"Workflow {workflow.id} completed - reached total investment target"
+            retry_policy = self._retry_policies[workflow.action]
+            while True:
+                try:
+                    result = await handler.execute(workflow.params)
+                    break
+                except Exception as e:
+                    if not retry_policy.should_retry(e, retries + 1):
+                        raise
+                    delay = retry_policy.get_delay(retries)
+                    retries += 1
+                    logger.warning(
+                        f"Workflow {workflow.id} attempt {retries} failed: {e}, "
+                        f"retrying in {delay:.1f}s"
                     )
+                    await asyncio.sleep(delay)
 
-            # Remove completed/failed workflows, keep active ones
-            if should_remove:
-                del self.workflows[workflow.id]
-
-            await self._save_workflows(self._workflows_to_dict())
+            await self._record_run(
+                workflow, scheduled_for, started_at, started, retries, result=result
+            )
+            await self._reschedule(workflow)
             logger.info(f"Successfully executed workflow {workflow.id}")
 
         except Exception as e:
             logger.error(f"Failed to execute workflow {workflow.id}: {e}")
+            await self._record_run(workflow, scheduled_for, started_at, started, retries, error=e)
             workflow.status = WorkflowStatus.FAILED
-            await self._save_workflows(self._workflows_to_dict())
+            if workflow.id in self.workflows:
+                await self._record_upsert(workflow)
+
+    async def _reschedule(self, workflow: Workflow) -> None:
+        """Schedule the next run after a successful execution, or remove a completed workflow"""
+        workflow.last_run = datetime.now()
+        if workflow.pending_catch_up_runs > 0:
+            workflow.pending_catch_up_runs -= 1
+            workflow.next_run = workflow.last_run + timedelta(seconds=CATCH_UP_SPACING_SECONDS)
+        else:
+            workflow.next_run = workflow.last_run + workflow.interval
+        workflow.updated_at = datetime.now()
+
+        # Remove completed/failed workflows, keep active ones
+        if self._reached_investment_target(workflow):
+            del self.workflows[workflow.id]
+            await self._record_delete(workflow.id)
+        elif workflow.id in self.workflows:
+            self._schedule_workflow(workflow)
+            await self._record_upsert(workflow)
+
+    @staticmethod
+    def _reached_investment_target(workflow: Workflow) -> bool:
+        """Add a DCA step to the amount invested, completing the workflow at its target"""
+        if workflow.action != "dca_trade" or "total_investment_amount" not in workflow.params:
+            return False
+
+        total_invested = workflow.params.get("total_invested", 0)
+        total_target = float(workflow.params["total_investment_amount"])
+        step_size = float(workflow.params["step_size"])
+
+        # Update total invested amount
+        total_invested += step_size
+        workflow.params["total_invested"] = total_invested
+
+        # Check if we've reached the target
+        if total_invested < total_target:
+            return False
+        workflow.status = WorkflowStatus.COMPLETED
+        logger.info(f"Workflow {workflow.id} completed - reached total investment target")
+        return True
+
+    async def _record_run(
+        self,
+        workflow: Workflow,
+        scheduled_for: Optional[datetime],
+        started_at: datetime,
+        started: float,
+        retries: int,
+        result: Any = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        """Add an execution to the workflow's run history"""
+        run = WorkflowRun(
+            workflow_id=workflow.id,
+            scheduled_for=scheduled_for.isoformat() if scheduled_for else None,
+            started_at=started_at.isoformat(),
+            lag_seconds=(
+                max((started_at - scheduled_for).total_seconds(), 0.0) if scheduled_for else 0.0
+            ),
+            duration_seconds=time.perf_counter() - started,
+            outcome="failed" if error else "success",
+            retries=retries,
+            error=str(error) if error else None,
+            tx_hash=result.get("transaction_hash") if isinstance(result, dict) else None,
+        )
+        try:
+            await asyncio.to_thread(self.run_history.record, run)
+        except Exception as e:
+            logger.warning(f"Failed to record run of workflow {workflow.id}: {e}")
+
+    async def get_workflow_runs(
+        self, workflow_id: str, limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Get recent runs of a workflow along with lag and latency statistics"""
+        runs = await asyncio.to_thread(self.run_history.get_runs, workflow_id, limit)
+        stats = await asyncio.to_thread(self.run_history.get_stats, workflow_id)
+        return {"runs": runs, "stats": stats}
 
     async def create_workflow(
         self,
@@ -209,7 +551,8 @@ class WorkflowManager:
 
             async with self._lock:
                 self.workflows[workflow_id] = workflow
-                await self._save_workflows(self._workflows_to_dict())
+                self._schedule_workflow(workflow)
+                await self._record_upsert(workflow)
 
             logger.info(f"Created new workflow: {workflow_id}")
             return workflow
@@ -220,6 +563,8 @@ class WorkflowManager:
 
     async def get_workflow(self, workflow_id: str) -> Optional[Workflow]:
         """Get workflow by ID"""
+        if not self.is_leader:
+            await self._refresh_workflows()
         return self.workflows.get(workflow_id)
 
     async def update_workflow(self, workflow_id: str, **updates) -> Optional[Workflow]:
@@ -237,7 +582,8 @@ class WorkflowManager:
             workflow.updated_at = datetime.now()
 
             async with self._lock:
-                await self._save_workflows(self._workflows_to_dict())
+                self._schedule_workflow(workflow)
+                await self._record_upsert(workflow)
 
             logger.info(f"Updated workflow: {workflow_id}")
             return workflow
@@ -254,7 +600,9 @@ class WorkflowManager:
 
             async with self._lock:
                 del self.workflows[workflow_id]
-                await self._save_workflows(self._workflows_to_dict())
+                self._unschedule_workflow(workflow_id)
+                await self._record_delete(workflow_id)
+            await asyncio.to_thread(self.run_history.delete, workflow_id)
 
             logger.info(f"Deleted workflow: {workflow_id}")
             return True
@@ -265,35 +613,178 @@ class WorkflowManager:
 
     async def list_workflows(self) -> List[Workflow]:
         """Get list of all workflows"""
+        if not self.is_leader:
+            await self._refresh_workflows()
         return list(self.workflows.values())
 
     def _workflows_to_dict(self) -> Dict:
         """Convert workflows to dictionary format for storage"""
         return {workflow_id: workflow.to_dict() for workflow_id, workflow in self.workflows.items()}
 
-    async def _save_workflows(self, data: Dict) -> None:
-        """Save workflows to storage file"""
+    async def _record_upsert(self, workflow: Workflow) -> None:
+        """Journal the current state of a workflow"""
+        await self._append_journal({"op": "upsert", "workflow": workflow.to_dict()})
+
+    async def _record_delete(self, workflow_id: str) -> None:
+        """Journal the removal of a workflow"""
+        await self._append_journal({"op": "delete", "id": workflow_id})
+
+    async def _append_journal(self, entry: Dict) -> None:
+        """Append a mutation to the journal, compacting it once it grows too long"""
+        line = json.dumps({**entry, "instance": self._instance_id}) + "\n"
         try:
-            async with aiofiles.open(self.storage_path, "w") as f:
-                await f.write(json.dumps(data, indent=2))
+            # Workflows execute concurrently, so writes must not interleave
+            async with self._save_lock:
+                await asyncio.to_thread(self._write_journal_line, line)
+                self._journal_entries += 1
         except Exception as e:
-            logger.error(f"Failed to save workflows: {e}")
+            logger.error(f"Failed to journal workflow change: {e}")
             raise
 
-    async def _load_workflows(self) -> None:
-        """Load workflows from storage file"""
+        if self.is_leader and self._journal_entries >= JOURNAL_COMPACTION_THRESHOLD:
+            await self._compact()
+
+    def _write_journal_line(self, line: str) -> None:
+        """Append a line under the storage lock shared with other workers"""
+        with self._storage_lock, open(self.journal_path, "ab+") as f:
+            # Terminate a line torn by a crash so it can't swallow this entry
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+            f.write(line.encode())
+
+    async def _compact(self) -> None:
+        """Fold the journal into a new snapshot and truncate it"""
+        async with self._save_lock:
+            await asyncio.to_thread(self._storage_lock.acquire)
+            try:
+                # Fold in anything other workers journaled since the last refresh
+                for workflow_id in self._apply_entries(self._read_journal()):
+                    if workflow_id in self.workflows:
+                        self._schedule_workflow(self.workflows[workflow_id])
+                    else:
+                        self._unschedule_workflow(workflow_id)
+                await asyncio.to_thread(self._write_snapshot, self._workflows_to_dict())
+                self._snapshot_id = self._file_id(self.storage_path)
+                self._journal_offset = 0
+                self._journal_entries = 0
+            finally:
+                self._storage_lock.release()
+        logger.debug(f"Compacted workflow journal into {self.storage_path}")
+
+    def _write_snapshot(self, data: Dict) -> None:
+        """Atomically replace the snapshot, then start an empty journal"""
+        temp_path = self.storage_path.with_name(self.storage_path.name + ".tmp")
+        with open(temp_path, "w") as f:
+            f.write(json.dumps(data, indent=2))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.storage_path)
+
+        # Replaying a stale journal over the new snapshot is harmless, since entries
+        # are idempotent, so a crash between these two steps loses nothing
+        with open(self.journal_path, "w"):
+            pass
+
+    @staticmethod
+    def _file_id(path: Path) -> Optional[Tuple[int, int]]:
+        """Identify a file version by inode and modification time"""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _load_workflows(self) -> None:
+        """Load the latest snapshot and replay the journal on top of it"""
         try:
-            async with aiofiles.open(self.storage_path, "r") as f:
-                content = await f.read()
-                data = json.loads(content)
-                self.workflows = {
-                    workflow_id: Workflow.from_dict(workflow_data)
-                    for workflow_id, workflow_data in data.items()
-                }
+            self._snapshot_id = self._file_id(self.storage_path)
+            data: Dict[str, Dict] = {}
+            if self._snapshot_id:
+                data = json.loads(self.storage_path.read_text() or "{}")
+            self.workflows = {
+                workflow_id: Workflow.from_dict(workflow_data)
+                for workflow_id, workflow_data in data.items()
+            }
+
+            self._journal_offset = 0
+            for entry in self._read_journal():
+                self._apply_journal_entry(entry)
         except Exception as e:
             logger.error(f"Failed to load workflows: {e}")
             raise
 
+    async def _locked_load_workflows(self) -> None:
+        """Load workflows under the storage lock, waiting for it off the event loop"""
+        await asyncio.to_thread(self._storage_lock.acquire)
+        try:
+            self._load_workflows()
+        finally:
+            self._storage_lock.release()
+
+    async def _refresh_workflows(self) -> List[str]:
+        """
+        Apply changes journaled by other workers since the last read.
+
+        Returns:
+            List[str]: Ids of workflows that were created, updated or deleted
+        """
+        entries = self._read_journal()
+
+        # The snapshot only changes when the leader compacts, which replaces it before
+        # truncating the journal, so checking after the read catches a journal swapped under us
+        if self._file_id(self.storage_path) != self._snapshot_id:
+            previous = set(self.workflows)
+            await self._locked_load_workflows()
+            return list(previous | set(self.workflows))
+
+        return self._apply_entries(entries)
+
+    def _apply_entries(self, entries: List[Dict]) -> List[str]:
+        """Apply journal entries written by other workers, returning the affected ids"""
+        changed = []
+        for entry in entries:
+            if entry.get("instance") != self._instance_id:
+                self._journal_entries += 1
+                changed.append(self._apply_journal_entry(entry))
+        return changed
+
+    def _read_journal(self) -> List[Dict]:
+        """Read the complete journal lines appended since the last read"""
+        if not self.journal_path.exists():
+            return []
+        with open(self.journal_path, "rb") as f:
+            f.seek(self._journal_offset)
+            chunk = f.read()
+
+        # A line without its newline is still being written, or was torn by a crash
+        complete = chunk[: chunk.rfind(b"\n") + 1]
+        self._journal_offset += len(complete)
+
+        entries = []
+        for line in complete.splitlines():
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping corrupt workflow journal line: {line[:80]!r}")
+        return entries
+
+    def _apply_journal_entry(self, entry: Dict) -> str:
+        """Apply a journaled mutation, returning the id of the affected workflow"""
+        if entry["op"] == "delete":
+            self.workflows.pop(entry["id"], None)
+            return entry["id"]
+
+        workflow = Workflow.from_dict(entry["workflow"])
+        existing = self.workflows.get(workflow.id)
+        if existing:
+            # Update in place so executions holding the object see the change
+            existing.__dict__.update(workflow.__dict__)
+        else:
+            self.workflows[workflow.id] = workflow
+        return workflow.id
+
 
 # Create singleton instance
 workflow_manager_instance = WorkflowManager()
@@ -0,0 +1,183 @@
+import json
+import logging
+import os
+import re
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WorkflowRun:
+    """
+    Record of a single workflow execution.
+
+    Attributes:
+        workflow_id (str): Workflow that ran
+        scheduled_for (Optional[str]): ISO time the run was due
+        started_at (str): ISO time the action started
+        lag_seconds (float): Delay between the due time and the start of the action
+        duration_seconds (float): Time spent executing the action
+        outcome (str): "success" or "failed"
+        retries (int): Attempts made after the first one
+        error (Optional[str]): Error message for failed runs
+        tx_hash (Optional[str]): Transaction hash reported by the action, if any
+    """
+
+    workflow_id: str
+    scheduled_for: Optional[str]
+    started_at: str
+    lag_seconds: float
+    duration_seconds: float
+    outcome: str
+    retries: int = 0
+    error: Optional[str] = None
+    tx_hash: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class WorkflowRunHistory:
+    """
+    Keeps the most recent runs of each workflow in a ring buffer backed by a JSON lines file.
+
+    Runs are appended to ``<directory>/<workflow_id>.jsonl``. Once a file holds twice the
+    buffer size it is rewritten with just the buffered runs, so disk usage per workflow stays
+    bounded while appends remain O(1). Workers other than the scheduler leader read the same
+    files, so a buffer is reloaded whenever its file changed since it was last read.
+
+    Attributes:
+        directory (Path): Directory holding one history file per workflow
+        max_runs (int): Number of runs kept per workflow
+    """
+
+    def __init__(self, directory: str, max_runs: int = 100) -> None:
+        self.directory = Path(directory)
+        self.max_runs = max_runs
+        self._runs: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._file_lines: Dict[str, int] = {}
+        self._file_ids: Dict[str, Optional[Tuple[int, int, int]]] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, workflow_id: str) -> Path:
+        # Workflow ids end up in file names, so keep them to a safe character set
+        return self.directory / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', workflow_id)}.jsonl"
+
+    @staticmethod
+    def _file_id(path: Path) -> Optional[Tuple[int, int, int]]:
+        """Identify a file version by inode, modification time and size"""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _load(self, workflow_id: str) -> Deque[Dict[str, Any]]:
+        path = self._path(workflow_id)
+        file_id = self._file_id(path)
+        runs = self._runs.get(workflow_id)
+        if runs is not None and self._file_ids.get(workflow_id) == file_id:
+            return runs
+
+        runs = deque(maxlen=self.max_runs)
+        lines = 0
+        if file_id is not None:
+            with open(path) as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        runs.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping corrupt run history line in {path}")
+        self._runs[workflow_id] = runs
+        self._file_lines[workflow_id] = lines
+        self._file_ids[workflow_id] = file_id
+        return runs
+
+    def record(self, run: WorkflowRun) -> None:
+        """
+        Append a run to its workflow's history.
+
+        Args:
+            run (WorkflowRun): The completed run
+        """
+        entry = run.to_dict()
+        with self._lock:
+            runs = self._load(run.workflow_id)
+            runs.append(entry)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self._path(run.workflow_id)
+
+            if self._file_lines[run.workflow_id] + 1 > 2 * self.max_runs:
+                temp_path = path.with_name(path.name + ".tmp")
+                with open(temp_path, "w") as f:
+                    f.writelines(json.dumps(item) + "\n" for item in runs)
+                os.replace(temp_path, path)
+                self._file_lines[run.workflow_id] = len(runs)
+            else:
+                with open(path, "a") as f:
+                    f.write(json.dumps(entry) + "\n")
+                self._file_lines[run.workflow_id] += 1
+            # The buffer already holds this run, so the write needn't trigger a reload
+            self._file_ids[run.workflow_id] = self._file_id(path)
+
+    def get_runs(self, workflow_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the most recent runs of a workflow.
+
+        Args:
+            workflow_id (str): Workflow identifier
+            limit (Optional[int]): Maximum number of runs to return
+
+        Returns:
+            List[Dict[str, Any]]: Runs, newest first
+        """
+        with self._lock:
+            runs = list(self._load(workflow_id))
+        runs.reverse()
+        return runs[:limit] if limit else runs
+
+    def get_stats(self, workflow_id: str) -> Dict[str, Any]:
+        """
+        Summarize lag, latency and outcomes over the buffered runs.
+
+        Args:
+            workflow_id (str): Workflow identifier
+
+        Returns:
+            Dict[str, Any]: Run counts, success rate and lag/duration percentiles
+        """
+        runs = self.get_runs(workflow_id)
+        if not runs:
+            return {"runs": 0}
+
+        def percentiles(key: str) -> Dict[str, float]:
+            values = sorted(run[key] for run in runs)
+            return {
+                "avg": round(sum(values) / len(values), 4),
+                "p50": round(values[len(values) // 2], 4),
+                "p95": round(values[min(len(values) - 1, int(len(values) * 0.95))], 4),
+                "max": round(values[-1], 4),
+            }
+
+        successes = sum(1 for run in runs if run["outcome"] == "success")
+        return {
+            "runs": len(runs),
+            "success_rate": round(successes / len(runs), 4),
+            "retries": sum(run.get("retries", 0) for run in runs),
+            "lag_seconds": percentiles("lag_seconds"),
+            "duration_seconds": percentiles("duration_seconds"),
+        }
+
+    def delete(self, workflow_id: str) -> None:
+        """Remove a workflow's history from memory and disk"""
+        with self._lock:
+            self._runs.pop(workflow_id, None)
+            self._file_lines.pop(workflow_id, None)
+            self._file_ids.pop(workflow_id, None)
+            self._path(workflow_id).unlink(missing_ok=True)
@@ -0,0 +1,70 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from src import app as app_module
+
+
+def chat_body(content, session_id):
+    return {
+        "prompt": {"role": "user", "content": content},
+        "chain_id": "1",
+        "wallet_address": "0x0",
+        "session_id": session_id,
+    }
+
+
+@pytest.fixture
+def delegator():
+    delegator = MagicMock()
+    delegator.get_delegator_response = AsyncMock(return_value={"agent": "default"})
+    with patch.object(app_module, "delegator", delegator), patch.object(
+        app_module.agent_manager_instance, "get_selected_agents", return_value=["default"]
+    ):
+        yield delegator
+
+
+async def post_all(requests):
+    transport = httpx.ASGITransport(app=app_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await asyncio.gather(*(client.post(path, json=body) for path, body in requests))
+
+
+def test_concurrent_chat_requests_overlap(delegator):
+    async def scenario():
+        entered = []
+        both_entered = asyncio.Event()
+
+        async def delegate_chat(agent_name, chat_request):
+            entered.append(chat_request.session_id)
+            if len(entered) == 2:
+                both_entered.set()
+            # Requests handled one after the other would never see each other here
+            await asyncio.wait_for(both_entered.wait(), timeout=5)
+            return agent_name, {"role": "assistant", "content": chat_request.prompt.content}
+
+        delegator.delegate_chat = delegate_chat
+        responses = await post_all(
+            [("/chat", chat_body(content, f"overlap-{content}")) for content in ("one", "two")]
+        )
+        assert [response.status_code for response in responses] == [200, 200]
+        assert [response.json()["content"] for response in responses] == ["one", "two"]
+
+    asyncio.run(scenario())
+
+
+def test_chat_stream_records_the_final_response(delegator):
+    async def stream_chat(agent_name, chat_request):
+        yield {"type": "agent", "agent": agent_name}
+        yield {"type": "token", "content": "hi"}
+        response = {"role": "assistant", "content": "hi"}
+        yield {"type": "done", "agent": agent_name, "response": response}
+
+    delegator.stream_chat = stream_chat
+    session = app_module.session_manager_instance.get_session("stream-recording")
+    with patch.object(session.chat_manager, "add_response") as add_response:
+        (response,) = asyncio.run(post_all([("/chat/stream", chat_body("hi", session.session_id))]))
+
+    assert response.text.index("event: token") < response.text.index("event: done")
+    add_response.assert_called_once_with({"role": "assistant", "content": "hi"}, "default")
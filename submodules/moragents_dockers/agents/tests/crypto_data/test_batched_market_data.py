@@ -0,0 +1,104 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from src.agents.crypto_data import tools
+from src.agents.crypto_data.agent import CryptoDataAgent
+from src.agents.crypto_data.market_cache import MarketDataCache
+
+PRICES = {"bitcoin": {"usd": 60000}, "ethereum": {"usd": 3000}, "solana": {"usd": 150}}
+MARKETS = [{"id": "ethereum", "market_cap": 360000000000, "fully_diluted_valuation": None}]
+
+
+def fake_get_json(url, params=None):
+    if url.endswith("/simple/price"):
+        return {coin_id: PRICES[coin_id] for coin_id in params["ids"].split(",")}
+    return MARKETS
+
+
+@pytest.fixture
+def upstream():
+    coin_index = MagicMock()
+    coin_index.lookup.side_effect = lambda text, kind="coin": text.lower()
+    coin_index.get_symbol.side_effect = lambda coin_id: coin_id[:3]
+    with patch.object(tools, "coin_index", coin_index), patch.object(
+        tools, "market_cache", MarketDataCache({"price": 60, "markets": 60}, stale_seconds=0)
+    ), patch.object(tools, "get_json", side_effect=fake_get_json) as get_json:
+        yield get_json
+
+
+def make_agent(tool_calls):
+    llm = MagicMock()
+    result = MagicMock(tool_calls=tool_calls)
+    llm.bind_tools.return_value.invoke.return_value = result
+    llm.bind_tools.return_value.ainvoke = AsyncMock(return_value=result)
+    return CryptoDataAgent({}, llm, None)
+
+
+TOOL_CALLS = [
+    {"name": "get_price", "args": {"coin_name": "Bitcoin"}},
+    {"name": "get_price", "args": {"coin_name": "Ethereum"}},
+    {"name": "get_price", "args": {"coin_name": "Solana"}},
+    {"name": "get_market_cap", "args": {"coin_name": "Ethereum"}},
+    {"name": "get_fdv", "args": {"coin_name": "Ethereum"}},
+]
+
+
+async def fake_aget_json(url, params=None):
+    return fake_get_json(url, params)
+
+
+def test_all_tool_calls_share_one_request_per_endpoint(upstream):
+    with patch.object(tools, "aget_json", side_effect=fake_aget_json) as aget_json:
+        asyncio.run(tools.aprefetch_market_data(TOOL_CALLS))
+    response, role = make_agent(TOOL_CALLS)._handle_tool_calls(TOOL_CALLS)
+
+    assert aget_json.call_count == 2
+    assert aget_json.call_args_list[0].args[1]["ids"] == "bitcoin,ethereum,solana"
+    upstream.assert_not_called()
+    lines = response["data"].split("\n")
+    assert lines[0] == "The price of Bitcoin is $60,000"
+    assert lines[3] == "The market cap of Ethereum is $360,000,000,000"
+    assert lines[4] == tools.Config.FDV_FAILURE_MESSAGE
+    assert response["coinId"] == "CRYPTO:BITUSD"
+
+
+def test_async_path_prefetches_endpoints_concurrently(upstream):
+    agent = make_agent(TOOL_CALLS)
+    with patch.object(tools, "aget_json", side_effect=fake_aget_json) as aget_json:
+        response, _ = asyncio.run(agent.aget_response([{"role": "user", "content": "compare"}]))
+
+    assert aget_json.call_count == 2
+    upstream.assert_not_called()
+    assert response["data"].startswith("The price of Bitcoin is $60,000")
+
+
+def test_names_missing_from_the_index_are_searched_once_per_turn():
+    tool_calls = [{"name": "get_price", "args": {"coin_name": "New Coin"}}]
+    coin_index = MagicMock()
+    coin_index.lookup.return_value = None
+    coin_index.get_symbol.return_value = None
+
+    def get_json(url, params=None):
+        if url.endswith("/search"):
+            return {"coins": [{"id": "new-coin"}]}
+        return {"symbol": "new"}
+
+    async def aget_json(url, params=None):
+        return {"new-coin": {"usd": 1}}
+
+    cache = MarketDataCache({"price": 60, "search": 60, "symbol": 60}, stale_seconds=0)
+    with patch.object(tools, "coin_index", coin_index), patch.object(
+        tools, "market_cache", cache
+    ), patch.object(tools, "get_json", side_effect=get_json) as upstream, patch.object(
+        tools, "aget_json", side_effect=aget_json
+    ):
+        asyncio.run(tools.aprefetch_market_data(tool_calls))
+        response, _ = make_agent(tool_calls)._handle_tool_calls(tool_calls)
+
+    assert response == {"data": "The price of New Coin is $1", "coinId": "CRYPTO:NEWUSD"}
+    # One search for the prefetch, the price and the chart symbol, one symbol lookup
+    assert [call.args[0].rsplit("/", 1)[-1] for call in upstream.call_args_list] == [
+        "search",
+        "new-coin",
+    ]
@@ -0,0 +1,49 @@
+import json
+import time
+from unittest.mock import patch
+
+from src.agents.crypto_data.coin_index import CoinIndex
+
+COINS = [
+    {"id": "bridged-ether", "symbol": "eth", "name": "Bridged Ether"},
+    {"id": "ethereum", "symbol": "eth", "name": "Ethereum"},
+    {"id": "bitcoin", "symbol": "btc", "name": "Bitcoin"},
+]
+MARKETS = [{"id": "bitcoin"}, {"id": "ethereum"}]
+NFTS = [{"id": "bored-ape-yacht-club", "symbol": "BAYC", "name": "Bored Ape Yacht Club"}]
+
+
+def fake_get_json(url, params=None):
+    if url.endswith("/coins/list"):
+        return COINS
+    if url.endswith("/coins/markets"):
+        return MARKETS
+    return NFTS
+
+
+def test_refresh_builds_ranked_lookup_with_fuzzy_fallback(tmp_path):
+    index = CoinIndex(str(tmp_path / "index.json"), refresh_interval_seconds=3600)
+    with patch("src.agents.crypto_data.coin_index.get_json", side_effect=fake_get_json):
+        index.refresh()
+
+    assert index.lookup("ETH") == "ethereum"
+    assert index.lookup("bridged ether") == "bridged-ether"
+    assert index.lookup("Etherium") == "ethereum"
+    # Only ranked coins are fuzzy matched
+    assert index.lookup("bridged etherr") is None
+    assert index.lookup("bayc", kind="nft") == "bored-ape-yacht-club"
+    assert index.lookup("no such coin") is None
+    assert index.get_symbol("bitcoin") == "btc"
+
+
+def test_persisted_index_is_used_without_network(tmp_path):
+    path = tmp_path / "index.json"
+    path.write_text(
+        json.dumps({"updated_at": time.time(), "coins": COINS, "nfts": NFTS, "ranks": {}})
+    )
+    index = CoinIndex(str(path), refresh_interval_seconds=3600)
+
+    with patch("src.agents.crypto_data.coin_index.get_json") as get_json:
+        assert index.lookup("bitcoin") == "bitcoin"
+        assert not index.is_stale()
+    get_json.assert_not_called()
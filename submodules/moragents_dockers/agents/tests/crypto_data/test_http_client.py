@@ -0,0 +1,55 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import httpx
+from src.agents.crypto_data import http_client
+
+
+def test_session_is_shared_and_retries_rate_limits():
+    session = http_client.get_session()
+    assert http_client.get_session() is session
+
+    retry = session.get_adapter("https://api.coingecko.com").max_retries
+    assert 429 in retry.status_forcelist
+    assert retry.respect_retry_after_header
+
+    response = MagicMock(headers={"Retry-After": "3600"})
+    assert retry.get_retry_after(response) == http_client.Config.HTTP_MAX_RETRY_AFTER_SECONDS
+
+
+def test_async_client_retries_after_429():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"bitcoin": {"usd": 50000}})
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch.object(http_client, "_get_async_client", return_value=client):
+            return await http_client.aget_json("https://example.com/price", {"ids": "bitcoin"})
+
+    assert asyncio.run(run()) == {"bitcoin": {"usd": 50000}}
+    assert len(calls) == 2
+
+
+def test_async_client_retries_connection_errors():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200, json={"bitcoin": {"usd": 50000}})
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch.object(http_client, "_get_async_client", return_value=client), patch.object(
+            http_client.Config, "HTTP_BACKOFF_FACTOR", 0
+        ):
+            return await http_client.aget_json("https://example.com/price", {"ids": "bitcoin"})
+
+    assert asyncio.run(run()) == {"bitcoin": {"usd": 50000}}
+    assert len(calls) == 2
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.agents.crypto_data.market_cache import MarketDataCache
+
+
+def test_concurrent_misses_share_one_upstream_call():
+    cache = MarketDataCache({"price": 60}, stale_seconds=0)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.1)
+        return 3000
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: cache.get("price", "ethereum", loader), range(8)))
+
+    assert results == [3000] * 8
+    assert len(calls) == 1
+    assert cache.get("price", "ethereum", loader) == 3000
+    assert len(calls) == 1
+
+
+def test_expired_entries_are_served_stale_while_revalidating():
+    cache = MarketDataCache({"price": 0}, stale_seconds=60)
+    cache.put("price", "ethereum", 3000)
+    refreshed = threading.Event()
+
+    def loader():
+        refreshed.set()
+        return 3100
+
+    assert cache.get("price", "ethereum", loader) == 3000
+    assert refreshed.wait(1)
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_failures_are_not_cached():
+    cache = MarketDataCache({"price": 60}, stale_seconds=0)
+
+    def failing_loader():
+        raise RuntimeError("rate limited")
+
+    with pytest.raises(RuntimeError):
+        cache.get("price", "ethereum", failing_loader)
+    assert cache.get("price", "ethereum", lambda: 3000) == 3000
+
+
+def test_async_misses_share_one_upstream_call_with_sync_callers():
+    cache = MarketDataCache({"price": 60}, stale_seconds=0)
+    calls = []
+
+    async def loader(keys):
+        calls.append(keys)
+        await asyncio.sleep(0.1)
+        return {key: 3000 for key in keys}
+
+    async def run():
+        prefetches = [cache.aget_many("price", ["ethereum"], loader) for _ in range(4)]
+        # A tool call in a worker thread coalesces onto the flight started on the loop
+        sync_call = asyncio.to_thread(cache.get, "price", "ethereum", lambda: 0)
+        return await asyncio.gather(*prefetches, sync_call)
+
+    *prefetched, fetched = asyncio.run(run())
+    assert prefetched == [{"ethereum": 3000}] * 4
+    assert fetched == 3000
+    assert calls == [["ethereum"]]
+
+
+def test_cancelled_async_load_releases_its_keys():
+    cache = MarketDataCache({"price": 60}, stale_seconds=0)
+    calls = []
+
+    async def loader(keys):
+        calls.append(keys)
+        if len(calls) == 1:
+            await asyncio.sleep(10)
+        return {key: 3000 for key in keys}
+
+    async def run():
+        owner = asyncio.create_task(cache.aget_many("price", ["ethereum"], loader))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(cache.aget_many("price", ["ethereum"], loader))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        # The caller sharing the cancelled load fails instead of waiting forever
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(waiter, 1)
+        return await asyncio.wait_for(cache.aget_many("price", ["ethereum"], loader), 1)
+
+    assert asyncio.run(run()) == {"ethereum": 3000}
+    assert len(calls) == 2
+    assert not cache._inflight
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_load():
+    cache = MarketDataCache({"price": 60}, stale_seconds=0)
+
+    async def loader(keys):
+        await asyncio.sleep(0.05)
+        return {key: 3000 for key in keys}
+
+    async def run():
+        owner = asyncio.create_task(cache.aget_many("price", ["ethereum"], loader))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(cache.aget_many("price", ["ethereum"], loader))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        return await owner
+
+    assert asyncio.run(run()) == {"ethereum": 3000}
+    assert cache.get("price", "ethereum", lambda: 0) == 3000
@@ -0,0 +1,39 @@
+from unittest.mock import patch
+
+from src.agents.crypto_data import tools
+from src.agents.crypto_data.protocol_index import ProtocolIndex
+
+PROTOCOLS = [
+    {"slug": "lido", "name": "Lido", "gecko_id": "lido-dao"},
+    {"slug": "aave-v3", "name": "Aave V3", "gecko_id": None},
+    {"slug": "aave-v2", "name": "Aave V2", "gecko_id": None},
+    {"slug": "uniswap-v3", "name": "Uniswap V3", "gecko_id": "uniswap"},
+]
+
+
+def make_index(tmp_path):
+    index = ProtocolIndex(str(tmp_path / "protocols.pkl"), refresh_interval_seconds=3600)
+    with patch("src.agents.crypto_data.protocol_index.get_json", return_value=PROTOCOLS):
+        index.refresh()
+    return index
+
+
+def test_catalog_is_persisted_and_reused(tmp_path):
+    make_index(tmp_path)
+    index = ProtocolIndex(str(tmp_path / "protocols.pkl"), refresh_interval_seconds=3600)
+
+    with patch("src.agents.crypto_data.protocol_index.get_json") as get_json:
+        assert index.find_by_name("lido") == "lido"
+        assert index.find_by_gecko_id("uniswap") == "uniswap-v3"
+        assert sorted(index.search("aave")) == ["aave-v2", "aave-v3"]
+        assert index.search("nothing like it") == []
+    get_json.assert_not_called()
+
+
+def test_fuzzy_tvl_lookup_picks_the_largest_candidate(tmp_path):
+    tvls = {"aave-v2": 1_000, "aave-v3": 5_000}
+    with patch.object(tools, "protocol_index", make_index(tmp_path)), patch.object(
+        tools, "get_coingecko_id", return_value=None
+    ), patch.object(tools, "get_tvl_value", side_effect=tvls.get):
+        assert tools._find_protocol_tvl("aave") == {"aave-v3": 5_000}
+        assert tools._find_protocol_tvl("Lido") == {"lido": None}
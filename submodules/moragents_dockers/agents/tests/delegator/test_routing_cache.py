@@ -0,0 +1,45 @@
+from unittest.mock import patch
+
+from src.routing_cache import RoutingCache
+
+
+def test_fingerprint_ignores_order_punctuation_and_stopwords():
+    assert RoutingCache.fingerprint("price of eth") == RoutingCache.fingerprint("ETH price?")
+    assert RoutingCache.fingerprint("price of eth") != RoutingCache.fingerprint("price of btc")
+
+
+def test_key_includes_selected_agents_and_upload_status():
+    cache = RoutingCache(max_size=10, ttl_seconds=60)
+    cache.put(cache.make_key("price of eth", ["crypto data", "default"], False), "crypto data")
+
+    key = cache.make_key("eth price?", ["default", "crypto data"], False)
+    assert cache.get(key) == "crypto data"
+    assert cache.get(cache.make_key("eth price?", ["crypto data", "default"], True)) is None
+    assert cache.get(cache.make_key("eth price?", ["default"], False)) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_lru_eviction_and_ttl_expiry():
+    cache = RoutingCache(max_size=2, ttl_seconds=60)
+    first, second, third = (cache.make_key(p, ["default"], False) for p in ("a1", "b2", "c3"))
+
+    with patch("src.routing_cache.time.monotonic", return_value=0):
+        cache.put(first, "default")
+        cache.put(second, "default")
+        cache.get(first)
+        cache.put(third, "default")
+        assert cache.get(second) is None
+        assert cache.get(first) == "default"
+
+    with patch("src.routing_cache.time.monotonic", return_value=61):
+        assert cache.get(first) is None
+    assert cache.stats()["size"] == 1
+
+
+def test_invalidate_clears_entries():
+    cache = RoutingCache(max_size=10, ttl_seconds=60)
+    key = cache.make_key("price of eth", ["crypto data"], False)
+    cache.put(key, "crypto data")
+    cache.invalidate()
+    assert cache.get(key) is None
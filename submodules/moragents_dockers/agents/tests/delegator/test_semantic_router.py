@@ -0,0 +1,54 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from src.semantic_router import SemanticRouter
+
+AGENTS = [
+    {"name": "crypto data", "description": "Provides cryptocurrency prices"},
+    {"name": "imagen", "description": "Generates images"},
+    {"name": "default", "description": "General questions"},
+]
+
+
+@pytest.fixture
+def mock_embeddings():
+    mock = MagicMock()
+    mock.embed_documents.return_value = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+
+    async def aembed_query(text):
+        return mock.query_vector
+
+    mock.aembed_query.side_effect = aembed_query
+    return mock
+
+
+@pytest.fixture
+def router(mock_embeddings):
+    router = SemanticRouter(mock_embeddings, margin_threshold=0.1, min_similarity=0.3)
+    assert router.fit(AGENTS)
+    return router
+
+
+def test_fit_failure_leaves_router_disabled(mock_embeddings):
+    mock_embeddings.embed_documents.side_effect = ConnectionError("ollama down")
+    router = SemanticRouter(mock_embeddings, margin_threshold=0.1, min_similarity=0.3)
+    assert not router.fit(AGENTS)
+    assert asyncio.run(router.route("price of eth", ["crypto data", "imagen"])) is None
+
+
+def test_route_confident_match(router, mock_embeddings):
+    mock_embeddings.query_vector = [0.9, 0.1, 0.0]
+    names = ["crypto data", "imagen", "default"]
+    assert asyncio.run(router.route("price of eth", names)) == "crypto data"
+
+
+def test_route_defers_on_small_margin(router, mock_embeddings):
+    mock_embeddings.query_vector = [0.7, 0.68, 0.0]
+    assert asyncio.run(router.route("draw the eth price", ["crypto data", "imagen"])) is None
+
+
+def test_route_only_considers_candidates(router, mock_embeddings):
+    mock_embeddings.query_vector = [0.9, 0.1, 0.05]
+    assert asyncio.run(router.route("price of eth", ["imagen", "default"])) is None
+    assert asyncio.run(router.route("price of eth", ["imagen"])) == "imagen"
@@ -0,0 +1,141 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from src.config import Config
+from src.delegator import Delegator
+from src.models.messages import ChatMessage, ChatRequest
+from src.stores.session_manager import Session
+
+
+class SlowAgent:
+    def __init__(self, delay, response):
+        self.delay = delay
+        self.response = response
+        self.cancelled = False
+
+    async def achat(self, request):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+
+@pytest.fixture
+def delegator():
+    with patch.object(Config, "SEMANTIC_ROUTER_ENABLED", False), patch(
+        "src.delegator.agent_manager_instance"
+    ) as mock_manager:
+        mock_manager.get_selected_agents.return_value = ["crypto data", "imagen", "default"]
+        delegator = Delegator(MagicMock(), MagicMock())
+        delegator.agent_manager = mock_manager
+        yield delegator
+
+
+@pytest.fixture
+def chat_request():
+    return ChatRequest(
+        prompt=ChatMessage(role="user", content="price of eth"), chain_id="1", wallet_address="0x0"
+    )
+
+
+def test_race_returns_first_success_and_cancels_rest(delegator, chat_request):
+    agents = {
+        "crypto data": SlowAgent(0.01, {"error": "rate limited"}),
+        "imagen": SlowAgent(0.02, {"role": "assistant", "content": "eth is $3000"}),
+        "default": SlowAgent(5, {"role": "assistant", "content": "too slow"}),
+    }
+    delegator.agent_manager.aget_agent = AsyncMock(side_effect=agents.get)
+
+    session = Session(session_id="test")
+    agent_name, response = asyncio.run(
+        delegator._race_agents(["crypto data", "imagen", "default"], chat_request, session)
+    )
+
+    assert agent_name == "imagen"
+    assert response["content"] == "eth is $3000"
+    assert agents["default"].cancelled
+    assert session.attempted_agents == {"crypto data", "imagen", "default"}
+
+
+def test_race_times_out(delegator, chat_request):
+    delegator.agent_manager.aget_agent = AsyncMock(return_value=SlowAgent(5, {"content": "late"}))
+
+    with patch.object(Config, "SPECULATIVE_ROUTING_DEADLINE_SECONDS", 0.05):
+        agent_name, response = asyncio.run(
+            delegator._race_agents(["imagen"], chat_request, Session(session_id="test"))
+        )
+
+    assert agent_name is None
+    assert "error" in response
+
+
+def test_ranking_keeps_valid_unique_agents(delegator):
+    delegator.get_available_unattempted_agents = MagicMock(
+        return_value=[
+            {"name": "crypto data", "description": "prices"},
+            {"name": "imagen", "description": "images"},
+        ]
+    )
+    ranking_llm = delegator.llm.bind_tools.return_value
+    ranking_llm.ainvoke = AsyncMock(
+        return_value=MagicMock(
+            tool_calls=[{"args": {"agents": ["imagen", "unknown", "imagen", "crypto data"]}}]
+        )
+    )
+
+    ranked = asyncio.run(
+        delegator._rank_next_agents({"content": "draw eth"}, Session(session_id="test"))
+    )
+    assert ranked == ["imagen", "crypto data"]
+
+
+def test_only_side_effect_free_agents_are_raced(delegator, chat_request):
+    configs = {
+        "crypto data": {"side_effect_free": True},
+        "imagen": {"side_effect_free": True},
+        "dca": {},
+    }
+    delegator.agent_manager.get_agent_config.side_effect = configs.get
+    delegator._race_agents = AsyncMock(return_value=("imagen", {"content": "raced"}))
+    delegator.delegate_chat = AsyncMock(return_value=("dca", {"content": "alone"}))
+
+    with patch.object(Config, "SPECULATIVE_ROUTING_ENABLED", True):
+        delegator._rank_next_agents = AsyncMock(return_value=["imagen", "dca", "crypto data"])
+        assert asyncio.run(delegator._try_next_agent(chat_request))[0] == "imagen"
+        assert delegator._race_agents.call_args.args[0] == ["imagen", "crypto data"]
+
+        # An agent with side effects ranked first is never run alongside others
+        delegator._rank_next_agents = AsyncMock(return_value=["dca", "imagen"])
+        assert asyncio.run(delegator._try_next_agent(chat_request))[0] == "dca"
+        delegator.delegate_chat.assert_awaited_once_with("dca", chat_request)
+        assert delegator._race_agents.await_count == 1
+
+
+def test_failing_agent_with_side_effects_runs_only_once(delegator, chat_request):
+    delegator.agent_manager.get_agent_config.side_effect = {"dca": {}}.get
+    dca_agent = SlowAgent(0, RuntimeError("swap failed"))
+    dca_agent.achat = AsyncMock(side_effect=dca_agent.achat)
+    delegator.agent_manager.aget_agent = AsyncMock(return_value=dca_agent)
+    delegator.agent_manager.get_selected_agents.return_value = ["dca"]
+    delegator.get_delegator_response = AsyncMock(side_effect=ValueError("no agents left"))
+    session = Session(session_id="test")
+
+    async def rank(prompt, session):
+        return [name for name in ["dca"] if name not in session.attempted_agents]
+
+    with patch.object(Config, "SPECULATIVE_ROUTING_ENABLED", True), patch(
+        "src.delegator.session_manager_instance"
+    ) as mock_sessions:
+        mock_sessions.get_session.return_value = session
+        delegator._rank_next_agents = rank
+        agent_name, response = asyncio.run(delegator._try_next_agent(chat_request))
+
+    assert agent_name is None
+    assert "error" in response
+    dca_agent.achat.assert_awaited_once()
+    assert session.attempted_agents == {"dca"}
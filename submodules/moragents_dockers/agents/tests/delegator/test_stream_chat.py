@@ -0,0 +1,89 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from src.config import Config
+from src.delegator import Delegator
+from src.models.messages import ChatMessage, ChatRequest
+
+
+class StreamingAgent:
+    def __init__(self, tokens, error=None):
+        self.tokens = tokens
+        self.error = error
+
+    async def astream_chat(self, request):
+        for token in self.tokens:
+            yield {"type": "token", "content": token}
+        if self.error:
+            raise self.error
+        response = {"role": "assistant", "content": "".join(self.tokens)}
+        yield {"type": "done", "response": response}
+
+
+@pytest.fixture
+def agents():
+    return {}
+
+
+@pytest.fixture
+def delegator(agents):
+    with patch.object(Config, "SEMANTIC_ROUTER_ENABLED", False), patch(
+        "src.delegator.agent_manager_instance"
+    ) as mock_manager:
+        mock_manager.get_selected_agents.return_value = ["crypto data", "default"]
+        mock_manager.aget_agent = AsyncMock(side_effect=agents.get)
+        yield Delegator(MagicMock(), MagicMock())
+
+
+@pytest.fixture
+def chat_request():
+    return ChatRequest(
+        prompt=ChatMessage(role="user", content="price of eth"), chain_id="1", wallet_address="0x0"
+    )
+
+
+async def collect(stream):
+    return [event async for event in stream]
+
+
+def test_events_arrive_as_agent_tokens_then_done(delegator, agents, chat_request):
+    agents["crypto data"] = StreamingAgent(["eth ", "is $3000"])
+
+    events = asyncio.run(collect(delegator.stream_chat("crypto data", chat_request)))
+
+    assert [event["type"] for event in events] == ["agent", "token", "token", "done"]
+    assert events[0]["agent"] == "crypto data"
+    assert events[-1]["agent"] == "crypto data"
+    assert events[-1]["response"]["content"] == "eth is $3000"
+
+
+def test_falls_back_when_the_agent_fails_before_streaming(delegator, agents, chat_request):
+    agents["crypto data"] = StreamingAgent([], error=RuntimeError("rate limited"))
+    agents["default"] = StreamingAgent(["hello"])
+    delegator.get_delegator_response = AsyncMock(return_value={"agent": "default"})
+
+    events = asyncio.run(collect(delegator.stream_chat("crypto data", chat_request)))
+
+    assert [(event["type"], event.get("agent")) for event in events] == [
+        ("agent", "crypto data"),
+        ("agent", "default"),
+        ("token", None),
+        ("done", "default"),
+    ]
+
+
+def test_errors_after_streaming_tokens_are_raised(delegator, agents, chat_request):
+    agents["crypto data"] = StreamingAgent(["partial"], error=RuntimeError("connection lost"))
+    delegator.get_delegator_response = AsyncMock(return_value={"agent": "default"})
+
+    events = []
+
+    async def consume():
+        async for event in delegator.stream_chat("crypto data", chat_request):
+            events.append(event)
+
+    with pytest.raises(RuntimeError, match="connection lost"):
+        asyncio.run(consume())
+    assert [event["type"] for event in events] == ["agent", "token"]
+    delegator.get_delegator_response.assert_not_called()
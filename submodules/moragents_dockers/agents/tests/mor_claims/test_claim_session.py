@@ -0,0 +1,44 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+from src import app as app_module
+from src.agents.mor_claims.agent import MorClaimsAgent
+from src.stores import session_manager_instance
+
+
+async def post(path, body):
+    transport = httpx.ASGITransport(app=app_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post(path, json=body)
+
+
+def test_claim_route_clears_active_agent_on_requesting_session():
+    agent = MorClaimsAgent({"name": "claim"}, llm=None, embeddings=None)
+    agent.conversation_state["0xabc"] = {"state": "sign", "transactions": [{"to": "0x1"}]}
+    alice = session_manager_instance.get_session("alice")
+    bob = session_manager_instance.get_session("bob")
+    alice.active_agent = "claim"
+    bob.active_agent = "claim"
+
+    with patch("src.agents.mor_claims.routes.agent_manager_instance") as agent_manager:
+        agent_manager.aget_agent = AsyncMock(return_value=agent)
+        response = asyncio.run(
+            post("/claim/claim?session_id=alice", {"wallet_address": "0xabc", "transactions": []})
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {"transactions": [{"to": "0x1"}]}
+    assert alice.active_agent is None
+    assert bob.active_agent == "claim"
+
+
+def test_claim_route_reports_unknown_wallets():
+    agent = MorClaimsAgent({"name": "claim"}, llm=None, embeddings=None)
+
+    with patch("src.agents.mor_claims.routes.agent_manager_instance") as agent_manager:
+        agent_manager.aget_agent = AsyncMock(return_value=agent)
+        response = asyncio.run(post("/claim/claim", {"wallet_address": "0xdef"}))
+
+    assert response.status_code == 500
+    assert "error" in response.json()
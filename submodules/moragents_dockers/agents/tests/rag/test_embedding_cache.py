@@ -0,0 +1,34 @@
+from langchain_core.embeddings import Embeddings
+from src.agents.rag.embedding_cache import cache_embeddings
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self, model):
+        self.model = model
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), 1.0]
+
+
+def test_only_new_chunks_reach_the_model(tmp_path):
+    model = CountingEmbeddings("nomic-embed-text:latest")
+    cached = cache_embeddings(model, str(tmp_path))
+    assert cached.embed_documents(["page one", "boilerplate"]) == [[8.0, 1.0], [11.0, 1.0]]
+
+    # A fresh wrapper over the same folder, as after a restart
+    cached = cache_embeddings(model, str(tmp_path))
+    assert cached.embed_documents(["boilerplate", "page two"]) == [[11.0, 1.0], [8.0, 1.0]]
+    assert model.embedded == ["page one", "boilerplate", "page two"]
+
+
+def test_cache_is_keyed_by_model(tmp_path):
+    cache_embeddings(CountingEmbeddings("model-a"), str(tmp_path)).embed_documents(["text"])
+
+    other = CountingEmbeddings("model-b")
+    cache_embeddings(other, str(tmp_path)).embed_documents(["text"])
+    assert other.embedded == ["text"]
@@ -0,0 +1,70 @@
+import asyncio
+import hashlib
+
+import fitz
+from langchain_core.embeddings import Embeddings
+from src.agents.rag.ingestion import DocumentIngestor, spool_upload
+
+
+class LengthEmbeddings(Embeddings):
+    def __init__(self):
+        self.batches = []
+
+    def embed_documents(self, texts):
+        self.batches.append(len(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), 1.0]
+
+
+class FakeUpload:
+    def __init__(self, content):
+        self.content = content
+        self.reads = 0
+
+    async def read(self, size=-1):
+        self.reads += 1
+        chunk, self.content = self.content[:size], self.content[size:]
+        return chunk
+
+
+def make_pdf(path, pages):
+    doc = fitz.open()
+    for text in pages:
+        doc.new_page().insert_text((72, 72), text)
+    doc.save(str(path))
+    doc.close()
+
+
+def test_spool_upload_hashes_and_enforces_the_size_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.agents.rag.ingestion.Config.UPLOAD_CHUNK_BYTES", 4)
+    content = b"0123456789"
+
+    upload = FakeUpload(content)
+    path, doc_hash = asyncio.run(spool_upload(upload, str(tmp_path), max_size=10))
+    assert open(path, "rb").read() == content
+    assert doc_hash == hashlib.sha256(content).hexdigest()
+    assert upload.reads == 4
+
+    assert asyncio.run(spool_upload(FakeUpload(content), str(tmp_path), max_size=9)) is None
+    assert [p.name for p in tmp_path.iterdir()] == [path.rsplit("/", 1)[-1]]
+
+
+def test_pages_are_indexed_in_batches(tmp_path):
+    make_pdf(tmp_path / "doc.pdf", [f"page number {i}" for i in range(7)])
+    embeddings = LengthEmbeddings()
+    updates = []
+
+    ingestor = DocumentIngestor(embeddings, batch_size=3, max_inflight_batches=2)
+    vector_store = asyncio.run(
+        ingestor.ingest(str(tmp_path / "doc.pdf"), lambda p: updates.append(p.to_dict()))
+    )
+
+    assert vector_store.index.ntotal == 7
+    assert embeddings.batches == [3, 3, 1]
+    assert [update["chunks_indexed"] for update in updates] == [3, 6, 7, 7]
+    assert updates[-1]["stage"] == "done"
+    assert updates[-1]["pages_parsed"] == 7
+    docs = vector_store.similarity_search("page number", k=7)
+    assert sorted(doc.metadata["page"] for doc in docs) == list(range(7))
@@ -0,0 +1,161 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+import fitz
+from langchain_core.embeddings import Embeddings
+from src.agents.rag import agent as rag_agent_module
+from src.agents.rag.agent import RagAgent
+from src.agents.rag.ingestion import DocumentIngestor
+from src.agents.rag.jobs import IngestionJobManager
+from src.agents.rag.vector_store import DocumentIndexStore
+from src.stores.session_manager import SessionManager
+
+
+class GatedEmbeddings(Embeddings):
+    """Embeds the first batch immediately and holds later ones until released"""
+
+    def __init__(self):
+        self.model = "gated"
+        self.release = threading.Event()
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        if self.calls > 1:
+            self.release.wait(timeout=10)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), 1.0]
+
+
+class FakeUpload:
+    def __init__(self, filename, content):
+        self.filename = filename
+        self.content = content
+
+    async def read(self, size=-1):
+        chunk, self.content = self.content[:size], self.content[size:]
+        return chunk
+
+
+def make_pdf(pages):
+    doc = fitz.open()
+    for text in pages:
+        doc.new_page().insert_text((72, 72), text)
+    content = doc.tobytes()
+    doc.close()
+    return content
+
+
+async def wait_for(condition, timeout=10):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met in time")
+
+
+def test_jobs_queue_beyond_the_concurrency_limit_and_record_failures():
+    async def scenario():
+        manager = IngestionJobManager(max_concurrent=1, max_jobs=10)
+        release = asyncio.Event()
+
+        async def slow(job):
+            await release.wait()
+
+        async def failing(job):
+            raise ValueError("no text")
+
+        first = manager.submit("s1", "a.pdf", slow)
+        second = manager.submit("s1", "b.pdf", failing)
+        await asyncio.sleep(0)
+        assert (first.stage, second.stage) == ("indexing", "queued")
+
+        release.set()
+        await wait_for(lambda: second.is_finished)
+        assert first.stage == "done"
+        status = manager.get(second.id).to_dict()
+        assert status["stage"] == "failed"
+        assert status["error"] == "no text"
+        assert status["timings"]["queued_seconds"] >= 0
+
+    asyncio.run(scenario())
+
+
+def test_upload_is_searchable_before_ingestion_finishes(tmp_path, monkeypatch):
+    monkeypatch.setattr(rag_agent_module.Config, "EMBEDDING_CACHE_FOLDER", str(tmp_path / "cache"))
+    store = DocumentIndexStore(str(tmp_path / "indices"), 8)
+    sessions = SessionManager(max_sessions=10, idle_timeout_seconds=60)
+    embeddings = GatedEmbeddings()
+
+    async def scenario():
+        jobs = IngestionJobManager(max_concurrent=1, max_jobs=10)
+        with patch.object(rag_agent_module, "document_index_store", store), patch.object(
+            rag_agent_module, "ingestion_jobs", jobs
+        ), patch.object(rag_agent_module, "UPLOAD_FOLDER", str(tmp_path)), patch.object(
+            rag_agent_module, "session_manager_instance", sessions
+        ):
+            agent = RagAgent({"name": "rag"}, MagicMock(), embeddings)
+            agent.ingestor = DocumentIngestor(
+                agent.document_embedding, batch_size=2, max_inflight_batches=1
+            )
+            content = make_pdf([f"page {i}" for i in range(6)])
+            response = await agent.upload_file({"file": FakeUpload("doc.pdf", content)}, "s1")
+            job = jobs.get(response["job_id"])
+            assert not sessions.get_session("s1").chat_manager.get_uploaded_file_status()
+
+            await wait_for(lambda: job.progress.chunks_indexed >= 2)
+            assert job.stage == "indexing"
+            assert sessions.get_session("s1").chat_manager.get_uploaded_file_status()
+            assert job.first_batch_at is not None
+            retriever = await agent._aget_retriever("s1")
+            docs = await retriever.ainvoke("page 0")
+            assert {doc.page_content for doc in docs} == {"page 0", "page 1"}
+
+            embeddings.release.set()
+            await wait_for(lambda: job.is_finished)
+            assert job.stage == "done"
+            assert job.to_dict()["chunks_indexed"] == 6
+            assert store.has(store.content_hash(content))
+            retriever = await agent._aget_retriever("s1")
+            assert len(await retriever.ainvoke("page 0")) == 6
+
+    asyncio.run(scenario())
+
+
+def test_uploads_are_stored_by_content_hash_and_removed_on_failure(tmp_path, monkeypatch):
+    monkeypatch.setattr(rag_agent_module.Config, "EMBEDDING_CACHE_FOLDER", str(tmp_path / "cache"))
+    store = DocumentIndexStore(str(tmp_path / "indices"), 8)
+    sessions = SessionManager(max_sessions=10, idle_timeout_seconds=60)
+    embeddings = GatedEmbeddings()
+    embeddings.release.set()
+
+    async def scenario():
+        jobs = IngestionJobManager(max_concurrent=2, max_jobs=10)
+        with patch.object(rag_agent_module, "document_index_store", store), patch.object(
+            rag_agent_module, "ingestion_jobs", jobs
+        ), patch.object(rag_agent_module, "UPLOAD_FOLDER", str(tmp_path)), patch.object(
+            rag_agent_module, "session_manager_instance", sessions
+        ):
+            agent = RagAgent({}, MagicMock(), embeddings)
+            # Same filename, and the second document has no text to index
+            uploads = {"s1": make_pdf(["staking rewards"]), "s2": make_pdf([""])}
+            job_ids = [
+                (await agent.upload_file({"file": FakeUpload("doc.pdf", content)}, session_id))[
+                    "job_id"
+                ]
+                for session_id, content in uploads.items()
+            ]
+            await wait_for(lambda: all(jobs.get(job_id).is_finished for job_id in job_ids))
+            return [jobs.get(job_id).stage for job_id in job_ids], uploads
+
+    stages, uploads = asyncio.run(scenario())
+    assert stages == ["done", "failed"]
+    stored = sorted(path.name for path in tmp_path.iterdir() if path.is_file())
+    assert stored == [f"{store.content_hash(uploads['s1'])}.pdf"]
+    assert store.get_session_documents("s1") == [store.content_hash(uploads["s1"])]
+    assert store.get_session_documents("s2") == []
+    assert sessions.get_session("s1").chat_manager.get_uploaded_file_status()
+    assert not sessions.get_session("s2").chat_manager.get_uploaded_file_status()
@@ -0,0 +1,74 @@
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import Embeddings
+from src.agents.rag.vector_store import DocumentIndexStore
+
+VOCABULARY = ["staking", "rewards", "bridge", "fees", "governance", "votes"]
+
+
+class KeywordEmbeddings(Embeddings):
+    """Embeds text as counts of a few keywords, so nearest neighbours are predictable"""
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        words = text.lower().split()
+        return [float(words.count(word)) for word in VOCABULARY]
+
+
+def make_store(tmp_path, **kwargs):
+    kwargs.setdefault("max_loaded", 8)
+    return DocumentIndexStore(str(tmp_path / "indices"), **kwargs)
+
+
+def index_document(store, texts, name):
+    doc_hash = store.content_hash(" ".join(texts).encode())
+    store.save(doc_hash, FAISS.from_texts(texts, KeywordEmbeddings()), name)
+    return doc_hash
+
+
+def test_indices_and_session_documents_survive_a_restart(tmp_path):
+    store = make_store(tmp_path)
+    doc_hash = index_document(store, ["staking rewards", "bridge fees"], "a.pdf")
+    store.add_session_document("s1", doc_hash)
+
+    restarted = make_store(tmp_path)
+    assert restarted.has(doc_hash)
+    assert restarted.get_session_documents("s1") == [doc_hash]
+    assert restarted.get_retriever("s2", KeywordEmbeddings()) is None
+
+    retriever = restarted.get_retriever("s1", KeywordEmbeddings())
+    assert retriever.invoke("bridge fees")[0].page_content == "bridge fees"
+
+
+def test_retriever_searches_all_session_documents(tmp_path):
+    store = make_store(tmp_path, max_loaded=1)
+    first = index_document(store, ["staking rewards", "staking"], "a.pdf")
+    second = index_document(store, ["governance votes", "bridge fees"], "b.pdf")
+    for doc_hash in (first, second, first):
+        store.add_session_document("s1", doc_hash)
+    assert store.get_session_documents("s1") == [first, second]
+
+    retriever = store.get_retriever("s1", KeywordEmbeddings())
+    retriever.k = 2
+    assert [doc.page_content for doc in retriever.invoke("governance votes")][0] == (
+        "governance votes"
+    )
+    assert [doc.page_content for doc in retriever.invoke("staking rewards")] == [
+        "staking rewards",
+        "staking",
+    ]
+
+
+def test_expired_sessions_are_pruned_from_the_manifest(tmp_path):
+    store = make_store(tmp_path)
+    doc_hash = index_document(store, ["staking rewards"], "a.pdf")
+    for session_id in ("s1", "s2", "s3"):
+        store.add_session_document(session_id, doc_hash)
+
+    store.remove_session("s1")
+    store.retain_sessions(["s2"])
+
+    restarted = make_store(tmp_path)
+    assert [restarted.get_session_documents(s) for s in ("s1", "s2", "s3")] == [[], [doc_hash], []]
+    assert restarted.has(doc_hash)
@@ -0,0 +1,43 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from src.config import Config
+
+AGENTS_ROOT = Path(__file__).resolve().parents[2]
+
+BOOT_SCRIPT = """
+import json
+import src.app
+from src.startup_profiler import startup_profiler
+print(json.dumps(startup_profiler.report(top=10)))
+"""
+
+
+def test_startup_import_time_within_budget(tmp_path):
+    budget = float(
+        os.environ.get("STARTUP_IMPORT_BUDGET_SECONDS", Config.STARTUP_IMPORT_BUDGET_SECONDS)
+    )
+
+    # Boot in a fresh interpreter so no module is already imported; run from a scratch
+    # directory so the app's log, upload and history files don't land in the repo
+    result = subprocess.run(
+        [sys.executable, "-c", BOOT_SCRIPT],
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": str(AGENTS_ROOT)},
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    assert result.returncode == 0, result.stderr
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    slowest = ", ".join(
+        f"{item['module']} {item['cumulative_seconds']}s" for item in report["slowest_imports"]
+    )
+    assert report["total_import_seconds"] <= budget, (
+        f"Startup imports took {report['total_import_seconds']}s, budget is {budget}s. "
+        f"Slowest: {slowest}"
+    )
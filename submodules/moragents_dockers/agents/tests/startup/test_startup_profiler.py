@@ -0,0 +1,24 @@
+import builtins
+import sys
+
+from src.startup_profiler import StartupProfiler
+
+
+def test_profiler_records_new_imports_and_restores_import():
+    original_import = builtins.__import__
+    sys.modules.pop("colorsys", None)
+
+    profiler = StartupProfiler()
+    profiler.start()
+    import colorsys  # noqa: F401
+
+    with profiler.phase("work"):
+        pass
+    profiler.stop()
+
+    assert "colorsys" in profiler.module_times
+    assert profiler.module_times["colorsys"]["self"] >= 0
+    assert "work" in profiler.report()["phases"]
+    assert profiler.boot_seconds is not None
+    assert not profiler.is_active
+    assert builtins.__import__ is original_import
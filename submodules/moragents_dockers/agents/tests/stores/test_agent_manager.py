@@ -0,0 +1,54 @@
+import sys
+import types
+
+from src.stores.agent_manager import AgentManager
+
+
+class FakeAgent:
+    instances = 0
+
+    def __init__(self, config, llm, embeddings):
+        FakeAgent.instances += 1
+        self.config = config
+
+
+def make_manager(monkeypatch):
+    module = types.ModuleType("fake_agent_module")
+    module.FakeAgent = FakeAgent
+    monkeypatch.setitem(sys.modules, "fake_agent_module", module)
+    FakeAgent.instances = 0
+    return AgentManager(
+        {
+            "agents": [
+                {"name": "fake", "path": "fake_agent_module", "class": "FakeAgent"},
+                {"name": "broken", "path": "missing_agent_module", "class": "Missing"},
+            ]
+        }
+    )
+
+
+def test_agents_load_on_first_use(monkeypatch):
+    manager = make_manager(monkeypatch)
+    manager.set_models(llm=None, embeddings=None)
+    assert manager.get_load_report()["fake"] == {"status": "not_loaded"}
+
+    agent = manager.get_agent("fake")
+    assert isinstance(agent, FakeAgent)
+    assert manager.get_agent("fake") is agent
+    assert FakeAgent.instances == 1
+    assert manager.get_load_report()["fake"]["status"] == "loaded"
+    assert manager.get_load_report()["fake"]["import_seconds"] is not None
+
+
+def test_failed_load_is_reported_once(monkeypatch):
+    manager = make_manager(monkeypatch)
+    assert manager.get_agent("broken") is None
+    assert manager.get_agent("broken") is None
+    assert manager.get_load_report()["broken"]["status"] == "failed"
+    assert manager.get_agent("unknown") is None
+
+
+def test_prewarm_loads_in_background(monkeypatch):
+    manager = make_manager(monkeypatch)
+    manager.prewarm_agents(["fake"]).join()
+    assert "fake" in manager.agents
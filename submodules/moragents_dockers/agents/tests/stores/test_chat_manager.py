@@ -0,0 +1,47 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.config import Config
+from src.stores.chat_manager import ChatManager
+
+
+def test_history_stays_within_token_budget():
+    with patch.object(Config, "CHAT_HISTORY_TOKEN_BUDGET", 30):
+        chat_manager = ChatManager()
+        for i in range(20):
+            chat_manager.add_message({"role": "user", "content": f"message number {i:02d} " * 2})
+
+    assert chat_manager.token_count <= 30
+    assert chat_manager.get_messages()[0] == chat_manager.intro_message
+    assert chat_manager.get_last_message()["content"].startswith("message number 19")
+    assert len(chat_manager.messages) + len(chat_manager.evicted_messages) == 20
+
+
+def test_compact_folds_evicted_turns_into_summary():
+    with patch.object(Config, "CHAT_HISTORY_MAX_MESSAGES", 2):
+        chat_manager = ChatManager()
+        for content in ["swap 1 eth", "for usdc", "on base"]:
+            chat_manager.add_message({"role": "user", "content": content})
+
+    llm = MagicMock()
+    llm.ainvoke = AsyncMock(return_value=MagicMock(content=" User swaps 1 ETH. "))
+    asyncio.run(chat_manager.compact(llm))
+
+    assert not chat_manager.evicted_messages
+    assert chat_manager.get_chat_history() == (
+        "summary: User swaps 1 ETH.\nuser: for usdc\nuser: on base"
+    )
+
+
+def test_failed_compaction_keeps_evicted_turns():
+    with patch.object(Config, "CHAT_HISTORY_MAX_MESSAGES", 1):
+        chat_manager = ChatManager()
+        chat_manager.add_message({"role": "user", "content": "first"})
+        chat_manager.add_message({"role": "user", "content": "second"})
+
+    llm = MagicMock()
+    llm.ainvoke = AsyncMock(side_effect=ConnectionError("ollama down"))
+    asyncio.run(chat_manager.compact(llm))
+
+    assert [msg["content"] for msg in chat_manager.evicted_messages] == ["first"]
+    assert chat_manager.get_chat_history() == "user: second"
@@ -0,0 +1,73 @@
+import asyncio
+
+from src.stores.chat_manager import ChatManager
+from src.stores.chat_storage import SQLiteChatStorage
+from src.stores.session_manager import SessionManager
+
+
+def make_storage(tmp_path):
+    return SQLiteChatStorage(str(tmp_path / "chat.db"), batch_size=10)
+
+
+def test_pages_walk_backwards_through_history(tmp_path):
+    storage = make_storage(tmp_path)
+    chat_manager = ChatManager("alice", storage)
+    for i in range(5):
+        chat_manager.add_message({"role": "user", "content": f"message {i}"})
+
+    messages, cursor = chat_manager.get_message_page(limit=2)
+    assert [m["content"] for m in messages] == ["message 3", "message 4"]
+
+    messages, cursor = chat_manager.get_message_page(cursor, limit=2)
+    assert [m["content"] for m in messages] == ["message 1", "message 2"]
+
+    messages, cursor = chat_manager.get_message_page(cursor, limit=2)
+    assert cursor is None
+    assert messages[0] == chat_manager.intro_message
+    assert messages[1]["content"] == "message 0"
+    storage.close()
+
+
+def test_resumed_session_reloads_history(tmp_path):
+    storage = make_storage(tmp_path)
+    ChatManager("alice", storage).add_message({"role": "user", "content": "hello"})
+    ChatManager("bob", storage).add_message({"role": "user", "content": "other"})
+    storage.close()
+
+    storage = make_storage(tmp_path)
+    resumed = ChatManager("alice", storage)
+    assert [m["content"] for m in resumed.get_messages()[1:]] == ["hello"]
+
+    resumed.clear_messages()
+    assert ChatManager("alice", storage).get_messages() == [resumed.intro_message]
+    storage.close()
+
+
+def test_resumed_session_reloads_history_off_the_event_loop(tmp_path):
+    manager = SessionManager(max_sessions=10, idle_timeout_seconds=60)
+    assert manager.storage is None
+
+    manager.open_storage("sqlite", str(tmp_path / "chat.db"))
+    manager.get_session("alice").chat_manager.add_message({"role": "user", "content": "hello"})
+    manager.delete_session("bob")
+    manager.sessions.clear()
+
+    async def resume():
+        session = await manager.aget_session("alice")
+        return session.chat_manager.messages
+
+    assert [m["content"] for m in asyncio.run(resume())] == ["hello"]
+    manager.close()
+    assert manager.storage is None
+
+
+def test_in_memory_paging_without_storage():
+    chat_manager = ChatManager()
+    for i in range(3):
+        chat_manager.add_message({"role": "user", "content": f"message {i}"})
+
+    messages, cursor = chat_manager.get_message_page(limit=2)
+    assert [m["content"] for m in messages] == ["message 1", "message 2"]
+    messages, cursor = chat_manager.get_message_page(cursor, limit=2)
+    assert cursor is None
+    assert [m["content"] for m in messages[1:]] == ["message 0"]
@@ -0,0 +1,35 @@
+import threading
+
+from src.stores.file_lock import FileLock
+
+
+def test_threads_in_one_process_exclude_each_other(tmp_path):
+    lock = FileLock(str(tmp_path / "storage.lock"))
+    assert lock.acquire()
+    assert not lock.acquire(blocking=False)
+
+    acquired = threading.Event()
+
+    def contend():
+        with lock:
+            acquired.set()
+
+    thread = threading.Thread(target=contend)
+    thread.start()
+    assert not acquired.wait(0.1)
+
+    # Released from a different thread than the one that will acquire it next
+    lock.release()
+    thread.join(timeout=5)
+    assert acquired.is_set()
+    assert not lock.is_held
+
+
+def test_separate_handles_on_one_path_exclude_each_other(tmp_path):
+    first = FileLock(str(tmp_path / "leader"))
+    second = FileLock(str(tmp_path / "leader"))
+    assert first.acquire(blocking=False)
+    assert not second.acquire(blocking=False)
+    first.release()
+    assert second.acquire(blocking=False)
+    second.release()
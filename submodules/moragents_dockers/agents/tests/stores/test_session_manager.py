@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+from src.stores.session_manager import SessionManager
+
+
+def test_sessions_are_isolated():
+    manager = SessionManager(max_sessions=10, idle_timeout_seconds=60)
+    alice = manager.get_session("alice")
+    bob = manager.get_session("bob")
+
+    alice.chat_manager.add_message({"role": "user", "content": "price of eth"})
+    alice.chat_manager.set_uploaded_file(True)
+    alice.attempted_agents.add("crypto data")
+    alice.get_agent_state("realtime search")["last_search_term"] = "eth"
+
+    assert manager.get_session("alice") is alice
+    assert len(bob.chat_manager.get_messages()) == 1
+    assert not bob.chat_manager.get_uploaded_file_status()
+    assert not bob.attempted_agents
+    assert bob.get_agent_state("realtime search") == {}
+
+
+def test_missing_session_id_uses_default_session():
+    manager = SessionManager(max_sessions=10, idle_timeout_seconds=60)
+    assert manager.get_session(None) is manager.get_session("default")
+
+
+def test_least_recently_used_session_evicted_at_capacity():
+    manager = SessionManager(max_sessions=2, idle_timeout_seconds=60)
+    manager.get_session("a")
+    manager.get_session("b")
+    manager.get_session("a")
+    manager.get_session("c")
+    assert manager.list_sessions() == ["a", "c"]
+
+
+def test_idle_sessions_evicted():
+    manager = SessionManager(max_sessions=10, idle_timeout_seconds=60)
+    with patch("src.stores.session_manager.time.monotonic", return_value=0):
+        manager.get_session("idle")
+    with patch("src.stores.session_manager.time.monotonic", return_value=30):
+        manager.get_session("active")
+    with patch("src.stores.session_manager.time.monotonic", return_value=70):
+        manager.get_session("new")
+    assert manager.list_sessions() == ["active", "new"]
+
+
+def test_expiry_listeners_see_evicted_and_deleted_sessions():
+    manager = SessionManager(max_sessions=1, idle_timeout_seconds=60)
+    expired = []
+    manager.add_expiry_listener(expired.append)
+    manager.get_session("a")
+    manager.get_session("b")
+    manager.delete_session("b")
+    assert expired == ["a", "b"]
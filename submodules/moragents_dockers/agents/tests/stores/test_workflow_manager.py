@@ -0,0 +1,279 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from src.agents.base_agent.tools import swap_assets
+from src.stores.workflow_manager import (
+    CatchUpPolicy,
+    RetryPolicy,
+    Workflow,
+    WorkflowManager,
+    WorkflowStatus,
+)
+
+
+def make_manager(tmp_path):
+    manager = WorkflowManager(str(tmp_path / "workflows.json"))
+    handler = AsyncMock()
+    manager.register_action_handler("test_action", handler)
+    return manager, handler
+
+
+def make_workflow(workflow_id, next_run, interval_seconds=60):
+    return Workflow(
+        id=workflow_id,
+        name=workflow_id,
+        description="test workflow",
+        action="test_action",
+        params={},
+        interval=timedelta(seconds=interval_seconds),
+        next_run=next_run,
+    )
+
+
+def test_scheduler_wakes_when_workflow_is_due(tmp_path):
+    async def run():
+        manager, handler = make_manager(tmp_path)
+        await manager.initialize()
+        await manager.create_workflow(
+            name="test",
+            description="test workflow",
+            action="test_action",
+            params={},
+            interval=timedelta(seconds=0.05),
+        )
+
+        await asyncio.sleep(0.3)
+        manager._scheduler_task.cancel()
+        return handler
+
+    assert asyncio.run(run()).execute.await_count >= 2
+
+
+def test_deleted_and_paused_workflows_do_not_run(tmp_path):
+    async def run():
+        manager, handler = make_manager(tmp_path)
+        soon = datetime.now() + timedelta(seconds=0.05)
+        manager.workflows = {
+            "deleted": make_workflow("deleted", soon),
+            "paused": make_workflow("paused", soon),
+        }
+        manager._rebuild_schedule()
+        manager._scheduler_task = asyncio.create_task(manager._scheduler_loop())
+
+        await manager.delete_workflow("deleted")
+        await manager.update_workflow("paused", status=WorkflowStatus.PAUSED)
+        await asyncio.sleep(0.2)
+        manager._scheduler_task.cancel()
+        return handler
+
+    assert asyncio.run(run()).execute.await_count == 0
+
+
+def test_superseded_entries_are_skipped(tmp_path):
+    manager, _ = make_manager(tmp_path)
+    now = datetime.now()
+    manager.workflows = {
+        f"wf_{i}": make_workflow(f"wf_{i}", now + timedelta(seconds=60 + i)) for i in range(3)
+    }
+    manager._rebuild_schedule()
+
+    manager.workflows["wf_0"].next_run = now + timedelta(hours=1)
+    manager._schedule_workflow(manager.workflows["wf_0"])
+    manager.workflows["wf_1"].next_run = now - timedelta(seconds=1)
+    manager._schedule_workflow(manager.workflows["wf_1"])
+
+    assert [w.id for w in manager._pop_due_workflows(now)] == ["wf_1"]
+    assert manager._seconds_until_next_run(now) == 62
+
+
+def test_wallets_run_in_parallel_but_each_wallet_is_serialized(tmp_path):
+    async def run():
+        manager, handler = make_manager(tmp_path)
+        active = {}
+        peaks = {}
+
+        async def execute(params):
+            wallet_id = params["wallet_id"]
+            active[wallet_id] = active.get(wallet_id, 0) + 1
+            peaks[wallet_id] = max(peaks.get(wallet_id, 0), active[wallet_id])
+            peaks["total"] = max(peaks.get("total", 0), sum(active.values()))
+            await asyncio.sleep(0.05)
+            active[wallet_id] -= 1
+
+        handler.execute.side_effect = execute
+        now = datetime.now()
+        manager.workflows = {}
+        for i, wallet_id in enumerate(["a", "a", "b"]):
+            workflow = make_workflow(f"wf_{i}", now, interval_seconds=3600)
+            workflow.params = {"wallet_id": wallet_id}
+            manager.workflows[workflow.id] = workflow
+            manager._dispatch_workflow(workflow)
+
+        await asyncio.gather(*manager._running.values())
+        return handler, peaks, manager
+
+    handler, peaks, manager = asyncio.run(run())
+    assert handler.execute.await_count == 3
+    assert peaks["a"] == 1
+    assert peaks["total"] == 2
+    assert manager._wallet_locks == {}
+
+
+def test_journal_is_replayed_over_snapshot(tmp_path):
+    async def run():
+        manager, _ = make_manager(tmp_path)
+        manager.workflows = {w: make_workflow(w, datetime.now()) for w in ["kept", "gone"]}
+        await manager._compact()
+
+        await manager.update_workflow("kept", name="renamed")
+        await manager.delete_workflow("gone")
+        manager.workflows["new"] = make_workflow("new", datetime.now())
+        await manager._record_upsert(manager.workflows["new"])
+        with open(manager.journal_path, "a") as f:
+            f.write('{"op": "upsert", "workfl')
+
+        restarted, _ = make_manager(tmp_path)
+        restarted._load_workflows()
+        return restarted
+
+    restarted = asyncio.run(run())
+    assert sorted(restarted.workflows) == ["kept", "new"]
+    assert restarted.workflows["kept"].name == "renamed"
+
+
+def test_journal_is_compacted_into_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.stores.workflow_manager.JOURNAL_COMPACTION_THRESHOLD", 3)
+
+    async def run():
+        manager, _ = make_manager(tmp_path)
+        manager.is_leader = True
+        manager.workflows = {"wf": make_workflow("wf", datetime.now())}
+        for i in range(3):
+            await manager.update_workflow("wf", name=f"name_{i}")
+        return manager
+
+    manager = asyncio.run(run())
+    assert manager.journal_path.read_text() == ""
+    assert json.loads(manager.storage_path.read_text())["wf"]["name"] == "name_2"
+
+
+def test_executions_are_recorded_in_run_history(tmp_path):
+    async def run():
+        manager, handler = make_manager(tmp_path)
+        handler.execute.side_effect = [{"transaction_hash": "0xabc"}, RuntimeError("boom")]
+        manager.workflows = {"wf": make_workflow("wf", datetime.now())}
+        await manager._execute_workflow(manager.workflows["wf"])
+        await manager._execute_workflow(manager.workflows["wf"])
+        return await manager.get_workflow_runs("wf")
+
+    history = asyncio.run(run())
+    failed, succeeded = history["runs"]
+    assert succeeded["outcome"] == "success" and succeeded["tx_hash"] == "0xabc"
+    assert failed["outcome"] == "failed" and failed["error"] == "boom"
+    assert history["stats"]["success_rate"] == 0.5
+
+
+def test_transient_errors_are_retried_with_backoff(tmp_path):
+    async def run():
+        manager, handler = make_manager(tmp_path)
+        manager.register_action_handler(
+            "test_action", handler, RetryPolicy(max_attempts=3, base_delay_seconds=0.01)
+        )
+        handler.execute.side_effect = [RuntimeError("timeout"), {"transaction_hash": "0x1"}]
+        manager.workflows = {"retried": make_workflow("retried", datetime.now())}
+        await manager._execute_workflow(manager.workflows["retried"])
+
+        handler.execute.side_effect = ValueError("Insufficient balance")
+        manager.workflows["invalid"] = make_workflow("invalid", datetime.now())
+        await manager._execute_workflow(manager.workflows["invalid"])
+        return manager, handler
+
+    manager, handler = asyncio.run(run())
+    assert handler.execute.await_count == 3
+    assert manager.workflows["retried"].status == WorkflowStatus.ACTIVE
+    assert manager.run_history.get_runs("retried")[0]["retries"] == 1
+    assert manager.workflows["invalid"].status == WorkflowStatus.FAILED
+    assert manager.run_history.get_runs("invalid")[0]["retries"] == 0
+
+
+@pytest.mark.parametrize("failing_call", ["trade", "wait"])
+def test_dca_trade_is_not_retried_after_the_swap_is_submitted(tmp_path, failing_call):
+    wallet = MagicMock(network_id="base-mainnet")
+    wallet.balance.return_value = "10"
+    # trade() broadcasts the trade itself, so it can fail after the swap went out too
+    if failing_call == "trade":
+        wallet.trade.side_effect = RuntimeError("failed to broadcast transaction")
+    else:
+        wallet.trade.return_value.wait.side_effect = RuntimeError("timed out waiting for receipt")
+
+    async def run():
+        manager, handler = make_manager(tmp_path)
+        # Keep the default dca_trade retry policy, only swap in a handler using the fake wallet
+        manager._action_handlers["dca_trade"] = handler
+        handler.execute.side_effect = lambda params: swap_assets(wallet, "1", "usdc", "eth")
+        workflow = make_workflow("dca", datetime.now())
+        workflow.action = "dca_trade"
+        manager.workflows = {"dca": workflow}
+        await manager._execute_workflow(workflow)
+        return manager
+
+    manager = asyncio.run(run())
+    assert wallet.trade.call_count == 1
+    assert manager.workflows["dca"].status == WorkflowStatus.FAILED
+    assert manager.run_history.get_runs("dca")[0]["retries"] == 0
+
+
+def test_catch_up_policies(tmp_path):
+    now = datetime.now()
+    # Six runs were missed by a workflow due every 10 seconds
+    overdue = now - timedelta(seconds=55)
+
+    manager, _ = make_manager(tmp_path)
+    manager.catch_up_policy = CatchUpPolicy.SKIP
+    manager.workflows = {"wf": make_workflow("wf", overdue, interval_seconds=10)}
+    manager._apply_catch_up_policy(now)
+    assert manager.workflows["wf"].next_run == overdue + timedelta(seconds=60)
+
+    manager.catch_up_policy = CatchUpPolicy.RUN_ALL
+    manager.workflows = {
+        "first": make_workflow("first", overdue, interval_seconds=10),
+        "second": make_workflow("second", overdue + timedelta(seconds=1), interval_seconds=10),
+    }
+    manager._apply_catch_up_policy(now)
+    assert manager.workflows["first"].next_run == now
+    assert manager.workflows["first"].pending_catch_up_runs == 5
+    assert manager.workflows["second"].next_run > now
+
+
+def test_only_one_worker_runs_the_scheduler(tmp_path):
+    async def run():
+        leader, _ = make_manager(tmp_path)
+        follower, _ = make_manager(tmp_path)
+        await leader.initialize()
+        await follower.initialize()
+        roles = (leader.is_leader, follower.is_leader, follower._scheduler_task)
+
+        # Workflows created through the follower reach the leader, and vice versa
+        created = await follower.create_workflow(
+            name="test",
+            description="test workflow",
+            action="test_action",
+            params={},
+            interval=timedelta(hours=1),
+        )
+        await leader._refresh_workflows()
+        await leader.update_workflow(created.id, name="renamed")
+        renamed = (await follower.get_workflow(created.id)).name
+
+        await leader.close()
+        follower_took_over = follower._leader_lease.acquire(blocking=False)
+        await follower.close()
+        return roles, renamed, follower_took_over
+
+    (leader_role, follower_role, follower_scheduler), renamed, took_over = asyncio.run(run())
+    assert leader_role and not follower_role and follower_scheduler is None
+    assert renamed == "renamed"
+    assert took_over
@@ -0,0 +1,51 @@
+from src.stores.workflow_run_history import WorkflowRun, WorkflowRunHistory
+
+
+def make_run(workflow_id, index, outcome="success"):
+    return WorkflowRun(
+        workflow_id=workflow_id,
+        scheduled_for=None,
+        started_at=f"2024-01-01T00:00:{index:02d}",
+        lag_seconds=float(index),
+        duration_seconds=1.0,
+        outcome=outcome,
+    )
+
+
+def test_history_is_a_bounded_ring_buffer_on_disk(tmp_path):
+    history = WorkflowRunHistory(str(tmp_path), max_runs=3)
+    for i in range(10):
+        history.record(make_run("wf", i))
+
+    path = tmp_path / "wf.jsonl"
+    assert len(path.read_text().splitlines()) <= 6
+
+    reloaded = WorkflowRunHistory(str(tmp_path), max_runs=3)
+    assert [run["lag_seconds"] for run in reloaded.get_runs("wf")] == [9.0, 8.0, 7.0]
+    assert len(reloaded.get_runs("wf", limit=1)) == 1
+
+
+def test_stats_summarize_outcomes_and_lag(tmp_path):
+    history = WorkflowRunHistory(str(tmp_path))
+    history.record(make_run("wf", 1))
+    history.record(make_run("wf", 3, outcome="failed"))
+
+    stats = history.get_stats("wf")
+    assert stats["runs"] == 2
+    assert stats["success_rate"] == 0.5
+    assert stats["lag_seconds"]["max"] == 3.0
+    assert history.get_stats("missing") == {"runs": 0}
+
+    history.delete("wf")
+    assert history.get_runs("wf") == []
+    assert not (tmp_path / "wf.jsonl").exists()
+
+
+def test_readers_see_runs_recorded_by_another_worker(tmp_path):
+    leader = WorkflowRunHistory(str(tmp_path))
+    follower = WorkflowRunHistory(str(tmp_path))
+    leader.record(make_run("wf", 1))
+    assert len(follower.get_runs("wf")) == 1
+
+    leader.record(make_run("wf", 2))
+    assert [run["lag_seconds"] for run in follower.get_runs("wf")] == [2.0, 1.0]